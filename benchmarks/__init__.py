@@ -0,0 +1,9 @@
+"""
+Reproducible performance benchmarks for sniffler.
+
+Usage (from the repository root)::
+
+    python -m benchmarks generate .bench/corpus --files 5000
+    python -m benchmarks run .bench/corpus -O before.json
+    python -m benchmarks compare before.json after.json
+"""
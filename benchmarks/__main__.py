@@ -0,0 +1,61 @@
+import argparse
+import json
+from pathlib import Path
+
+from .corpus import generate_corpus
+from .run import BENCHMARKS, compare, import_times, run_benchmarks
+
+parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Sniffler benchmark suite.")
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+generate_parser = subparsers.add_parser("generate", help="Generate a deterministic synthetic corpus.")
+generate_parser.add_argument("corpus", type=Path, help="The directory to generate the corpus in.")
+generate_parser.add_argument("--files", type=int, default=2000, help="The number of files to generate.")
+generate_parser.add_argument("--depth", type=int, default=4, help="The maximum directory nesting depth.")
+generate_parser.add_argument("--fanout", type=int, default=4, help="The number of subdirectories per directory.")
+generate_parser.add_argument("--seed", type=int, default=0, help="The random seed.")
+
+run_parser = subparsers.add_parser("run", help="Run benchmarks and write JSON results.")
+run_parser.add_argument("corpus", type=Path, help="The corpus directory, generated with defaults if missing.")
+run_parser.add_argument("-O", "--output", type=Path, help="The path to the JSON results file.")
+run_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only the given benchmarks.")
+run_parser.add_argument("--repeat", type=int, default=3, help="The number of timed runs per benchmark.")
+
+compare_parser = subparsers.add_parser("compare", help="Compare two JSON results files.")
+compare_parser.add_argument("old", type=Path)
+compare_parser.add_argument("new", type=Path)
+
+importtime_parser = subparsers.add_parser("importtime", help="Show the slowest imports of a module.")
+importtime_parser.add_argument("module", nargs="?", default="sniffler.cli", help="The module to import.")
+importtime_parser.add_argument("--top", type=int, default=15, help="The number of modules to show.")
+
+
+def main() -> None:
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate_corpus(args.corpus, files=args.files, depth=args.depth, fanout=args.fanout, seed=args.seed)
+    elif args.command == "run":
+        if not args.corpus.exists():
+            generate_corpus(args.corpus)
+        results = run_benchmarks(args.corpus, names=args.only, repeat=args.repeat)
+        if args.output:
+            args.output.write_text(json.dumps(results, indent=2))
+    elif args.command == "compare":
+        old = json.loads(args.old.read_text())
+        new = json.loads(args.new.read_text())
+        print(f"{'benchmark':<40} {'old items/s':>12} {'new items/s':>12} {'speedup':>8}")
+        for name, before, after, speedup in compare(old, new):
+            print(
+                f"{name:<40} {before or float('nan'):>12.1f} {after or float('nan'):>12.1f} "
+                f"{speedup or float('nan'):>7.2f}x"
+            )
+    elif args.command == "importtime":
+        times = import_times(args.module)
+        print(f"{'module':<50} {'self ms':>9} {'cumulative ms':>14}")
+        for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda t: -t[1][1])[: args.top]:
+            print(f"{name:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
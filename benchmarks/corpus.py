@@ -0,0 +1,331 @@
+"""
+Deterministic synthetic corpus generator.
+
+Every file is derived from a seeded ``random.Random``, and container formats use fixed timestamps,
+so the same parameters always produce byte-identical trees. Documents, OLE and FLAC files are written
+by hand, images and WAV tags go through the libraries sniffler itself depends on.
+"""
+
+import io
+import json
+import math
+import random
+import struct
+import uuid
+import wave
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+from mutagen.id3 import TALB, TIT2, TPE1
+from mutagen.wave import WAVE
+from PIL import Image
+
+ZIP_DATE = (2020, 1, 1, 0, 0, 0)
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliett kilo lima mike november oscar papa "
+    "quebec romeo sierra tango uniform victor whiskey xray yankee zulu"
+).split()
+CAMERAS = [("Canon", "EOS 5D"), ("NIKON", "D750"), ("SONY", "ILCE-7M3"), ("Apple", "iPhone 12")]
+
+# relative weights of each generated kind in the corpus
+DEFAULT_MIX = {
+    "txt": 40,
+    "jpg": 10,
+    "png": 5,
+    "pdf": 8,
+    "docx": 4,
+    "xlsx": 3,
+    "pptx": 3,
+    "doc": 2,
+    "xls": 1,
+    "ppt": 1,
+    "wav": 2,
+    "flac": 2,
+}
+
+
+def words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def make_txt(path: Path, rng: random.Random) -> None:
+    path.write_text("\n".join(words(rng, 12) for _ in range(rng.randint(1, 200))))
+
+
+def make_image(path: Path, rng: random.Random) -> None:
+    size = (rng.randint(16, 640), rng.randint(16, 480))
+    img = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+    make, model = rng.choice(CAMERAS)
+    exif = Image.Exif()
+    exif[0x010F] = make
+    exif[0x0110] = model
+    exif[0x0131] = "sniffler-bench"
+    exif[0x0132] = f"20{rng.randint(10, 24)}:0{rng.randint(1, 9)}:1{rng.randint(0, 9)} 12:00:00"
+    fmt = "JPEG" if path.suffix == ".jpg" else "PNG"
+    img.save(path, fmt, exif=exif, dpi=(72, 72))
+
+
+def make_pdf(path: Path, rng: random.Random) -> None:
+    pages = rng.randint(1, 20)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + i) for i in range(pages)) + b"] /Count %d >>" % pages,
+        f"<< /Title ({words(rng, 3)}) /Author ({words(rng, 2)}) /Creator (sniffler-bench) "
+        f"/Producer (sniffler-bench) /CreationDate (D:20200101000000Z) >>".encode(),
+    ]
+    objects += [b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>" for _ in range(pages)]
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R /Info 3 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    path.write_bytes(out.getvalue())
+
+
+def _zip_write(z: zipfile.ZipFile, name: str, data: str) -> None:
+    z.writestr(zipfile.ZipInfo(name, date_time=ZIP_DATE), data, compress_type=zipfile.ZIP_DEFLATED)
+
+
+def _core_xml(rng: random.Random) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f"<dc:title>{words(rng, 3)}</dc:title><dc:creator>{words(rng, 2)}</dc:creator>"
+        f"<cp:keywords>{words(rng, 4)}</cp:keywords><cp:lastModifiedBy>{words(rng, 2)}</cp:lastModifiedBy>"
+        "<cp:revision>1</cp:revision>"
+        '<dcterms:created xsi:type="dcterms:W3CDTF">2020-01-01T00:00:00Z</dcterms:created>'
+        '<dcterms:modified xsi:type="dcterms:W3CDTF">2020-01-02T00:00:00Z</dcterms:modified>'
+        "</cp:coreProperties>"
+    )
+
+
+def make_openxml(path: Path, rng: random.Random) -> None:
+    ext = path.suffix
+    with zipfile.ZipFile(path, "w") as z:
+        _zip_write(z, "[Content_Types].xml", '<?xml version="1.0" encoding="UTF-8"?><Types/>')
+        _zip_write(z, "docProps/core.xml", _core_xml(rng))
+        if ext == ".docx":
+            app = (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+                f"<Pages>{rng.randint(1, 50)}</Pages><Words>{rng.randint(10, 9000)}</Words>"
+                f"<Characters>{rng.randint(100, 50000)}</Characters></Properties>"
+            )
+            _zip_write(z, "docProps/app.xml", app)
+            _zip_write(z, "word/document.xml", f"<document>{words(rng, 200)}</document>")
+        elif ext == ".pptx":
+            for i in range(rng.randint(1, 15)):
+                _zip_write(z, f"ppt/slides/slide{i + 1}.xml", f"<sld>{words(rng, 20)}</sld>")
+        elif ext == ".xlsx":
+            sheets = "".join(f'<sheet name="Sheet{i}" sheetId="{i}"/>' for i in range(1, rng.randint(2, 6)))
+            workbook = (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                f"<sheets>{sheets}</sheets></workbook>"
+            )
+            _zip_write(z, "xl/workbook.xml", workbook)
+
+
+def _summary_information(rng: random.Random) -> bytes:
+    """Builds a ``\\x05SummaryInformation`` property set stream."""
+    properties: list[tuple[int, bytes]] = [(1, struct.pack("<Ihxx", 2, 1252))]  # VT_I2 codepage
+    for prop_id, text in ((2, words(rng, 3)), (3, words(rng, 2)), (4, words(rng, 2)), (5, words(rng, 3))):
+        data = text.encode("cp1252") + b"\0"
+        data += b"\0" * (-len(data) % 4)
+        properties.append((prop_id, struct.pack("<II", 0x1E, len(text) + 1) + data))  # VT_LPSTR
+    properties.append((14, struct.pack("<Ii", 3, rng.randint(1, 99))))  # VT_I4
+
+    header_size = 8 + 8 * len(properties)
+    offsets, body = [], b""
+    for prop_id, data in properties:
+        offsets.append(struct.pack("<II", prop_id, header_size + len(body)))
+        body += data
+    section = struct.pack("<II", header_size + len(body), len(properties)) + b"".join(offsets) + body
+
+    fmtid = uuid.UUID("f29f85e0-4ff9-1068-ab91-08002b27b3d9").bytes_le
+    stream = struct.pack("<HHI16sI", 0xFFFE, 0, 0x00020006, b"\0" * 16, 1) + fmtid + struct.pack("<I", 48) + section
+    return stream
+
+
+def make_ole(path: Path, rng: random.Random) -> None:
+    """
+    Writes a minimal compound file holding only a SummaryInformation stream.
+
+    The stream is padded to the mini stream cutoff, so it lives in regular sectors and no mini FAT is needed:
+    sector 0 is the FAT, sector 1 the directory and sectors 2-9 the stream.
+    """
+    endofchain, freesect, fatsect, nostream = 0xFFFFFFFE, 0xFFFFFFFF, 0xFFFFFFFD, 0xFFFFFFFF
+    stream = _summary_information(rng).ljust(4096, b"\0")
+
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII",
+        bytes.fromhex("d0cf11e0a1b11ae1"),
+        b"\0" * 16,
+        0x3E,
+        3,
+        0xFFFE,
+        9,
+        6,
+        b"\0" * 6,
+        0,
+        1,
+        1,
+        0,
+        4096,
+        endofchain,
+        0,
+        endofchain,
+        0,
+    )
+    header += struct.pack("<109I", 0, *([freesect] * 108))
+
+    fat = [fatsect, endofchain, *range(3, 10), endofchain]
+    fat += [freesect] * (128 - len(fat))
+
+    def entry(name: str, kind: int, child: int, start: int, size: int) -> bytes:
+        encoded = (name + "\0").encode("utf-16-le") if name else b""
+        return struct.pack(
+            "<64sHBBIII16sIQQIQ",
+            encoded,
+            len(encoded),
+            kind,
+            1,
+            nostream,
+            nostream,
+            child,
+            b"\0" * 16,
+            0,
+            0,
+            0,
+            start,
+            size,
+        )
+
+    directory = (
+        entry("Root Entry", 5, 1, endofchain, 0)
+        + entry("\x05SummaryInformation", 2, nostream, 2, len(stream))
+        + entry("", 0, nostream, 0, 0) * 2
+    )
+    path.write_bytes(header + struct.pack("<128I", *fat) + directory + stream)
+
+
+def _tone(rng: random.Random, rate: int, seconds: float) -> bytes:
+    freq = rng.choice([220, 440, 880])
+    return b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * freq * i / rate))) for i in range(int(rate * seconds))
+    )
+
+
+def make_wav(path: Path, rng: random.Random) -> None:
+    rate = 8000
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(_tone(rng, rate, rng.uniform(0.1, 1.0)))
+    audio = WAVE(path)
+    audio.add_tags()
+    audio.tags.add(TIT2(encoding=3, text=words(rng, 3)))  # type: ignore
+    audio.tags.add(TPE1(encoding=3, text=words(rng, 2)))  # type: ignore
+    audio.tags.add(TALB(encoding=3, text=words(rng, 2)))  # type: ignore
+    audio.save()
+
+
+def make_flac(path: Path, rng: random.Random) -> None:
+    """Writes a FLAC file with STREAMINFO and VORBIS_COMMENT blocks only, which is all the tag readers look at."""
+    rate, channels, bps = 44100, 2, 16
+    total_samples = rng.randint(rate, rate * 600)
+    packed = (rate << 44) | ((channels - 1) << 41) | ((bps - 1) << 36) | total_samples
+    streaminfo = struct.pack(">HH", 4096, 4096) + b"\0" * 6 + struct.pack(">Q", packed) + b"\0" * 16
+
+    vendor = b"sniffler-bench"
+    comments = [f"TITLE={words(rng, 3)}", f"ARTIST={words(rng, 2)}", f"GENRE={rng.choice(WORDS)}"]
+    vorbis = struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", len(comments))
+    for comment in comments:
+        data = comment.encode()
+        vorbis += struct.pack("<I", len(data)) + data
+
+    def block(kind: int, data: bytes, last: bool = False) -> bytes:
+        return bytes([kind | (0x80 if last else 0)]) + len(data).to_bytes(3, "big") + data
+
+    path.write_bytes(b"fLaC" + block(0, streaminfo) + block(4, vorbis, last=True))
+
+
+MAKERS: dict[str, Callable[[Path, random.Random], None]] = {
+    "txt": make_txt,
+    "jpg": make_image,
+    "png": make_image,
+    "pdf": make_pdf,
+    "docx": make_openxml,
+    "xlsx": make_openxml,
+    "pptx": make_openxml,
+    "doc": make_ole,
+    "xls": make_ole,
+    "ppt": make_ole,
+    "wav": make_wav,
+    "flac": make_flac,
+}
+
+
+def generate_corpus(
+    root: Path | str,
+    files: int = 2000,
+    depth: int = 4,
+    fanout: int = 4,
+    seed: int = 0,
+    mix: dict[str, int] | None = None,
+) -> Path:
+    """
+    Generates a deterministic corpus of files under ``root``.
+
+    Args:
+        root (Path | str): The directory to generate the corpus in, created if missing.
+        files (int, optional): The number of files to generate. Defaults to 2000.
+        depth (int, optional): The maximum directory nesting depth. Defaults to 4.
+        fanout (int, optional): The number of subdirectories per directory. Defaults to 4.
+        seed (int, optional): The random seed. Defaults to 0.
+        mix (dict[str, int] | None, optional): Relative weights per file kind, defaults to DEFAULT_MIX.
+
+    Returns:
+        Path: The corpus root.
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    kinds, weights = list(mix), list(mix.values())
+
+    directories = [root]
+    frontier = [root]
+    for _ in range(depth):
+        frontier = [parent / f"dir{i:02d}" for parent in frontier for i in range(fanout)]
+        directories += frontier
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    for i in range(files):
+        kind = rng.choices(kinds, weights)[0]
+        path = rng.choice(directories) / f"file{i:06d}.{kind}"
+        MAKERS[kind](path, random.Random(rng.getrandbits(64)))
+
+    params = {"files": files, "depth": depth, "fanout": fanout, "seed": seed, "mix": mix}
+    manifest_path(root).write_text(json.dumps(params, indent=2))
+    return root
+
+
+def manifest_path(root: Path | str) -> Path:
+    """
+    Returns the path of the file with the parameters of a corpus, next to its root, so scans of the corpus do not
+    include it.
+    """
+    root = Path(root).resolve()
+    return root.with_name(f"{root.name}.json")
@@ -0,0 +1,432 @@
+"""
+Benchmark definitions and runner.
+
+Each benchmark receives the corpus root, does its (untimed) setup and returns a callable performing the timed
+work and reporting the number of items processed, optionally with a dict of extra measurements such as the size
+of its output. Every benchmark runs in a freshly spawned process, so the
+reported peak RSS belongs to that benchmark alone (setup included).
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+import sniffler
+from sniffler.core.collector import Collector, Explorer
+from sniffler.core.csv_writer import write_csv
+from sniffler.core.grouping import GroupBy
+from sniffler.core.journal import Journal
+from sniffler.core.profiling import peak_rss
+from sniffler.core.rollup import DirectoryRollup
+from sniffler.core.search import IncrementalSearch, SearchEngine
+from sniffler.core.serialization import PackedCollection, pack_collection
+from sniffler.core.stats import STAT_COLUMNS, StatCalculator
+from sniffler.core.table import TableModel
+from sniffler.researchers import (
+    AudioResearcher,
+    BasicResearcher,
+    ImageResearcher,
+    LegacyOfficeResearcher,
+    ModernOfficeResearcher,
+    PdfResearcher,
+)
+
+from .corpus import manifest_path
+
+RESEARCHERS = [
+    BasicResearcher,
+    ImageResearcher,
+    AudioResearcher,
+    PdfResearcher,
+    ModernOfficeResearcher,
+    LegacyOfficeResearcher,
+]
+
+# modules that must not be imported by ``import sniffler.cli``, see the "import.cli" benchmark
+HEAVY_MODULES = ("pymupdf", "PIL", "mutagen", "olefile", "tqdm", "django")
+
+Benchmark = Callable[[Path], Callable[[], int | tuple[int, dict[str, Any]]]]
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def collect(corpus: Path) -> Collector:
+    collector = Collector(corpus, [researcher() for researcher in RESEARCHERS])
+    collector.collect()
+    return collector
+
+
+@benchmark("explorer.files")
+def bench_explorer(corpus: Path) -> Callable[[], int]:
+    return lambda: sum(1 for _ in Explorer(corpus).files())
+
+
+# the round trip of a directory listing on a network filesystem, injected by slow_scandir
+LISTING_LATENCY = 0.005
+
+
+def slow_scandir(path: str) -> Iterator[os.DirEntry]:
+    """
+    Lists a directory after waiting for LISTING_LATENCY, a local stand-in for an NFS/SMB mount.
+    """
+    time.sleep(LISTING_LATENCY)
+    return os.scandir(path)
+
+
+@benchmark("explorer.files+latency")
+def bench_explorer_latency(corpus: Path) -> Callable[[], int]:
+    return lambda: sum(1 for _ in Explorer(corpus, scandir=slow_scandir).files())
+
+
+@benchmark("explorer.files+latency+threads")
+def bench_explorer_latency_threads(corpus: Path) -> Callable[[], int]:
+    return lambda: sum(1 for _ in Explorer(corpus, threads=32, scandir=slow_scandir).files())
+
+
+def researcher_benchmark(researcher_class: type) -> Benchmark:
+    def bench(corpus: Path) -> Callable[[], tuple[int, dict[str, Any]]]:
+        researcher = researcher_class()
+        files = [f for f in Explorer(corpus).files() if researcher.accepts(f)]
+
+        def run() -> tuple[int, dict[str, Any]]:
+            # only files researched successfully count, a researcher that fails fast must not look fast
+            failures = 0
+            for f in files:
+                try:
+                    researcher.get_info(f)
+                except Exception:
+                    failures += 1
+            return len(files) - failures, {"failures": failures}
+
+        return run
+
+    return bench
+
+
+for _researcher in RESEARCHERS:
+    benchmark(f"researcher.{_researcher.__name__}")(researcher_benchmark(_researcher))
+
+
+@benchmark("collector.collect")
+def bench_collect(corpus: Path) -> Callable[[], int]:
+    return lambda: len(collect(corpus).collection)
+
+
+@benchmark("collector.collect+journal")
+def bench_collect_journal(corpus: Path) -> Callable[[], int]:
+    def run() -> int:
+        with tempfile.TemporaryDirectory() as tmp, Journal(Path(tmp, "journal"), corpus) as journal:
+            collector = Collector(corpus, [researcher() for researcher in RESEARCHERS], journal=journal)
+            collector.collect()
+        return len(collector.collection)
+
+    return run
+
+
+@benchmark("collector.collect+jobs")
+def bench_collect_jobs(corpus: Path) -> Callable[[], int]:
+    def run() -> int:
+        collector = Collector(corpus, [researcher() for researcher in RESEARCHERS], jobs=32)
+        collector.collect()
+        return len(collector.collection)
+
+    return run
+
+
+@benchmark("write_csv")
+def bench_write_csv(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+
+    def run() -> int:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_csv(Path(tmp, "out.csv"), collection.keys, collection, delimiter=";")
+        return len(collection)
+
+    return run
+
+
+@benchmark("search")
+def bench_search(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+    queries = ["alpha", "canon", ".pdf", "file000", "zulu victor"]
+
+    def run() -> int:
+        engine = SearchEngine(collection)
+        for query in queries:
+            engine.search(query)
+        return len(collection) * len(queries)
+
+    return run
+
+
+@benchmark("search.incremental")
+def bench_search_incremental(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+    # every prefix of the queries, as typed
+    keystrokes = [query[:end] for query in ["alpha", "canon", "file000"] for end in range(1, len(query) + 1)]
+
+    def run() -> int:
+        searcher = IncrementalSearch(collection)
+        for query in keystrokes:
+            searcher.search(query)
+            searcher.complete(query)
+        return len(keystrokes)
+
+    return run
+
+
+@benchmark("table.sort+filter")
+def bench_table(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+    engine = SearchEngine(collection)
+    hits = engine.search_indices("file000")
+
+    def run() -> int:
+        model = TableModel(collection, ["path", "extension", "size", "modified"])
+        model.sort("size", descending=True)
+        model.filter(hits)
+        model.toggle_sort("path")
+        # what a view of 40 rows formats
+        for position in range(min(40, len(model))):
+            model.cells(position)
+        return len(collection)
+
+    return run
+
+
+@benchmark("stats.analytics")
+def bench_analytics(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+
+    def run() -> int:
+        analytics = StatCalculator(collection).analytics()
+        for column in ("size", "page_count", "duration", "area"):
+            analytics.percentiles(column)
+        analytics.size_histogram()
+        analytics.age_histogram()
+        return len(collection)
+
+    return run
+
+
+@benchmark("group_by")
+def bench_group_by(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+
+    def run() -> int:
+        GroupBy(["extension", "modified:year"], ["count", "size:sum", "size:mean"]).update(collection).results()
+        GroupBy(["author"], ["count", "page_count:sum"]).update(collection).results()
+        return 2 * len(collection)
+
+    return run
+
+
+@benchmark("rollup")
+def bench_rollup(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+
+    def run() -> int:
+        rollup = DirectoryRollup(collection)
+        rollup.top(10)
+        rollup.top(10, by="pages", max_depth=1)
+        return len(collection)
+
+    return run
+
+
+@benchmark("stats")
+def bench_stats(corpus: Path) -> Callable[[], int]:
+    collection = collect(corpus).collection
+
+    def run() -> int:
+        stats = StatCalculator(collection)
+        stats.total_size()
+        stats.count_by_extension()
+        stats.top_n_largest_files(10)
+        stats.top_n_largest_images(10)
+        stats.top_n_documents_by_pages(10)
+        return len(collection)
+
+    return run
+
+
+def json_default(value: Any) -> str:
+    return str(value)
+
+
+@benchmark("serialize.json.encode")
+def bench_json_encode(corpus: Path) -> Callable[[], tuple[int, dict[str, Any]]]:
+    collection = collect(corpus).collection
+
+    def run() -> tuple[int, dict[str, Any]]:
+        data = json.dumps(collection, default=json_default).encode()
+        return len(collection), {"bytes": len(data)}
+
+    return run
+
+
+@benchmark("serialize.packed.encode")
+def bench_packed_encode(corpus: Path) -> Callable[[], tuple[int, dict[str, Any]]]:
+    collection = collect(corpus).collection
+
+    def run() -> tuple[int, dict[str, Any]]:
+        return len(collection), {"bytes": len(pack_collection(collection))}
+
+    return run
+
+
+@benchmark("serialize.json.decode")
+def bench_json_decode(corpus: Path) -> Callable[[], int]:
+    data = json.dumps(collect(corpus).collection, default=json_default)
+    return lambda: len(json.loads(data))
+
+
+@benchmark("serialize.packed.decode")
+def bench_packed_decode(corpus: Path) -> Callable[[], int]:
+    data = pack_collection(collect(corpus).collection)
+    return lambda: len(PackedCollection(data).rows())
+
+
+@benchmark("serialize.packed.stat_columns")
+def bench_packed_stat_columns(corpus: Path) -> Callable[[], int]:
+    data = pack_collection(collect(corpus).collection)
+    return lambda: len(PackedCollection(data, str).rows(STAT_COLUMNS))
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Imports a module in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        dict[str, tuple[int, int]]: The self and cumulative import time in microseconds of every imported module.
+    """
+    env = {**os.environ, "PYTHONPATH": str(Path(sniffler.__file__).parent.parent)}
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+@benchmark("import.cli")
+def bench_import_cli(corpus: Path) -> Callable[[], int]:
+    def run() -> int:
+        times = import_times("sniffler.cli")
+        heavy = [module for module in HEAVY_MODULES if module in times]
+        if heavy:
+            raise RuntimeError(f"'import sniffler.cli' imports {', '.join(heavy)}, which should be imported lazily.")
+        return 1
+
+    return run
+
+
+def run_one(name: str, corpus: str, repeat: int) -> dict[str, Any]:
+    """Runs a single benchmark, reporting the fastest of ``repeat`` runs."""
+    run = BENCHMARKS[name](Path(corpus))
+    timings = []
+    result: int | tuple[int, dict[str, Any]] = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    items, extra = result if isinstance(result, tuple) else (result, {})
+    best = min(timings)
+    return {
+        "items": items,
+        "seconds": best,
+        "items_per_sec": items / best if best else None,
+        "timings": timings,
+        "peak_rss_kb": (peak_rss() or 0) // 1024,
+        **extra,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_benchmarks(corpus: Path, names: list[str] | None = None, repeat: int = 3) -> dict[str, Any]:
+    """
+    Runs the selected benchmarks against a corpus, each one in a fresh process.
+
+    Args:
+        corpus (Path): The corpus root.
+        names (list[str] | None, optional): Benchmark names to run, all of them by default.
+        repeat (int, optional): The number of timed runs per benchmark. Defaults to 3.
+
+    Returns:
+        dict[str, Any]: The run metadata and per-benchmark results, ready to be dumped as JSON.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for name in names or list(BENCHMARKS):
+        with ctx.Pool(1) as pool:
+            results[name] = pool.apply(run_one, (name, str(corpus), repeat))
+        result = results[name]
+        size = f" {result['bytes']:>12} bytes" if "bytes" in result else ""
+        failed = f" {result['failures']:>8} failed" if result.get("failures") else ""
+        print(f"{name:<40} {result['items_per_sec'] or 0:>12.1f} items/s {result['peak_rss_kb']:>10} KB{size}{failed}")
+
+    corpus_params = manifest_path(corpus)
+    try:
+        sniffler_version = version("sniffler")
+    except PackageNotFoundError:
+        sniffler_version = None
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "git_revision": git_revision(),
+            "sniffler_version": sniffler_version,
+            "python": sys.version,
+            "platform": platform.platform(),
+            "corpus": json.loads(corpus_params.read_text()) if corpus_params.exists() else str(corpus),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> list[tuple[str, float | None, float | None, float | None]]:
+    """
+    Compares the throughput of two result files.
+
+    Returns:
+        list[tuple]: ``(name, old items/s, new items/s, speedup)`` for every benchmark present in either file.
+    """
+    rows = []
+    for name in dict.fromkeys([*old["results"], *new["results"]]):
+        before = old["results"].get(name, {}).get("items_per_sec")
+        after = new["results"].get(name, {}).get("items_per_sec")
+        rows.append((name, before, after, after / before if before and after else None))
+    return rows
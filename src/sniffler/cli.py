@@ -1,24 +1,69 @@
 import argparse
+import contextlib
+import os
+import sys
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from functools import partial
 from pathlib import Path
+from typing import TextIO
 
-from tqdm import tqdm
-
-from .core.collector import Collection, Collector
+from .core.collector import Collection, Collector, Explorer, tqdm_progress_bar
 from .core.csv_writer import write_csv
+from .core.diff import DIFF_FIELDNAMES, DiffSummary, diff_scans
+from .core.errors import ErrorLog
+from .core.grouping import Aggregation, GroupBy, format_group_value
+from .core.journal import Journal
+from .core.merge import merge_fieldnames, merge_rows
+from .core.ndjson_writer import write_ndjson
+from .core.profiling import Profiler
+from .core.readers import read_rows
+from .core.rollup import ROLLUP_TOTALS, DirectoryRollup
+from .core.sampling import Estimate, SampleEstimator
 from .core.search import SearchEngine
-from .core.stats import StatCalculator
-from .core.utils import convert_size
-from .researchers import (
-    AudioResearcher,
-    BasicResearcher,
-    ImageResearcher,
-    LegacyOfficeResearcher,
-    ModernOfficeResearcher,
-    PdfResearcher,
-)
+from .core.serialization import write_packed
+from .core.sharding import SHARD_STRATEGIES, parse_shard
+from .core.sqlite_writer import write_sqlite
+from .core.stats import StatAccumulator, StatCalculator
+from .core.utils import DEFAULT_TIME_FORMAT, convert_size
+from .core.watch import LiveCollection, Watcher, create_watcher
+from .researchers import default_researchers
+
+AUTO_JOBS = 32
+
+
+def shard_spec(value: str) -> tuple[int, int]:
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
 
-parser = argparse.ArgumentParser(description="Collect information about files in a directory.")
+def aggregation_spec(value: str) -> Aggregation:
+    try:
+        return Aggregation.parse(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def jobs_spec(value: str) -> int:
+    if value == "auto":
+        return AUTO_JOBS
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"Invalid jobs '{value}', expected 'auto' or a positive integer.")
+    return jobs
+
+
+parser = argparse.ArgumentParser(
+    description="Collect information about files in a directory.",
+    epilog=(
+        "Use 'sniffler-cli merge -h' for merging partial results of sharded scans, "
+        "and 'sniffler-cli diff -h' for comparing two scans."
+    ),
+)
 parser.add_argument(
     "path",
     type=Path,
@@ -27,37 +72,376 @@ parser.add_argument(
     default=".",
 )
 parser.add_argument("-O", "--output", type=Path, help="The path to the output file.")
+parser.add_argument(
+    "--format",
+    type=str,
+    choices=["csv", "ndjson", "sqlite", "packed"],
+    help=(
+        "The output format. 'ndjson' streams one JSON object per line while the scan is running, "
+        "'sqlite' writes an indexed database and 'packed' a compact compressed columnar file (.sniff), "
+        "both require --output."
+    ),
+    default="csv",
+)
 parser.add_argument(
     "--delimiter",
     type=str,
     help="The delimiter to use in the output file (',', ';', or 'tab').",
     default=",",
 )
+parser.add_argument(
+    "--time-format",
+    type=str,
+    help="The strftime format for timestamps in the output file, 'epoch' keeps raw epoch seconds.",
+    default=DEFAULT_TIME_FORMAT,
+)
 parser.add_argument(
     "--search",
     type=str,
     help="Search for files containing the given string in filename or attributes.",
     default=None,
 )
+parser.add_argument(
+    "--jobs",
+    type=jobs_spec,
+    default=1,
+    metavar="N",
+    help=(
+        "The maximum number of concurrent workers per researcher type, tuned at runtime from the measured "
+        f"throughput and I/O wait ('auto' allows up to {AUTO_JOBS}). Defaults to 1, researching sequentially."
+    ),
+)
+parser.add_argument(
+    "--walk-threads",
+    type=int,
+    metavar="N",
+    help="List up to N directories concurrently, which speeds up walking high-latency mounts such as NFS or SMB.",
+)
+parser.add_argument(
+    "--walk-unordered",
+    action="store_true",
+    help="With --walk-threads, yield files as soon as their directory is listed instead of in walk order.",
+)
+parser.add_argument(
+    "--include",
+    action="append",
+    metavar="PATTERN",
+    help="Only collect files matching this gitignore-style pattern (may be repeated).",
+)
+parser.add_argument(
+    "--exclude",
+    action="append",
+    metavar="PATTERN",
+    help="Skip files and directories matching this gitignore-style pattern, e.g. 'node_modules/' (may be repeated).",
+)
+parser.add_argument(
+    "--exclude-from",
+    action="append",
+    type=Path,
+    metavar="FILE",
+    help="Read gitignore-style exclude rules, relative to the scanned path, from a file (may be repeated).",
+)
+parser.add_argument(
+    "--ignore-file",
+    action="append",
+    metavar="NAME",
+    help="Honour rule files with this name in every directory, e.g. '.gitignore' (may be repeated).",
+)
+parser.add_argument("--max-depth", type=int, help="The maximum directory depth to descend to, 0 is the path itself.")
+parser.add_argument("--skip-hidden", action="store_true", help="Skip files and directories starting with a dot.")
+parser.add_argument("--one-file-system", action="store_true", help="Do not descend into other filesystems.")
+parser.add_argument(
+    "--follow-symlinks",
+    action="store_true",
+    help="Descend into symlinked directories, visiting every directory at most once.",
+)
+parser.add_argument(
+    "--shard",
+    type=shard_spec,
+    metavar="INDEX/COUNT",
+    help="Scan only shard INDEX of COUNT deterministic shards (0 <= INDEX < COUNT), e.g. 0/8.",
+)
+parser.add_argument(
+    "--shard-by",
+    choices=SHARD_STRATEGIES,
+    default="top",
+    help="Shard by top-level directory (never enters other shards' subtrees) or by path hash (better balanced).",
+)
+parser.add_argument(
+    "--journal",
+    type=Path,
+    metavar="FILE",
+    help="Checkpoint finished files to an append-only journal, so an interrupted scan can be resumed.",
+)
+parser.add_argument(
+    "--resume",
+    action="store_true",
+    help="Resume the scan recorded in --journal, skipping files that are already done.",
+)
+parser.add_argument(
+    "--error-log",
+    type=Path,
+    metavar="FILE",
+    help="Append a JSON line per file a researcher failed on (researcher, error type, message) to a file.",
+)
+parser.add_argument(
+    "--retries",
+    type=int,
+    default=0,
+    metavar="N",
+    help="Try a file up to N more times after a transient I/O error, e.g. a timeout of a network share.",
+)
+parser.add_argument(
+    "--watch",
+    action="store_true",
+    help=(
+        "After the scan, keep watching the path and re-research only changed files, "
+        "rewriting the CSV output after every batch of changes."
+    ),
+)
+parser.add_argument(
+    "--poll",
+    action="store_true",
+    help="Poll for changes instead of using inotify (e.g. on network filesystems).",
+)
+parser.add_argument(
+    "--poll-interval",
+    type=float,
+    default=2.0,
+    metavar="SECONDS",
+    help="The number of seconds between polls with --watch --poll.",
+)
+parser.add_argument(
+    "--sample",
+    type=int,
+    metavar="N",
+    help="Research only a uniform random sample of N files and report estimates with 95%% confidence intervals.",
+)
+parser.add_argument("--seed", type=int, help="The random seed for --sample.")
+parser.add_argument(
+    "--profile",
+    action="store_true",
+    help="Record per-researcher timings, the slowest files and per-phase resource usage, and print a summary to stderr.",
+)
+parser.add_argument(
+    "--rollup",
+    type=int,
+    metavar="N",
+    help="Print the N heaviest directories with the recursive size, file count and totals of everything below them.",
+)
+parser.add_argument(
+    "--rollup-by",
+    choices=["size", "files", *ROLLUP_TOTALS],
+    default="size",
+    help="What makes a directory heavy for --rollup: bytes, files, document pages or media duration.",
+)
+parser.add_argument(
+    "--rollup-under",
+    default="",
+    metavar="DIR",
+    help="Only rank directories below DIR (relative to the scanned path) for --rollup, to drill down into it.",
+)
+parser.add_argument(
+    "--rollup-depth",
+    type=int,
+    metavar="DEPTH",
+    help="Only rank directories at most DEPTH levels below --rollup-under, 1 for its subdirectories.",
+)
+parser.add_argument(
+    "--group-by",
+    type=lambda value: [key.strip() for key in value.split(",") if key.strip()],
+    metavar="FIELD[,FIELD]",
+    help=(
+        "Print a table of the files grouped by these fields, e.g. 'exif:Model' or 'extension,modified:year' "
+        "(timestamps can be grouped by year, month or date)."
+    ),
+)
+parser.add_argument(
+    "--agg",
+    action="append",
+    type=aggregation_spec,
+    metavar="FIELD:FUNC",
+    help="An aggregation per group for --group-by: count, or FIELD:sum|min|max|mean|count (e.g. size:sum). "
+    "Can be given several times, defaults to count.",
+)
+parser.add_argument("--profile-output", type=Path, help="Also write the profile as JSON to the given path.")
+parser.add_argument(
+    "--profile-memory",
+    action="store_true",
+    help="Trace Python allocations to measure peak memory per phase (slows the scan down).",
+)
+
+
+merge_parser = argparse.ArgumentParser(
+    prog="sniffler-cli merge",
+    description="Merge partial results of sharded scans (CSV, NDJSON or SQLite) into one output.",
+)
+merge_parser.add_argument("parts", type=Path, nargs="+", help="The partial result files.")
+merge_parser.add_argument("-O", "--output", type=Path, help="The path to the merged output file.")
+merge_parser.add_argument(
+    "--format", choices=["csv", "ndjson", "sqlite", "packed"], default="csv", help="The output format."
+)
+merge_parser.add_argument(
+    "--delimiter",
+    type=str,
+    help="The delimiter of CSV parts and of CSV output (',', ';', or 'tab').",
+    default=",",
+)
+merge_parser.add_argument(
+    "--time-format",
+    type=str,
+    help="The strftime format for epoch timestamps in the output file, 'epoch' keeps raw epoch seconds.",
+    default=DEFAULT_TIME_FORMAT,
+)
+
+
+diff_parser = argparse.ArgumentParser(
+    prog="sniffler-cli diff",
+    description=(
+        "Compare two scans: list added, removed, grown, shrunk and modified files, and summarize the deltas per "
+        "extension. Both scans are sorted by path in bounded memory and compared in one streaming pass."
+    ),
+)
+diff_parser.add_argument(
+    "old",
+    help="The old scan: a CSV, NDJSON or SQLite output file, or 'scan:ID' for a scan stored by the web UI.",
+)
+diff_parser.add_argument("new", help="The new scan, as for 'old'.")
+diff_parser.add_argument("-O", "--output", type=Path, help="The path to the output file for the changed files.")
+diff_parser.add_argument("--format", choices=["csv", "ndjson"], default="csv", help="The output format.")
+diff_parser.add_argument(
+    "--delimiter",
+    type=str,
+    help="The delimiter of CSV scans and of CSV output (',', ';', or 'tab').",
+    default=",",
+)
+diff_parser.add_argument("--summary", action="store_true", help="Only print the summary, not the changed files.")
+diff_parser.add_argument(
+    "--chunk-size",
+    type=int,
+    default=50_000,
+    help="The number of rows sorted in memory at a time, larger chunks spill fewer temporary files.",
+)
+
 
+# invalid combinations of arguments, with the error shown for them
+ARGUMENT_CONFLICTS: list[tuple[Callable[[argparse.Namespace], bool], str]] = [
+    (lambda args: args.resume and not args.journal, "--resume requires --journal"),
+    (lambda args: args.journal and args.sample is not None, "--journal cannot be combined with --sample"),
+    (lambda args: args.rollup is not None and args.sample is not None, "--rollup cannot be combined with --sample"),
+    (lambda args: args.agg and not args.group_by, "--agg requires --group-by"),
+    (lambda args: args.walk_threads is not None and args.walk_threads < 1, "--walk-threads must be at least 1"),
+    (lambda args: args.walk_unordered and not args.walk_threads, "--walk-unordered requires --walk-threads"),
+    (lambda args: args.retries < 0, "--retries cannot be negative"),
+    (
+        lambda args: args.watch and (args.format != "csv" or args.sample is not None),
+        "--watch requires the csv format and cannot be combined with --sample",
+    ),
+]
 
-def main():
-    args = parser.parse_args()
 
-    researchers = [
-        BasicResearcher(),
-        ImageResearcher(),
-        AudioResearcher(),
-        PdfResearcher(),
-        ModernOfficeResearcher(),
-        LegacyOfficeResearcher(),
-    ]
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["merge"]:
+        merge(merge_parser.parse_args(argv[1:]))
+        return
+    if argv[:1] == ["diff"]:
+        diff(diff_parser.parse_args(argv[1:]))
+        return
+
+    args = parser.parse_args(argv)
+    if args.format in ("sqlite", "packed") and not args.output:
+        parser.error(f"--format {args.format} requires --output")
+    for conflict, message in ARGUMENT_CONFLICTS:
+        if conflict(args):
+            parser.error(message)
+
+    profiler = None
+    if args.profile or args.profile_output or args.profile_memory:
+        profiler = Profiler(trace_memory=args.profile_memory)
+    try:
+        run(args, profiler)
+    finally:
+        if profiler is not None:
+            profiler.print_summary()
+            if args.profile_output:
+                profiler.write_json(args.profile_output)
+
+
+def phase(profiler: Profiler | None, name: str) -> contextlib.AbstractContextManager:
+    return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
+
+
+def run(args: argparse.Namespace, profiler: Profiler | None) -> None:
+    researchers = default_researchers()
+    explorer = Explorer(
+        args.path[0],
+        include=args.include,
+        exclude=args.exclude,
+        exclude_from=args.exclude_from,
+        ignore_file_names=args.ignore_file,
+        max_depth=args.max_depth,
+        skip_hidden=args.skip_hidden,
+        one_file_system=args.one_file_system,
+        follow_symlinks=args.follow_symlinks,
+        shard=args.shard,
+        shard_by=args.shard_by,
+        threads=args.walk_threads,
+        ordered=not args.walk_unordered,
+    )
     collector = Collector(
         args.path[0],
         researchers,
-        progress_bar=partial(tqdm, desc="Collecting", unit=" files"),
+        progress_bar=partial(tqdm_progress_bar, desc="Collecting", unit=" files"),
+        profiler=profiler,
+        explorer=explorer,
+        sample_size=args.sample,
+        seed=args.seed,
+        jobs=args.jobs,
+        errors=ErrorLog(filename=args.error_log),
+        retries=args.retries,
     )
-    collector.collect(show_progress=bool(args.output))
+    if args.journal:
+        try:
+            collector.journal = Journal(args.journal, collector.path, resume=args.resume)
+        except ValueError as e:
+            parser.error(str(e))
+    # the watcher starts before the scan, so changes made while scanning are not missed
+    watcher = create_watcher(explorer, poll=args.poll, interval=args.poll_interval) if args.watch else None
+    try:
+        collect_and_write(args, collector, profiler)
+        print_errors(collector.errors)
+        print_concurrency(collector)
+        if watcher is not None:
+            watch(args, collector, watcher)
+    finally:
+        collector.errors.close()
+        if collector.journal is not None:
+            collector.journal.close()
+        if watcher is not None:
+            watcher.close()
+
+
+def collect_and_write(args: argparse.Namespace, collector: Collector, profiler: Profiler | None) -> None:
+    time_format = None if args.time_format == "epoch" else args.time_format
+    rollup = DirectoryRollup() if args.rollup is not None else None
+    grouping = GroupBy(args.group_by, args.agg or ["count"]) if args.group_by else None
+
+    if args.format in ("ndjson", "sqlite"):
+        stream_rows(args, collector, profiler, rollup, grouping)
+        return
+
+    if args.format == "packed":
+        # the columnar layout needs every row before the first column can be written
+        with phase(profiler, "research"):
+            collector.collect(show_progress=True)
+        with phase(profiler, "write"):
+            write_packed(args.output, collector.collection)
+        print_summaries(args, rollup, grouping, collector.collection, file=sys.stderr)
+        return
+
+    with phase(profiler, "research"):
+        collector.collect(show_progress=bool(args.output))
     stats_calculator = StatCalculator(collector.collection)
 
     search_results = Collection()
@@ -66,25 +450,307 @@ def main():
         search_results = search_engine.search(args.search)
 
     if args.output:
-        write_csv(
-            args.output,
-            collector.collection.keys,
-            collector.collection,
-            delimiter=args.delimiter,
-        )
+        with phase(profiler, "write"):
+            write_csv(
+                args.output,
+                collector.collection.keys,
+                collector.collection,
+                delimiter=args.delimiter,
+                time_format=time_format,
+            )
     else:
-        print("Total files:", stats_calculator.total_files())
-        print("Total file size:", convert_size(stats_calculator.total_size()))
-
-        print("Count by extension:")
-        for ext, count in stats_calculator.count_by_extension().most_common():
-            print(f"\t{ext}: {count}")
-
-        print("Top 10 largest files:")
-        for file in stats_calculator.top_n_largest_files(10):
-            print(f"\t{file['path']} ({convert_size(int(file['size']))})")  # type: ignore
+        if collector.population_size is not None:
+            print_estimates(SampleEstimator(collector.collection, collector.population_size))
+        else:
+            print_stats(stats_calculator)
+            print_distributions(stats_calculator)
 
         if search_results:
-            print("\nSearch results:")
+            # a sample is all there is to search, the matches of the other files are unknown
+            print("\nSearch results in the sample:" if collector.population_size is not None else "\nSearch results:")
             for file in search_results:
                 print(f"\t{file['path']}")
+
+    print_summaries(args, rollup, grouping, collector.collection, file=sys.stderr if args.output else None)
+
+
+def stream_rows(
+    args: argparse.Namespace,
+    collector: Collector,
+    profiler: Profiler | None,
+    rollup: DirectoryRollup | None,
+    grouping: GroupBy | None,
+) -> None:
+    """
+    Writes the rows of the streaming formats as they are researched, building the rollup and the groups on the way.
+    """
+    time_format = None if args.time_format == "epoch" else args.time_format
+
+    def observed(rows: Iterable[Mapping]) -> Iterable[Mapping]:
+        # streamed rows are not kept, the rollup and the groups are built while they are written
+        if rollup is not None:
+            rows = rollup.tee(rows)
+        if grouping is not None:
+            rows = grouping.tee(rows)
+        return rows
+
+    if args.format == "ndjson":
+        rows = collector.iter_collect(show_progress=bool(args.output), store=False)
+        with phase(profiler, "research+write"):
+            write_ndjson(args.output, observed(rows), time_format=time_format)
+    else:
+        rows = collector.iter_collect(show_progress=True, store=False)
+        with phase(profiler, "research+write"):
+            write_sqlite(args.output, observed(rows))
+    # NDJSON rows may be written to stdout, the tables must not end up between them
+    print_summaries(args, rollup, grouping, file=sys.stderr)
+
+
+def print_errors(errors: ErrorLog, shown: int = 5) -> None:
+    if not errors.total:
+        return
+    counts = ", ".join(f"{researcher} {error_type} {count}" for researcher, error_type, count in errors.summary())
+    retried = f", {errors.retried} recovered on retry" if errors.retried else ""
+    print(f"{errors.total} research errors{retried}: {counts}", file=sys.stderr)
+    for error in list(errors.records)[-shown:]:
+        print(f"\t{error.path}: {error.researcher} {error.error_type}: {error.message}", file=sys.stderr)
+    if errors.filename is not None:
+        print(f"All errors were written to '{errors.filename}'.", file=sys.stderr)
+
+
+def print_concurrency(collector: Collector) -> None:
+    report = collector.concurrency_report()
+    if report:
+        workers = ", ".join(
+            f"{name} {entry['workers']} (peak {entry['peak_workers']})" for name, entry in sorted(report.items())
+        )
+        print(f"Concurrency settled on: {workers}", file=sys.stderr)
+
+
+def watch(args: argparse.Namespace, collector: Collector, watcher: Watcher) -> None:
+    time_format = None if args.time_format == "epoch" else args.time_format
+    live = LiveCollection(collector, watcher)
+    print(f"Watching '{collector.path}' for changes, press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        for update in live.updates():
+            print(
+                f"+{update.added} ~{update.modified} -{update.removed}: "
+                f"{live.stats.total_files()} files, {convert_size(live.stats.total_size())}",
+                file=sys.stderr,
+            )
+            if args.output:
+                # replace the output atomically, so readers never see a partial file
+                partial_output = args.output.with_name(args.output.name + ".partial")
+                write_csv(
+                    partial_output,
+                    live.collection.keys,
+                    live.collection,
+                    delimiter=args.delimiter,
+                    time_format=time_format,
+                )
+                os.replace(partial_output, args.output)
+    except KeyboardInterrupt:
+        pass
+
+
+def print_stats(stats: StatCalculator | StatAccumulator, file: TextIO | None = None) -> None:
+    print("Total files:", stats.total_files(), file=file)
+    print("Total file size:", convert_size(stats.total_size()), file=file)
+
+    print("Count by extension:", file=file)
+    for ext, count in stats.count_by_extension().most_common():
+        print(f"\t{ext}: {count}", file=file)
+
+    print("Top 10 largest files:", file=file)
+    for row in stats.top_n_largest_files(10):
+        print(f"\t{row['path']} ({convert_size(int(float(row['size'])))})", file=file)  # type: ignore
+
+
+# the columns with a percentile line in the report, by label, and how their values are shown
+DISTRIBUTION_COLUMNS = {
+    "File size": ("size", convert_size),
+    "Pages": ("page_count", lambda value: f"{value:.0f}"),
+    "Duration": ("duration", lambda value: f"{value / 60:.1f} min"),
+    "Image area": ("area", lambda value: f"{value / 1e6:.1f} MP"),
+}
+
+
+def print_distributions(stats: StatCalculator, file: TextIO | None = None) -> None:
+    """
+    Prints percentiles of the numeric columns and the size and age histograms.
+    """
+    analytics = stats.analytics()
+    print("Percentiles:", file=file)
+    for label, (column, fmt) in DISTRIBUTION_COLUMNS.items():
+        percentiles = analytics.percentiles(column)
+        if percentiles:
+            print(f"\t{label}: " + ", ".join(f"p{p} {fmt(value)}" for p, value in percentiles.items()), file=file)
+
+    for title, histogram in (
+        ("Size distribution:", analytics.size_histogram()),
+        ("Age by modification time:", analytics.age_histogram()),
+    ):
+        print(title, file=file)
+        for row in histogram.rows():
+            if row["files"]:
+                print(
+                    f"\t{row['bucket']}: {row['files']} files ({row['percent']:.1f}%), {convert_size(row['size'])}",
+                    file=file,
+                )
+
+
+def print_summaries(
+    args: argparse.Namespace,
+    rollup: DirectoryRollup | None,
+    grouping: GroupBy | None,
+    rows: Sequence[Mapping] | None = None,
+    file: TextIO | None = None,
+) -> None:
+    """
+    Prints the --rollup and --group-by tables, after adding the rows if they were not added while collecting.
+    """
+    if rollup is not None:
+        if rows is not None:
+            rollup.update(rows)
+        print_rollup(args, rollup.finish(), file=file)
+    if grouping is not None:
+        if rows is not None:
+            grouping.update(rows)
+        print_groups(grouping, file=file)
+
+
+def print_groups(grouping: GroupBy, file: TextIO | None = None) -> None:
+    names = grouping.keys + [aggregation.name for aggregation in grouping.aggregations]
+    table = [[format_group_value(name, row[name]) for name in names] for row in grouping.results()]
+    widths = [max(len(name), *(len(cells[idx]) for cells in table)) for idx, name in enumerate(names)]
+    keys = len(grouping.keys)
+
+    def line(cells: Sequence[str]) -> str:
+        # keys are aligned left, aggregations right
+        aligned = [
+            cell.ljust(width) if idx < keys else cell.rjust(width)
+            for idx, (cell, width) in enumerate(zip(cells, widths, strict=True))
+        ]
+        return "  ".join(aligned).rstrip()
+
+    print(f"\nGrouped by {', '.join(grouping.keys)}:", file=file)
+    print("\t" + line(names), file=file)
+    for cells in table:
+        print("\t" + line(cells), file=file)
+
+
+def print_rollup(args: argparse.Namespace, rollup: DirectoryRollup, file: TextIO | None = None) -> None:
+    """
+    Prints the heaviest directories for --rollup.
+    """
+    under = args.rollup_under or "."
+    if rollup.node(args.rollup_under) is None:
+        print(f"\nNo files were collected under '{under}'.", file=file)
+        return
+
+    print(f"\nTop {args.rollup} directories by {args.rollup_by} under '{under}':", file=file)
+    for node in rollup.top(args.rollup, by=args.rollup_by, under=args.rollup_under, max_depth=args.rollup_depth):
+        details = [f"{node.files} files"]
+        if node.totals["pages"]:
+            details.append(f"{node.totals['pages']:.0f} pages")
+        duration = node.totals["duration"]
+        if duration:
+            media = f"{duration / 3600:.1f} h" if duration >= 3600 else f"{duration / 60:.0f} min"
+            details.append(f"{media} of media")
+        extensions = sorted(node.extensions.items(), key=lambda item: item[1], reverse=True)[:3]
+        details.append(", ".join(f"{ext} {count}" for ext, count in extensions))
+        print(f"\t{node.path} ({convert_size(node.size)}): {'; '.join(details)}", file=file)
+
+
+def write_output(
+    fmt: str,
+    output: Path | None,
+    fieldnames: list[str],
+    rows: Iterable[Mapping],
+    delimiter: str = ",",
+    time_format: str | None = DEFAULT_TIME_FORMAT,
+) -> None:
+    if fmt == "ndjson":
+        write_ndjson(output, rows, time_format=time_format)
+    elif fmt == "sqlite":
+        write_sqlite(output, rows)  # type: ignore
+    elif fmt == "packed":
+        write_packed(output, rows)  # type: ignore
+    else:
+        write_csv(output, fieldnames, rows, delimiter=delimiter, time_format=time_format)
+
+
+def merge(args: argparse.Namespace) -> None:
+    if args.format in ("sqlite", "packed") and not args.output:
+        merge_parser.error(f"--format {args.format} requires --output")
+
+    # first pass reads only the schemas, the second streams the rows, so no part is ever held in memory
+    fieldnames = merge_fieldnames(args.parts, args.delimiter)
+    stats = StatAccumulator()
+    rows = merge_rows(args.parts, args.delimiter, stats=stats)
+    time_format = None if args.time_format == "epoch" else args.time_format
+    write_output(args.format, args.output, fieldnames, rows, delimiter=args.delimiter, time_format=time_format)
+
+    print_stats(stats, file=sys.stdout if args.output else sys.stderr)
+
+
+def read_scan(source: str, delimiter: str = ",") -> Iterable[Mapping]:
+    if not source.startswith("scan:"):
+        return read_rows(source, delimiter)
+
+    import django
+
+    # stored scans live in the web UI database, Django is only set up when one is requested
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sniffler.web.settings")
+    django.setup()
+    from django.db import DatabaseError
+
+    from .web_ui.models import ScanResult
+    from .web_ui.utils import iter_scan_rows
+
+    scan_id = source.removeprefix("scan:")
+    try:
+        # rows are decoded one at a time as the diff's external sort consumes them
+        return iter_scan_rows(ScanResult.objects.values_list("result", flat=True).get(id=int(scan_id)))
+    except (ValueError, ScanResult.DoesNotExist):
+        diff_parser.error(f"Stored scan '{scan_id}' does not exist.")
+    except DatabaseError as e:
+        diff_parser.error(f"Cannot read stored scans ({e}), are the web UI migrations applied?")
+
+
+def diff(args: argparse.Namespace) -> None:
+    summary = DiffSummary()
+    entries = summary.track(
+        diff_scans(read_scan(args.old, args.delimiter), read_scan(args.new, args.delimiter), args.chunk_size)
+    )
+    if args.summary:
+        for _ in entries:
+            pass
+    else:
+        rows = (entry.to_row() for entry in entries)
+        write_output(args.format, args.output, DIFF_FIELDNAMES, rows, delimiter=args.delimiter, time_format=None)
+
+    file = sys.stdout if args.output or args.summary else sys.stderr
+    changes = ", ".join(f"{change} {count}" for change, count in summary.changes.most_common())
+    print("Changes:", changes or "none", file=file)
+    print("Deltas by extension:", file=file)
+    for ext, files_delta, size_delta in summary.by_extension():
+        sign = "-" if size_delta < 0 else "+"
+        print(f"\t{ext}: {files_delta:+d} files, {sign}{convert_size(abs(size_delta))}", file=file)
+
+
+def print_estimates(estimator: SampleEstimator) -> None:
+    def size(estimate: Estimate) -> str:
+        return f"{convert_size(estimate.value)} ({convert_size(estimate.low)} - {convert_size(estimate.high)})"
+
+    print(
+        f"Sampled {len(estimator.sample)} of {estimator.population_size} files, {estimator.confidence:.0%} intervals."
+    )
+    print("Total files:", estimator.population_size)
+    print("Estimated total file size:", size(estimator.total_size()))
+    print("Estimated total pages:", estimator.total_pages())
+    print("Estimated total duration (s):", estimator.total_duration())
+
+    print("Estimated count by extension:")
+    for ext, estimate in estimator.count_by_extension().items():
+        print(f"\t{ext}: {estimate}")
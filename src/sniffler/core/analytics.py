@@ -0,0 +1,168 @@
+import itertools
+import math
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .utils import convert_size
+
+# the columns extracted into arrays, "area" is derived from width and height
+NUMERIC_COLUMNS = ("size", "page_count", "duration", "width", "height", "modified", "created")
+PERCENTILES = (50, 90, 99)
+# the upper bounds of the size buckets in bytes, the last bucket is open
+SIZE_BOUNDS = (1024, 10 * 1024, 100 * 1024, 1024**2, 10 * 1024**2, 100 * 1024**2, 1024**3)
+# the upper bounds of the age buckets in days and their names, the last bucket is open
+AGE_BOUNDS = ((1, "1 day"), (7, "1 week"), (30, "1 month"), (365, "1 year"), (5 * 365, "5 years"))
+
+
+class Histogram(NamedTuple):
+    """
+    The number of values and the total size of the files in each bucket of a histogram.
+    """
+
+    labels: list[str]
+    counts: list[int]
+    sizes: list[float]
+
+    def rows(self) -> list[dict[str, Any]]:
+        """
+        Returns one row per bucket, with the share of all counted files in percent.
+        """
+        total = sum(self.counts)
+        return [
+            {"bucket": label, "files": count, "size": size, "percent": 100 * count / total if total else 0.0}
+            for label, count, size in zip(self.labels, self.counts, self.sizes, strict=True)
+        ]
+
+
+def numeric_array(values: Iterable[Any]) -> np.ndarray:
+    """
+    Converts collected values to a float array, with NaN for missing and non-numeric values.
+    """
+    values = list(values)
+    try:
+        # the fast path: numbers, numeric strings and None, which numpy converts to NaN
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.fromiter(map(_to_float, values), dtype=float, count=len(values))
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _bucket_labels(bounds: Sequence[str]) -> list[str]:
+    labels = [f"< {bounds[0]}"]
+    labels += [f"{low} – {high}" for low, high in itertools.pairwise(bounds)]
+    labels.append(f"≥ {bounds[-1]}")
+    return labels
+
+
+class NumericAnalytics:
+    """
+    Distributions of the numeric columns of a collection, computed with NumPy.
+
+    The columns are extracted from the rows into float arrays once, missing values become NaN. Percentiles,
+    histograms and age buckets are then vectorized operations over those arrays instead of loops over row dicts.
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray]) -> None:
+        """
+        Args:
+            columns (Mapping[str, np.ndarray]): Equally long float arrays by column name, see ``from_rows``.
+        """
+        self.columns = dict(columns)
+        self.size = len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[Mapping[str, Any]], columns: Sequence[str] = NUMERIC_COLUMNS
+    ) -> "NumericAnalytics":
+        """
+        Extracts the numeric columns of rows, e.g. a Collection.
+        """
+        return cls({column: numeric_array([row.get(column) for row in rows]) for column in columns})
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns the values of a column that are present, without NaN. "area" is width × height.
+        """
+        if name == "area":
+            values = self.column_or_nan("width") * self.column_or_nan("height")
+        else:
+            values = self.column_or_nan(name)
+        return values[~np.isnan(values)]
+
+    def column_or_nan(self, name: str) -> np.ndarray:
+        """
+        Returns all values of a column, NaN where a row has no value.
+        """
+        values = self.columns.get(name)
+        return values if values is not None else np.full(self.size, np.nan)
+
+    def percentiles(self, column: str = "size", percentiles: Sequence[float] = PERCENTILES) -> dict[float, float]:
+        """
+        Returns percentiles of a column, e.g. the median and p99 file size.
+
+        Args:
+            column (str, optional): The column, see ``column``. Defaults to "size".
+            percentiles (Sequence[float], optional): The percentiles, from 0 to 100. Defaults to PERCENTILES.
+
+        Returns:
+            dict[float, float]: The value of every percentile, empty if no row has a value.
+        """
+        values = self.column(column)
+        if not len(values):
+            return {}
+        return dict(zip(percentiles, np.percentile(values, percentiles).tolist(), strict=True))
+
+    def _histogram(self, keys: np.ndarray, bounds: Sequence[float], labels: list[str]) -> Histogram:
+        sizes = self.column_or_nan("size")
+        present = ~np.isnan(keys)
+        buckets = np.searchsorted(np.asarray(bounds, dtype=float), keys[present], side="right")
+        counts = np.bincount(buckets, minlength=len(labels))
+        weights = np.nan_to_num(sizes[present])
+        totals = np.bincount(buckets, weights=weights, minlength=len(labels))
+        return Histogram(labels, counts.tolist(), totals.tolist())
+
+    def size_histogram(self, bounds: Sequence[int] = SIZE_BOUNDS) -> Histogram:
+        """
+        Counts the files in buckets of size.
+
+        Args:
+            bounds (Sequence[int], optional): The upper bounds of the buckets in bytes, in ascending order, the last
+                bucket holds everything above. Defaults to SIZE_BOUNDS, from 1 KB to 1 GB in steps of 10.
+
+        Returns:
+            Histogram: One bucket more than there are bounds.
+        """
+        labels = _bucket_labels([convert_size(bound) for bound in bounds])
+        return self._histogram(self.column_or_nan("size"), bounds, labels)
+
+    def age_histogram(
+        self,
+        column: str = "modified",
+        now: float | None = None,
+        bounds: Sequence[tuple[float, str]] = AGE_BOUNDS,
+    ) -> Histogram:
+        """
+        Counts the files in buckets of age, e.g. to find data nobody touched for years.
+
+        Args:
+            column (str, optional): The epoch timestamp column. Defaults to "modified".
+            now (float | None, optional): The epoch time ages are measured from. Defaults to None, the current time.
+            bounds (Sequence[tuple[float, str]], optional): The upper bounds of the buckets in days with their names,
+                in ascending order. Defaults to AGE_BOUNDS, from a day to 5 years.
+
+        Returns:
+            Histogram: One bucket more than there are bounds. Timestamps in the future count as age 0.
+        """
+        now = time.time() if now is None else now
+        days = np.maximum((now - self.column_or_nan(column)) / 86400, 0)
+        labels = _bucket_labels([name for _, name in bounds])
+        return self._histogram(days, [bound for bound, _ in bounds], labels)
@@ -1,34 +1,126 @@
+import contextlib
+import itertools
 import os
-from collections.abc import Generator, Iterable
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, Protocol
 
-from tqdm import tqdm
+from .concurrency import AdaptivePool, Completed
+from .errors import ErrorLog, is_transient
+from .ignore import IgnoreRules
+from .journal import Journal
+from .profiling import Profiler
+from .sampling import reservoir_sample
+from .sharding import SHARD_STRATEGIES, shard_of
+from ..researchers import InfoValue, Researcher, is_thread_safe, researcher_name
 
-from ..researchers import InfoValue, Researcher
+RuleSet = tuple[str, IgnoreRules]
+# a directory to list: its path, relative path, depth and the rules that apply in it
+DirItem = tuple[str, str, int, tuple[RuleSet, ...]]
 
 
 class Explorer:
-    def __init__(self, path: str | Path):
+    def __init__(
+        self,
+        path: str | Path,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        exclude_from: Iterable[str | Path] | None = None,
+        ignore_file_names: Iterable[str] | None = None,
+        max_depth: int | None = None,
+        skip_hidden: bool = False,
+        one_file_system: bool = False,
+        follow_symlinks: bool = False,
+        shard: tuple[int, int] | None = None,
+        shard_by: str = "top",
+        threads: int | None = None,
+        ordered: bool = True,
+        max_pending: int = 1024,
+        scandir: Callable[[str], Iterable[os.DirEntry]] = os.scandir,
+    ):
         """
         Initializes the Collector with the given path.
 
+        All filters are applied while a directory is listed, so excluded subtrees are never entered or stat'ed.
+
         Args:
             path (str | Path): The file system path to be resolved.
+            include (Iterable[str] | None, optional): Gitignore-style patterns, if given only files matching one
+                of them are yielded. Directories are not filtered by these. Defaults to None.
+            exclude (Iterable[str] | None, optional): Gitignore-style patterns of files and directories to skip,
+                relative to the root (e.g. ``node_modules/``, ``*.tmp``, ``/build``). Defaults to None.
+            exclude_from (Iterable[str | Path] | None, optional): Files with gitignore-style rules relative to the root.
+                Defaults to None.
+            ignore_file_names (Iterable[str] | None, optional): Names of rule files (e.g. ``.gitignore``) that are
+                honoured in every directory they appear in, for that directory and its descendants. Defaults to None.
+            max_depth (int | None, optional): The maximum depth to descend to, 0 lists only the root directory.
+                Defaults to None (unlimited).
+            skip_hidden (bool, optional): If True, skips files and directories whose name starts with a dot.
+                Defaults to False.
+            one_file_system (bool, optional): If True, does not descend into directories on other filesystems
+                (mount points). Defaults to False.
+            follow_symlinks (bool, optional): If True, descends into symlinked directories, each directory is
+                visited at most once, so symlink loops are safe. Defaults to False.
+            shard (tuple[int, int] | None, optional): ``(index, count)`` to yield only one of ``count`` deterministic
+                shards of the tree. Defaults to None (the whole tree).
+            shard_by (str, optional): "top" assigns every top-level entry (with its whole subtree) to a shard, so
+                other shards' subtrees are never entered. "hash" assigns every file by its relative path, which
+                balances better but walks the whole tree. Defaults to "top".
+            threads (int | None, optional): If greater than 1, directories are listed concurrently by this many
+                threads, which hides the round trip of every listing on network filesystems. Defaults to None
+                (sequential).
+            ordered (bool, optional): If True, a concurrent walk yields files in the same order as a sequential one.
+                Otherwise the files of a directory are yielded as soon as it is listed, still together. With
+                ``follow_symlinks``, which of several links to a directory is descended into may vary. Defaults to
+                True.
+            max_pending (int, optional): The maximum number of directories of a concurrent walk that are being
+                listed or listed but not yet yielded, which bounds its memory. Defaults to 1024.
+            scandir (Callable[[str], Iterable[os.DirEntry]], optional): Lists the entries of a directory, e.g. to
+                measure listings or to add latency in a benchmark. Defaults to ``os.scandir``.
 
         Raises:
             FileNotFoundError: If the path does not exist.
+            ValueError: If the shard strategy is unknown.
         """
         self.path = Path(path).resolve(strict=True)
-
-    def count_files(self) -> int:
+        self.include = IgnoreRules(include) if include else None
+        self.max_depth = max_depth
+        self.skip_hidden = skip_hidden
+        self.one_file_system = one_file_system
+        self.follow_symlinks = follow_symlinks
+        self.ignore_file_names = frozenset(ignore_file_names or ())
+        if shard_by not in SHARD_STRATEGIES:
+            raise ValueError(f"Unknown shard strategy '{shard_by}', expected one of {SHARD_STRATEGIES}.")
+        self.shard = shard
+        self.shard_by = shard_by
+        self.threads = threads
+        self.ordered = ordered
+        self.max_pending = max(1, max_pending)
+        self.scandir = scandir
+        self._visited_lock = threading.Lock()
+
+        root_rules = IgnoreRules(exclude or ())
+        for rule_file in exclude_from or ():
+            root_rules.rules += IgnoreRules.from_file(rule_file).rules
+        self.root_rules: tuple[RuleSet, ...] = (("", root_rules),) if root_rules else ()
+
+    def count_files(self, stop: threading.Event | None = None) -> int:
         """
         Counts the number of files within the specified directory.
 
+        Args:
+            stop (threading.Event | None, optional): Ends counting early when set, e.g. when a scan is cancelled
+                while its files are counted. Defaults to None.
+
         Returns:
-            int: The number of files found in the directory tree.
+            int: The number of files found in the directory tree, or until ``stop`` was set.
         """
-        return sum(1 for _ in self.files())
+        return sum(1 for _ in _until(self.files(), stop))
 
     def files(self) -> Generator[Path, Any, None]:
         """
@@ -37,9 +129,227 @@ class Explorer:
         Yields:
             Generator[Path, Any, None]: A generator that yields Path objects for each file found in the directory tree.
         """
-        for root, _, files in os.walk(self.path):
+        root = str(self.path)
+        root_dev = os.stat(root).st_dev if self.one_file_system else None
+        visited = {self.dir_id(root)} if self.follow_symlinks else None
+        if self.threads is not None and self.threads > 1:
+            for files in self._parallel_listings((root, "", 0, self.root_rules), root_dev, visited):
+                for f in files:
+                    yield Path(f)
+            return
+        # depth-first, directories are visited in listing order like os.walk
+        stack: list[DirItem] = [(root, "", 0, self.root_rules)]
+        while stack:
+            dirpath, relpath, depth, rules = stack.pop()
+            files, subdirs = self.list_dir(dirpath, relpath, depth, rules, root_dev, visited)
             for f in files:
-                yield Path(root, f)
+                yield Path(f)
+            stack.extend(reversed(subdirs))
+
+    def _parallel_listings(
+        self, root: DirItem, root_dev: int | None, visited: set[tuple[int, int]] | None
+    ) -> Generator[list[str], Any, None]:
+        """
+        Lists directories on a thread pool and yields the files of every directory.
+
+        Directories waiting to be listed are kept on a stack, so the pool works ahead along the order of a
+        depth-first walk. In ordered mode, listings that arrive early are held until every directory before them is
+        yielded. At most ``max_pending`` directories are in flight or held at a time, only the directory the ordered
+        walk waits for may exceed that.
+        """
+        pool = ThreadPoolExecutor(self.threads, thread_name_prefix="sniffler-walk")
+        walk = _ConcurrentListing(self, pool, root, root_dev, visited)
+        try:
+            if self.ordered:
+                yield from self._ordered_listings(walk, root)
+            else:
+                yield from self._unordered_listings(walk)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _unordered_listings(walk: "_ConcurrentListing") -> Generator[list[str], Any, None]:
+        while walk.todo or walk.running:
+            walk.fill()
+            for _, files, _ in walk.completed():
+                yield files
+
+    @staticmethod
+    def _ordered_listings(walk: "_ConcurrentListing", root: DirItem) -> Generator[list[str], Any, None]:
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            key = item[0]
+            while key not in walk.listed:
+                walk.fill()
+                if key not in walk.scheduled:
+                    # the walk cannot go on without it, whatever the bound
+                    walk.submit(item)
+                for done, files, subdirs in walk.completed():
+                    walk.listed[done[0]] = (files, subdirs)
+            files, subdirs = walk.listed.pop(key)
+            yield files
+            stack.extend(reversed(subdirs))
+
+    @staticmethod
+    def dir_id(path: str) -> tuple[int, int]:
+        """
+        Returns the device and inode of a directory, which identify it whatever the path it is reached by.
+        """
+        st = os.stat(path)
+        return st.st_dev, st.st_ino
+
+    def list_dir(
+        self,
+        dirpath: str,
+        relpath: str,
+        depth: int,
+        rules: tuple[RuleSet, ...],
+        root_dev: int | None,
+        visited: set[tuple[int, int]] | None,
+    ) -> tuple[list[str], list[DirItem]]:
+        """
+        Lists a single directory, applying all filters, e.g. to list a directory again after it changed.
+
+        Args:
+            dirpath (str): The absolute path of the directory.
+            relpath (str): Its path relative to the root, with slashes, empty for the root.
+            depth (int): Its depth below the root, 0 for the root.
+            rules (tuple[RuleSet, ...]): The ignore rules that apply in it, by the directory they were defined in.
+            root_dev (int | None): The device of the root if ``one_file_system`` is set, otherwise None.
+            visited (set[tuple[int, int]] | None): The ``dir_id`` of every directory entered so far if
+                ``follow_symlinks`` is set, otherwise None. Subdirectories returned are added to it.
+
+        Returns:
+            tuple: The paths of the accepted files, and ``(path, relative path, depth, rules)`` for every
+            subdirectory that should be descended into.
+        """
+        try:
+            entries = list(self.scandir(dirpath))
+        except OSError:
+            return [], []
+
+        if self.ignore_file_names:
+            rules = self._local_rules(entries, relpath, rules)
+
+        descend = self.max_depth is None or depth < self.max_depth
+        files: list[str] = []
+        subdirs = []
+        for entry in entries:
+            is_dir = self._entry_kind(entry, descend)
+            if is_dir is None:
+                continue
+            entry_relpath = f"{relpath}/{entry.name}" if relpath else entry.name
+            if rules and self._excluded(entry_relpath, is_dir, rules):
+                continue
+            if self.shard is not None and not self._in_shard(entry.name, entry_relpath, is_dir, depth):
+                continue
+
+            if not is_dir:
+                if self.include is None or self.include.match(entry_relpath, False):
+                    files.append(entry.path)
+            elif self._descends(entry, root_dev, visited):
+                subdirs.append((entry.path, entry_relpath, depth + 1, rules))
+        return files, subdirs
+
+    def _local_rules(self, entries: list[os.DirEntry], relpath: str, rules: tuple[RuleSet, ...]) -> tuple[RuleSet, ...]:
+        # the rules of the ignore files in a directory apply to it and its descendants
+        for entry in entries:
+            if entry.name in self.ignore_file_names:
+                local_rules = IgnoreRules.from_file(entry.path)
+                if local_rules:
+                    rules = (*rules, (relpath, local_rules))
+        return rules
+
+    def _entry_kind(self, entry: os.DirEntry, descend: bool) -> bool | None:
+        # whether an entry is a directory, None if it is skipped for being hidden or a directory too deep
+        if self.skip_hidden and entry.name.startswith("."):
+            return None
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        return None if is_dir and not descend else is_dir
+
+    def _in_shard(self, name: str, relpath: str, is_dir: bool, depth: int) -> bool:
+        index, count = self.shard  # type: ignore
+        if self.shard_by == "top":
+            return depth != 0 or shard_of(name, count) == index
+        return is_dir or shard_of(relpath, count) == index
+
+    def _descends(self, entry: os.DirEntry, root_dev: int | None, visited: set[tuple[int, int]] | None) -> bool:
+        # whether to enter a subdirectory: not a symlink unless followed, on the same filesystem if required, and
+        # not visited before if symlinks are followed
+        try:
+            if not self.follow_symlinks and entry.is_symlink():
+                return False
+            if root_dev is not None and entry.stat().st_dev != root_dev:
+                return False
+            if visited is not None:
+                st = entry.stat()
+                dir_id = (st.st_dev, st.st_ino)
+                # listings may run concurrently, see threads
+                with self._visited_lock:
+                    if dir_id in visited:
+                        return False
+                    visited.add(dir_id)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _excluded(relpath: str, is_dir: bool, rules: tuple[RuleSet, ...]) -> bool:
+        # rules from deeper directories take precedence, as in git
+        for base, ruleset in reversed(rules):
+            result = ruleset.match(relpath[len(base) + 1 :] if base else relpath, is_dir)
+            if result is not None:
+                return result
+        return False
+
+
+class _ConcurrentListing:
+    """
+    The directories of a concurrent walk, see ``Explorer._parallel_listings``: to be listed, being listed on the
+    pool, and listed but held back by an ordered walk.
+    """
+
+    def __init__(
+        self,
+        explorer: Explorer,
+        pool: ThreadPoolExecutor,
+        root: DirItem,
+        root_dev: int | None,
+        visited: set[tuple[int, int]] | None,
+    ) -> None:
+        self.explorer = explorer
+        self.pool = pool
+        self.root_dev = root_dev
+        self.visited = visited
+        self.running: dict[Future, DirItem] = {}
+        self.listed: dict[str, tuple[list[str], list[DirItem]]] = {}
+        self.todo: list[DirItem] = [root]
+        self.scheduled: set[str] = set()
+
+    def submit(self, item: DirItem) -> None:
+        self.scheduled.add(item[0])
+        self.running[self.pool.submit(self.explorer.list_dir, *item, self.root_dev, self.visited)] = item
+
+    def fill(self) -> None:
+        while self.todo and len(self.running) + len(self.listed) < self.explorer.max_pending:
+            item = self.todo.pop()
+            if item[0] not in self.scheduled:
+                self.submit(item)
+
+    def completed(self) -> Generator[tuple[DirItem, list[str], list[DirItem]], Any, None]:
+        """
+        Waits for listings to finish and yields them, queueing their subdirectories.
+        """
+        done, _ = wait(self.running, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = self.running.pop(future)
+            files, subdirs = future.result()
+            self.todo.extend(reversed(subdirs))
+            yield item, files, subdirs
 
 
 class Collection(list[dict[str, InfoValue]]):
@@ -65,6 +375,20 @@ class Collection(list[dict[str, InfoValue]]):
             self.__keys[k] = None
         return super().append(object)
 
+    def __setitem__(self, index: Any, value: Any) -> None:
+        """
+        Replaces an item (or a slice of items) and updates the internal keys.
+        """
+        if isinstance(index, slice):
+            value = list(value)
+            items = value
+        else:
+            items = [value]
+        for item in items:
+            for k in item.keys():
+                self.__keys[k] = None
+        super().__setitem__(index, value)
+
     def __repr__(self) -> str:
         return f"Collection({super().__repr__()})"
 
@@ -83,12 +407,30 @@ class ProgressBar(Protocol):
     def __call__(self, iterable: Iterable, **kwargs: Any) -> Iterable: ...
 
 
+def tqdm_progress_bar(iterable: Iterable, **kwargs: Any) -> Iterable:
+    """
+    Wraps an iterable in a tqdm progress bar, importing tqdm (which is slow to import) only when one is shown.
+    """
+    from tqdm import tqdm
+
+    return tqdm(iterable, **kwargs)
+
+
 class Collector:
     def __init__(
         self,
         path: str | Path,
         researchers: list[Researcher],
-        progress_bar: ProgressBar = tqdm,
+        progress_bar: ProgressBar = tqdm_progress_bar,
+        profiler: Profiler | None = None,
+        explorer: Explorer | None = None,
+        sample_size: int | None = None,
+        seed: int | None = None,
+        journal: Journal | None = None,
+        jobs: int | None = None,
+        errors: ErrorLog | None = None,
+        retries: int = 0,
+        retry_delay: float = 0.5,
     ) -> None:
         """
         Initializes the Collector instance.
@@ -97,6 +439,24 @@ class Collector:
             path (str | Path): The path to the directory to be explored.
             researchers (list[Researcher]): A list of Researcher instances.
             progress_bar (ProgressBar, optional): A progress bar instance, defaults to tqdm.
+            profiler (Profiler | None, optional): If given, records researcher timings, the slowest files
+                and per-phase resource usage. Defaults to None.
+            explorer (Explorer | None, optional): A preconfigured Explorer for the path, e.g. with exclude patterns.
+                Defaults to an unfiltered Explorer.
+            sample_size (int | None, optional): If given, only a uniform random sample of this many files is researched,
+                see ``sniffler.core.sampling.SampleEstimator`` for population estimates. Defaults to None.
+            seed (int | None, optional): The random seed for sampling. Defaults to None.
+            journal (Journal | None, optional): If given, finished files are checkpointed to it, and work recorded
+                by a previous run is restored instead of being researched again. Defaults to None.
+            jobs (int | None, optional): If greater than 1, researchers run concurrently, with a worker count per
+                researcher class that is tuned at runtime up to ``jobs``, see ``AdaptivePool``. Researchers that are
+                not thread-safe (see ``is_thread_safe``) keep a single worker. Rows are still yielded in walk order.
+                Defaults to None (sequential).
+            errors (ErrorLog | None, optional): Records the researchers that fail on a file. Defaults to a new
+                ErrorLog that keeps the last 1000 errors.
+            retries (int, optional): How often a researcher is tried again on a file after a transient I/O error
+                (e.g. a timeout of a share), waiting ``retry_delay`` seconds, doubled on every retry. Defaults to 0.
+            retry_delay (float, optional): The seconds before the first retry. Defaults to 0.5.
 
         Attributes:
             path (Path): The resolved absolute path to the directory.
@@ -104,12 +464,26 @@ class Collector:
             researchers (list[Researcher]): A list of Researcher instances.
             collection (Collection): A Collection instance to store collected data.
             progress_bar (ProgressBar): A progress bar instance.
+            profiler (Profiler | None): The profiler hook, if any.
+            population_size (int | None): The number of files the sample was drawn from, set after sampled collection.
+            pools (dict[str, AdaptivePool]): The worker pools per researcher class name, if ``jobs`` is set.
+            errors (ErrorLog): The errors of the researchers.
         """
         self.path = Path(path).resolve(strict=True)
-        self.explorer = Explorer(path)
+        self.explorer = explorer if explorer is not None else Explorer(path)
         self.researchers = researchers
         self.collection: Collection = Collection()
         self.progress_bar = progress_bar
+        self.profiler = profiler
+        self.sample_size = sample_size
+        self.seed = seed
+        self.population_size: int | None = None
+        self.journal = journal
+        self.jobs = jobs
+        self.pools: dict[str, AdaptivePool] = {}
+        self.errors = errors if errors is not None else ErrorLog()
+        self.retries = retries
+        self.retry_delay = retry_delay
 
     def add_researcher(self, researcher: Researcher) -> None:
         """
@@ -120,10 +494,48 @@ class Collector:
         """
         self.researchers.append(researcher)
 
+    def research(
+        self,
+        file: Path,
+        relpath: Path | None = None,
+        researchers: Iterable[Researcher] | None = None,
+    ) -> dict[str, InfoValue]:
+        """
+        Researches a single file with all researchers that accept it.
+
+        Args:
+            file (Path): The absolute path to the file.
+            relpath (Path | None, optional): The path relative to the collector's path. Computed if not given.
+            researchers (Iterable[Researcher] | None, optional): The researchers to use. Defaults to the
+                collector's researchers.
+
+        Returns:
+            dict[str, InfoValue]: The collected row, with ``path`` relative to the collector's path.
+        """
+        profiler = self.profiler
+        file_info: dict[str, InfoValue] = {"path": relpath if relpath is not None else file.relative_to(self.path)}
+        file_start = time.perf_counter() if profiler is not None else 0.0
+        for researcher in self.researchers if researchers is None else researchers:
+            if researcher.accepts(file):
+                start = time.perf_counter() if profiler is not None else 0.0
+                info, error, attempts = _get_info(researcher, file, self.retries, self.retry_delay)
+                if error is not None:
+                    self.errors.record(file_info["path"], researcher_name(researcher), error, attempts)  # type: ignore
+                else:
+                    file_info |= info
+                    if attempts > 1:
+                        self.errors.record_retried()
+                if profiler is not None:
+                    profiler.record(researcher, time.perf_counter() - start)
+        if profiler is not None:
+            profiler.record_file(file, time.perf_counter() - file_start)
+        return file_info
+
     def collect(
         self,
         show_progress: bool = False,
         progress_bar_kwargs: dict[str, Any] | None = None,
+        stop: threading.Event | None = None,
     ) -> None:
         """
         Collects information about files using the configured researchers and adds it to the collection.
@@ -131,24 +543,230 @@ class Collector:
         Args:
             show_progress (bool): If True, displays a progress bar during collection. Defaults to False.
             progress_bar_kwargs (dict[str, Any] | None): Additional keyword arguments to pass to the progress bar. Defaults to None.
+            stop (threading.Event | None): Ends collection early when set, see ``iter_collect``. Defaults to None.
 
         Returns:
             None
         """
-        file_iterator = self.explorer.files()
+        for _ in self.iter_collect(show_progress=show_progress, progress_bar_kwargs=progress_bar_kwargs, stop=stop):
+            pass
+
+    def iter_collect(
+        self,
+        show_progress: bool = False,
+        progress_bar_kwargs: dict[str, Any] | None = None,
+        store: bool = True,
+        stop: threading.Event | None = None,
+    ) -> Generator[dict[str, InfoValue], Any, None]:
+        """
+        Collects information about files and yields each row as soon as it is researched.
 
-        if progress_bar_kwargs is None:
-            progress_bar_kwargs = {}
+        Args:
+            show_progress (bool): If True, displays a progress bar during collection. Defaults to False.
+            progress_bar_kwargs (dict[str, Any] | None): Additional keyword arguments to pass to the progress bar. Defaults to None.
+            store (bool): If True, rows are also appended to the collection. Defaults to True.
+            stop (threading.Event | None): Ends collection early when set, e.g. from a cancel button in another
+                thread. The rows collected until then are kept, and the journal is flushed. Defaults to None.
 
+        Yields:
+            Generator[dict[str, InfoValue], Any, None]: A generator that yields the collected row for each file.
+        """
+        journal = self.journal
+        file_iterator = self._files(show_progress, progress_bar_kwargs or {}, stop)
+        if journal is not None:
+            for file_info in journal.restored_rows():
+                if store:
+                    self.collection.append(file_info)
+                yield file_info
+
+        try:
+            for file_info in self._checkpointed(self._research_files(file_iterator), stop):
+                if store:
+                    self.collection.append(file_info)
+                yield file_info
+        finally:
+            if journal is not None:
+                journal.flush()
+
+    def _files(
+        self, show_progress: bool, progress_bar_kwargs: dict[str, Any], stop: threading.Event | None
+    ) -> Iterable[Path]:
+        """
+        Returns the files to research: the walk (timed if profiling), or the sample of it, with a progress bar.
+        Nothing is researched if ``stop`` is set while the tree is walked ahead to sample or count it.
+        """
+        profiler = self.profiler
+        file_iterator: Iterable[Path] = self.explorer.files()
+        total: int | None = None
+        if profiler is not None:
+            file_iterator = profiler.timed(file_iterator, "walk")
+
+        if self.sample_size is not None:
+            # the whole tree is walked, but only the sample is researched
+            sample, self.population_size = reservoir_sample(
+                _until(file_iterator, stop), self.sample_size, random.Random(self.seed)
+            )
+            sample.sort()
+            file_iterator = iter(sample)
+            total = len(sample)
+        elif show_progress:
+            with profiler.phase("walk") if profiler is not None else contextlib.nullcontext():
+                total = self.explorer.count_files(stop)
+
+        if stop is not None and stop.is_set():
+            return ()
         if show_progress:
-            file_iterator = self.progress_bar(file_iterator, total=self.explorer.count_files(), **progress_bar_kwargs)
-
-        for f in file_iterator:
-            file_info = {"path": f.relative_to(self.path)}
-            for researcher in self.researchers:
-                if researcher.accepts(f):
-                    try:
-                        file_info |= researcher.get_info(f)
-                    except Exception as e:
-                        print(f"Error processing '{f}': {e}")
-            self.collection.append(file_info)
+            file_iterator = self.progress_bar(file_iterator, total=total, **progress_bar_kwargs)
+        return file_iterator
+
+    def _checkpointed(
+        self,
+        results: Iterable[tuple[Path, Path, dict[str, InfoValue] | None]],
+        stop: threading.Event | None,
+    ) -> Generator[dict[str, InfoValue], Any, None]:
+        """
+        Passes on the researched rows until ``stop`` is set, recording them and the finished directories in the
+        journal, if any.
+        """
+        journal = self.journal
+        current_dir = None
+        for _f, relpath, file_info in results:
+            if stop is not None and stop.is_set():
+                # the current directory is incomplete, it must not be marked done in the journal
+                return
+            if journal is not None:
+                if relpath.parent != current_dir:
+                    # files of a directory are listed together, so the previous one is complete
+                    if current_dir is not None and current_dir.as_posix() not in journal.done_dirs:
+                        journal.complete_dir(current_dir)
+                    current_dir = relpath.parent
+                if file_info is None:
+                    continue
+                journal.record(file_info)
+            yield file_info  # type: ignore
+
+        if journal is not None and current_dir is not None and current_dir.as_posix() not in journal.done_dirs:
+            journal.complete_dir(current_dir)
+
+    def _research_files(
+        self, files: Iterable[Path]
+    ) -> Generator[tuple[Path, Path, dict[str, InfoValue] | None], Any, None]:
+        """
+        Researches files in walk order, sequentially or with adaptive concurrency if ``jobs`` is set.
+
+        Yields:
+            tuple: The file, its relative path, and the collected row, or None if the journal has it already.
+        """
+        journal = self.journal
+
+        def items() -> Generator[tuple[Path, Path, bool], Any, None]:
+            for f in files:
+                relpath = f.relative_to(self.path)
+                yield f, relpath, journal is not None and journal.is_done(relpath)
+
+        if self.jobs is None or self.jobs <= 1:
+            for f, relpath, done in items():
+                yield f, relpath, None if done else self.research(f, relpath)
+            return
+
+        # a window of files is in flight at a time, rows are still yielded in walk order
+        pending: deque[tuple[Path, Path, list[tuple[Researcher, Future | Completed]] | None]] = deque()
+        try:
+            for f, relpath, done in items():
+                tasks = None
+                if not done:
+                    tasks = [
+                        (
+                            researcher,
+                            self._pool(researcher).submit(_timed_info, researcher, f, self.retries, self.retry_delay),
+                        )
+                        for researcher in self.researchers
+                        if researcher.accepts(f)
+                    ]
+                pending.append((f, relpath, tasks))
+                window = 4 * sum(pool.workers for pool in self.pools.values()) + 16
+                while pending and (len(pending) > window or all(future.done() for _, future in pending[0][2] or ())):
+                    yield self._finish(*pending.popleft())
+            while pending:
+                yield self._finish(*pending.popleft())
+        finally:
+            for pool in self.pools.values():
+                pool.shutdown()
+
+    def _pool(self, researcher: Researcher) -> AdaptivePool:
+        name = researcher_name(researcher)
+        pool = self.pools.get(name)
+        if pool is None:
+            max_workers = (self.jobs or 1) if is_thread_safe(researcher) else 1
+            pool = self.pools[name] = AdaptivePool(name, max_workers=max_workers)
+        return pool
+
+    def _finish(
+        self, file: Path, relpath: Path, tasks: list[tuple[Researcher, Future | Completed]] | None
+    ) -> tuple[Path, Path, dict[str, InfoValue] | None]:
+        if tasks is None:
+            return file, relpath, None
+        profiler = self.profiler
+        file_info: dict[str, InfoValue] = {"path": relpath}
+        file_seconds = 0.0
+        for researcher, future in tasks:
+            info, error, attempts, seconds = future.result()
+            if error is not None:
+                self.errors.record(relpath, researcher_name(researcher), error, attempts)
+            else:
+                file_info |= info
+                if attempts > 1:
+                    self.errors.record_retried()
+            if profiler is not None:
+                profiler.record(researcher, seconds)
+            file_seconds += seconds
+        if profiler is not None:
+            profiler.record_file(file, file_seconds)
+        return file, relpath, file_info
+
+    def concurrency_report(self) -> dict[str, dict[str, Any]]:
+        """
+        Reports the worker counts the adaptive concurrency settled on, per researcher class.
+
+        Returns:
+            dict[str, dict[str, Any]]: ``AdaptivePool.report()`` keyed by researcher class name,
+            empty unless ``jobs`` is set.
+        """
+        return {name: pool.report() for name, pool in self.pools.items()}
+
+
+def _get_info(
+    researcher: Researcher, file: Path, retries: int = 0, retry_delay: float = 0.5
+) -> tuple[dict[str, InfoValue], Exception | None, int]:
+    """
+    Researches a file, trying again after transient I/O errors.
+
+    Returns:
+        tuple: The info (empty on failure), the last error or None, and the number of attempts.
+    """
+    attempt = 1
+    while True:
+        try:
+            return researcher.get_info(file), None, attempt
+        except Exception as e:
+            if attempt > retries or not is_transient(e):
+                return {}, e, attempt
+        time.sleep(retry_delay * 2 ** (attempt - 1))
+        attempt += 1
+
+
+def _timed_info(
+    researcher: Researcher, file: Path, retries: int = 0, retry_delay: float = 0.5
+) -> tuple[dict[str, InfoValue], Exception | None, int, float]:
+    start = time.perf_counter()
+    info, error, attempts = _get_info(researcher, file, retries, retry_delay)
+    return info, error, attempts, time.perf_counter() - start
+
+
+def _until(iterable: Iterable[Path], stop: threading.Event | None) -> Iterable[Path]:
+    """
+    Passes on the items of an iterable until ``stop`` is set.
+    """
+    if stop is None:
+        return iterable
+    return itertools.takewhile(lambda _: not stop.is_set(), iterable)
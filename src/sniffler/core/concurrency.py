@@ -0,0 +1,198 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Generic, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Completed(Generic[T]):
+    """
+    The result of an inline call, with the parts of the Future interface the collector uses.
+    """
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value: T) -> None:
+        self._value = value
+
+    def done(self) -> bool:
+        return True
+
+    def result(self) -> T:
+        return self._value
+
+
+class TuningStep(NamedTuple):
+    """
+    A measurement window of an AdaptivePool and the worker count chosen after it.
+    """
+
+    seconds: float
+    calls: int
+    throughput: float
+    io_wait: float
+    workers: int
+
+
+class AdaptivePool:
+    """
+    Runs calls of one kind (e.g. ``get_info`` of one researcher class) with a worker count tuned at runtime.
+
+    Every ``interval`` seconds the pool measures its throughput (calls per second) and I/O wait (the share of the
+    calls' wall time not spent on the CPU of the calling thread), and adjusts the number of workers with additive
+    increase and multiplicative decrease: one more worker while calls mostly wait and throughput still improves,
+    30% fewer when throughput drops. With a single worker, calls run inline in the submitting thread without
+    thread overhead, which suits cheap CPU-bound calls that would only contend for the GIL.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 32,
+        interval: float = 0.25,
+        io_wait_threshold: float = 0.3,
+        min_calls: int = 8,
+    ) -> None:
+        """
+        Initializes the pool with a single, inline worker.
+
+        Args:
+            name (str): The name of the pool, used for thread names and reports.
+            max_workers (int, optional): The upper bound for the worker count. Defaults to 32.
+            interval (float, optional): The length of a measurement window in seconds. Defaults to 0.25.
+            io_wait_threshold (float, optional): The I/O wait share above which more workers are tried.
+                Defaults to 0.3.
+            min_calls (int, optional): The minimum number of calls in a window to tune on. Defaults to 8.
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.interval = interval
+        self.io_wait_threshold = io_wait_threshold
+        self.min_calls = min_calls
+        self.workers = 1
+        self.peak_workers = 1
+        self.calls = 0
+        self.history: list[TuningStep] = []
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._gate = threading.Condition()
+        self._active = 0
+        self._lock = threading.Lock()
+        self._window_start = time.perf_counter()
+        self._window_calls = 0
+        self._window_wall = 0.0
+        self._window_cpu = 0.0
+        self._saturated = False
+        self._last_throughput = 0.0
+        self._steady_windows = 0
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> Future[T] | Completed[T]:
+        """
+        Schedules a call, or runs it right away while the pool has a single worker.
+
+        Args:
+            fn (Callable[..., T]): The function to call, which should not raise.
+            *args (Any): The arguments of the call.
+
+        Returns:
+            Future[T] | Completed[T]: The future of the call's result, already completed for inline calls.
+        """
+        if self.workers == 1:
+            return Completed(self._call(fn, args))
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"sniffler-{self.name}")
+        return self._executor.submit(self._gated_call, fn, args)
+
+    def _gated_call(self, fn: Callable[..., T], args: tuple) -> T:
+        # the executor has max_workers threads, the gate lets only the current worker count run at a time
+        with self._gate:
+            while self._active >= self.workers:
+                self._saturated = True
+                self._gate.wait()
+            self._active += 1
+        try:
+            return self._call(fn, args)
+        finally:
+            with self._gate:
+                self._active -= 1
+                self._gate.notify()
+
+    def _call(self, fn: Callable[..., T], args: tuple) -> T:
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            return fn(*args)
+        finally:
+            self._record(time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+    def _record(self, wall: float, cpu: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self._window_calls += 1
+            self._window_wall += wall
+            self._window_cpu += cpu
+            now = time.perf_counter()
+            if now - self._window_start >= self.interval and self._window_calls >= self.min_calls:
+                self._tune(now)
+
+    def _tune(self, now: float) -> None:
+        elapsed = now - self._window_start
+        throughput = self._window_calls / elapsed
+        io_wait = max(0.0, 1 - self._window_cpu / self._window_wall) if self._window_wall > 0 else 0.0
+        workers = self.workers
+
+        if workers == 1:
+            # inline calls share the submitting thread, their throughput is not comparable to a pool's
+            if io_wait >= self.io_wait_threshold:
+                workers = min(self.max_workers, 2)
+            throughput = 0.0
+        elif self._last_throughput and throughput < self._last_throughput * 0.9:
+            workers = max(1, int(workers * 0.7))
+        elif self._saturated and io_wait >= self.io_wait_threshold:
+            improved = throughput >= self._last_throughput * 1.05
+            # probe again now and then, the workload may have changed
+            if improved or self._steady_windows >= 5:
+                workers = min(self.max_workers, workers + 1)
+
+        self._steady_windows = self._steady_windows + 1 if workers == self.workers else 0
+        self.history.append(TuningStep(elapsed, self._window_calls, throughput, io_wait, workers))
+        self._last_throughput = throughput
+        self.peak_workers = max(self.peak_workers, workers)
+        if workers != self.workers:
+            with self._gate:
+                self.workers = workers
+                self._gate.notify_all()
+
+        self._window_start = now
+        self._window_calls = 0
+        self._window_wall = 0.0
+        self._window_cpu = 0.0
+        self._saturated = False
+
+    def report(self) -> dict[str, Any]:
+        """
+        Summarizes the concurrency the pool settled on.
+
+        Returns:
+            dict[str, Any]: The current and peak worker count, the number of calls, and the last measured
+            throughput and I/O wait.
+        """
+        last = self.history[-1] if self.history else None
+        return {
+            "workers": self.workers,
+            "peak_workers": self.peak_workers,
+            "calls": self.calls,
+            "throughput": last.throughput if last else None,
+            "io_wait": last.io_wait if last else None,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Waits for running calls and stops the worker threads.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -1,17 +1,23 @@
 import contextlib
 import csv
 import sys
-from collections.abc import Iterable, Mapping
+from collections.abc import Generator, Iterable, Mapping
 from pathlib import Path
 from typing import Any
 
+from .utils import DEFAULT_TIME_FORMAT, format_timestamps
+
+
+def writer(f: Path | str | None, **kwargs: Any):
+    """
+    Opens a file for writing, or stdout (which is left open) if no file is given. Keyword arguments go to ``open``.
+    """
 
-def writer(f: Path | str | None):
     @contextlib.contextmanager
     def stdout():
         yield sys.stdout
 
-    return open(f, "w") if f else stdout()
+    return open(f, "w", **kwargs) if f else stdout()
 
 
 def localize_floats(row: Mapping[str, Any]) -> dict[str, Any]:
@@ -32,6 +38,7 @@ def write_csv(
     fieldnames: Iterable[str],
     data: Iterable[Mapping[str, Any]],
     delimiter: str = ",",
+    time_format: str | None = DEFAULT_TIME_FORMAT,
 ) -> None:
     """
     Write data to a CSV file with specified fieldnames and delimiter.
@@ -41,18 +48,78 @@ def write_csv(
         fieldnames (Iterable[str]): A list of field names for the CSV header.
         data (Iterable[Mapping[str, Any]]): An iterable of dictionaries containing the data to be written to the CSV file.
         delimiter (str, optional): The delimiter to use in the CSV file. Defaults to ",". When set to ";", the decimal separator will be a comma.
+        time_format (str | None, optional): The ``strftime`` format used for timestamp fields. If None, timestamps are written as epoch seconds.
 
     Returns:
         None
     """
-    if delimiter == "tab":
-        delimiter = "\t"
-    use_decimal_comma = delimiter == ";"
+    delimiter = resolve_delimiter(delimiter)
     with writer(filename) as f:
         w = csv.DictWriter(f, fieldnames=list(fieldnames), delimiter=delimiter)
         w.writeheader()
-        if use_decimal_comma:
-            for row in data:
-                w.writerow(localize_floats(row))
-        else:
-            w.writerows(data)
+        w.writerows(prepare_rows(data, delimiter, time_format))
+
+
+def resolve_delimiter(delimiter: str) -> str:
+    """
+    Resolves the "tab" alias accepted on the command line to the tab character.
+    """
+    return "\t" if delimiter == "tab" else delimiter
+
+
+def prepare_rows(
+    data: Iterable[Mapping[str, Any]],
+    delimiter: str = ",",
+    time_format: str | None = DEFAULT_TIME_FORMAT,
+) -> Iterable[Mapping[str, Any]]:
+    """
+    Formats rows for CSV output: timestamps with ``time_format``, and floats with a decimal comma if the delimiter
+    is ";".
+
+    Args:
+        data (Iterable[Mapping[str, Any]]): The rows.
+        delimiter (str, optional): The resolved delimiter. Defaults to ",".
+        time_format (str | None, optional): The ``strftime`` format for timestamp fields, None for epoch seconds.
+
+    Returns:
+        Iterable[Mapping[str, Any]]: The formatted rows, lazily.
+    """
+    if time_format is not None:
+        data = (format_timestamps(row, time_format) for row in data)
+    if delimiter == ";":
+        data = (localize_floats(row) for row in data)
+    return data
+
+
+class _Echo:
+    """
+    A file-like object that returns what is written to it, so ``csv`` writers produce strings.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(
+    fieldnames: Iterable[str],
+    data: Iterable[Mapping[str, Any]],
+    delimiter: str = ",",
+    time_format: str | None = DEFAULT_TIME_FORMAT,
+) -> Generator[str, Any, None]:
+    """
+    Produces the same output as ``write_csv``, one line at a time, e.g. for a streaming HTTP response.
+
+    Args:
+        fieldnames (Iterable[str]): The field names for the CSV header.
+        data (Iterable[Mapping[str, Any]]): The rows.
+        delimiter (str, optional): The delimiter, "tab" for a tab. Defaults to ",".
+        time_format (str | None, optional): The ``strftime`` format for timestamp fields, None for epoch seconds.
+
+    Yields:
+        Generator[str, Any, None]: The header line, then one line per row.
+    """
+    delimiter = resolve_delimiter(delimiter)
+    w = csv.DictWriter(_Echo(), fieldnames=list(fieldnames), delimiter=delimiter)  # type: ignore
+    yield w.writeheader()  # type: ignore
+    for row in prepare_rows(data, delimiter, time_format):
+        yield w.writerow(row)  # type: ignore
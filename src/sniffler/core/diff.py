@@ -0,0 +1,217 @@
+import heapq
+import json
+import tempfile
+from collections import Counter, defaultdict
+from collections.abc import Generator, Iterable, Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .ndjson_writer import serialize_row
+from .stats import to_number
+
+CHANGE_TYPES = ("added", "removed", "grown", "shrunk", "modified")
+DIFF_FIELDNAMES = ["change", "path", "extension", "old_size", "new_size", "size_delta", "old_modified", "new_modified"]
+
+
+def _path_key(row: Mapping[str, Any]) -> str:
+    return str(row.get("path", ""))
+
+
+def _read_run(filename: str) -> Generator[dict[str, Any], Any, None]:
+    decode = json.JSONDecoder().decode
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            yield decode(line)
+
+
+def sorted_by_path(
+    rows: Iterable[Mapping[str, Any]],
+    chunk_size: int = 50_000,
+    tmp_dir: Path | str | None = None,
+) -> Generator[Mapping[str, Any], Any, None]:
+    """
+    Sorts rows by path in bounded memory with an external merge sort.
+
+    Rows are sorted in chunks of ``chunk_size``. If there is more than one chunk, every chunk is spilled to a
+    temporary NDJSON file and the sorted runs are merged lazily, so at most one chunk is held in memory.
+
+    Args:
+        rows (Iterable[Mapping[str, Any]]): The rows, e.g. from ``read_rows``.
+        chunk_size (int, optional): The number of rows sorted in memory at a time. Defaults to 50_000.
+        tmp_dir (Path | str | None, optional): The directory for the sorted runs. Defaults to the system default.
+
+    Yields:
+        Generator[Mapping[str, Any], Any, None]: The rows in path order. Spilled rows come back as parsed JSON,
+        so non-JSON values such as Path objects are strings.
+    """
+    with tempfile.TemporaryDirectory(prefix="sniffler-sort-", dir=tmp_dir) as run_dir:
+        runs: list[str] = []
+        chunk: list[Mapping[str, Any]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                runs.append(_spill(chunk, run_dir, len(runs)))
+                chunk = []
+        if not runs:
+            chunk.sort(key=_path_key)
+            yield from chunk
+            return
+        if chunk:
+            runs.append(_spill(chunk, run_dir, len(runs)))
+        yield from heapq.merge(*(_read_run(run) for run in runs), key=_path_key)
+
+
+def _spill(chunk: list[Mapping[str, Any]], run_dir: str, index: int) -> str:
+    chunk.sort(key=_path_key)
+    filename = str(Path(run_dir) / f"run{index:05}.ndjson")
+    with open(filename, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(serialize_row(row) for row in chunk)
+    return filename
+
+
+class DiffEntry(NamedTuple):
+    """
+    A changed file, with its rows in the old and the new scan.
+    """
+
+    change: str
+    path: str
+    old: Mapping[str, Any] | None
+    new: Mapping[str, Any] | None
+
+    def to_row(self) -> dict[str, Any]:
+        """
+        Flattens the entry into an output row with the columns of ``DIFF_FIELDNAMES``.
+        """
+        old, new = self.old or {}, self.new or {}
+        return {
+            "change": self.change,
+            "path": self.path,
+            "extension": new.get("extension", old.get("extension")),
+            "old_size": old.get("size"),
+            "new_size": new.get("size"),
+            "size_delta": to_number(new.get("size")) - to_number(old.get("size")),
+            "old_modified": old.get("modified"),
+            "new_modified": new.get("modified"),
+        }
+
+
+def _changed(old: Mapping[str, Any], new: Mapping[str, Any]) -> bool:
+    # values are compared as text, so a CSV scan can be compared with an NDJSON or SQLite one
+    for key in old.keys() & new.keys():
+        if str(old[key]) != str(new[key]):
+            return True
+    return False
+
+
+def diff_sorted(
+    old_rows: Iterable[Mapping[str, Any]],
+    new_rows: Iterable[Mapping[str, Any]],
+) -> Generator[DiffEntry, Any, None]:
+    """
+    Compares two scans sorted by path in one streaming merge-join pass. Unchanged files are not reported.
+
+    A file present in both scans is "grown" or "shrunk" if its size changed, and "modified" if any other attribute
+    present in both rows differs, e.g. the modification time. Both scans should use the same time format.
+
+    Args:
+        old_rows (Iterable[Mapping[str, Any]]): The rows of the old scan, sorted by path.
+        new_rows (Iterable[Mapping[str, Any]]): The rows of the new scan, sorted by path.
+
+    Yields:
+        Generator[DiffEntry, Any, None]: The changes in path order.
+    """
+    old_iter, new_iter = iter(old_rows), iter(new_rows)
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+    while old is not None or new is not None:
+        old_path = _path_key(old) if old is not None else None
+        new_path = _path_key(new) if new is not None else None
+        if new_path is None or (old_path is not None and old_path < new_path):
+            yield DiffEntry("removed", old_path, old, None)  # type: ignore
+            old = next(old_iter, None)
+        elif old_path is None or new_path < old_path:
+            yield DiffEntry("added", new_path, None, new)
+            new = next(new_iter, None)
+        else:
+            old_size, new_size = to_number(old.get("size")), to_number(new.get("size"))  # type: ignore
+            if new_size > old_size:
+                yield DiffEntry("grown", new_path, old, new)
+            elif new_size < old_size:
+                yield DiffEntry("shrunk", new_path, old, new)
+            elif _changed(old, new):  # type: ignore
+                yield DiffEntry("modified", new_path, old, new)
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+
+
+def diff_scans(
+    old_rows: Iterable[Mapping[str, Any]],
+    new_rows: Iterable[Mapping[str, Any]],
+    chunk_size: int = 50_000,
+    tmp_dir: Path | str | None = None,
+) -> Generator[DiffEntry, Any, None]:
+    """
+    Compares two scans in any order, sorting both by path first, see ``sorted_by_path`` and ``diff_sorted``.
+
+    Args:
+        old_rows (Iterable[Mapping[str, Any]]): The rows of the old scan.
+        new_rows (Iterable[Mapping[str, Any]]): The rows of the new scan.
+        chunk_size (int, optional): The number of rows sorted in memory at a time. Defaults to 50_000.
+        tmp_dir (Path | str | None, optional): The directory for sorted runs. Defaults to the system default.
+
+    Yields:
+        Generator[DiffEntry, Any, None]: The changes in path order.
+    """
+    yield from diff_sorted(
+        sorted_by_path(old_rows, chunk_size, tmp_dir),
+        sorted_by_path(new_rows, chunk_size, tmp_dir),
+    )
+
+
+class DiffSummary:
+    """
+    Aggregates diff entries into counts per change type and file count and size deltas per extension.
+    """
+
+    def __init__(self) -> None:
+        self.changes: Counter[str] = Counter()
+        self.files_delta: Counter[str] = Counter()
+        self.size_delta: defaultdict[str, float] = defaultdict(float)
+
+    def add(self, entry: DiffEntry) -> None:
+        """
+        Adds a diff entry to the summary.
+
+        Args:
+            entry (DiffEntry): The entry.
+        """
+        self.changes[entry.change] += 1
+        row = entry.new if entry.new is not None else entry.old
+        extension = str(row.get("extension") or "no_extension")  # type: ignore
+        if entry.change == "added":
+            self.files_delta[extension] += 1
+        elif entry.change == "removed":
+            self.files_delta[extension] -= 1
+        size_delta = to_number((entry.new or {}).get("size")) - to_number((entry.old or {}).get("size"))
+        if size_delta:
+            self.size_delta[extension] += size_delta
+
+    def track(self, entries: Iterable[DiffEntry]) -> Generator[DiffEntry, Any, None]:
+        """
+        Passes entries through while adding them to the summary.
+        """
+        for entry in entries:
+            self.add(entry)
+            yield entry
+
+    def by_extension(self) -> list[tuple[str, int, float]]:
+        """
+        Returns the file count and size deltas per extension, largest absolute size delta first.
+
+        Returns:
+            list[tuple[str, int, float]]: ``(extension, files delta, size delta in bytes)`` tuples.
+        """
+        extensions = set(self.files_delta) | set(self.size_delta)
+        deltas = [(ext, self.files_delta[ext], self.size_delta.get(ext, 0.0)) for ext in extensions]
+        return sorted(deltas, key=lambda d: (-abs(d[2]), -abs(d[1]), d[0]))
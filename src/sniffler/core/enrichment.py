@@ -0,0 +1,126 @@
+import threading
+from collections.abc import Callable, Generator, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from .collector import Collector
+from .search import SearchEngine
+from .stats import to_number
+from ..researchers import BasicResearcher, Researcher
+
+ENRICH_ORDERS: dict[str, Callable[[Mapping[str, Any]], Any] | None] = {
+    "smallest": lambda row: to_number(row.get("size")),
+    "largest": lambda row: -to_number(row.get("size")),
+    "newest": lambda row: -to_number(row.get("modified")),
+    "walk": None,
+}
+
+
+def split_researchers(
+    researchers: Iterable[Researcher],
+    basic: tuple[type, ...] = (BasicResearcher,),
+) -> tuple[list[Researcher], list[Researcher]]:
+    """
+    Splits researchers into the cheap ones for the first pass of a two-phase scan and the expensive ones.
+
+    Args:
+        researchers (Iterable[Researcher]): All researchers.
+        basic (tuple[type, ...], optional): The cheap researcher classes. Defaults to ``(BasicResearcher,)``.
+
+    Returns:
+        tuple[list[Researcher], list[Researcher]]: The cheap and the expensive researchers.
+    """
+    cheap, expensive = [], []
+    for researcher in researchers:
+        (cheap if isinstance(researcher, basic) else expensive).append(researcher)
+    return cheap, expensive
+
+
+class Enricher:
+    """
+    The second phase of a two-phase scan: runs the expensive researchers over rows collected by a cheap first pass.
+
+    The first pass (e.g. only BasicResearcher) completes quickly and can be published right away. The Enricher then
+    researches the remaining files in priority order and replaces each row with its enriched version, so stats and
+    search results computed from the collection improve as enrichment proceeds.
+    """
+
+    def __init__(
+        self,
+        collector: Collector,
+        researchers: Iterable[Researcher],
+        order: str | Callable[[Mapping[str, Any]], Any] = "smallest",
+        search_engine: SearchEngine | None = None,
+    ) -> None:
+        """
+        Queues every row of the collector's collection that one of the researchers accepts.
+
+        Args:
+            collector (Collector): The collector, after its first pass.
+            researchers (Iterable[Researcher]): The expensive researchers.
+            order (str | Callable[[Mapping[str, Any]], Any], optional): One of ``ENRICH_ORDERS``, or a sort key
+                for rows. Defaults to "smallest", which gives the most results soonest.
+            search_engine (SearchEngine | None, optional): If given, its index is kept up to date. Defaults to None.
+
+        Attributes:
+            total (int): The number of rows to enrich.
+            done (int): The number of rows enriched so far.
+            lock (threading.Lock): Held while a row is replaced, for readers in other threads.
+
+        Raises:
+            ValueError: If the order is unknown.
+        """
+        if isinstance(order, str):
+            if order not in ENRICH_ORDERS:
+                raise ValueError(f"Unknown enrichment order '{order}', expected one of {tuple(ENRICH_ORDERS)}.")
+            order = ENRICH_ORDERS[order]  # type: ignore
+        self.collector = collector
+        self.researchers = list(researchers)
+        self.search_engine = search_engine
+        self.lock = threading.Lock()
+
+        collection = collector.collection
+        self.queue = [
+            idx
+            for idx, row in enumerate(collection)
+            if any(researcher.accepts(Path(str(row["path"]))) for researcher in self.researchers)
+        ]
+        if order is not None:
+            self.queue.sort(key=lambda idx: order(collection[idx]))  # type: ignore
+        self.total = len(self.queue)
+        self.done = 0
+
+    def enrich(self, stop: threading.Event | None = None) -> Generator[int, Any, None]:
+        """
+        Enriches the queued rows one at a time.
+
+        Args:
+            stop (threading.Event | None, optional): Ends enrichment early when set. Defaults to None.
+
+        Yields:
+            Generator[int, Any, None]: The position of each enriched row in the collection.
+        """
+        collector = self.collector
+        collection = collector.collection
+        while self.done < self.total:
+            if stop is not None and stop.is_set():
+                return
+            idx = self.queue[self.done]
+            row = collection[idx]
+            relpath = Path(str(row["path"]))
+            info = collector.research(collector.path / relpath, relpath, self.researchers)
+            with self.lock:
+                enriched = {**row, **info}
+                if self.search_engine is not None:
+                    self.search_engine.replace(idx, enriched)
+                else:
+                    collection[idx] = enriched
+                self.done += 1
+            yield idx
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """
+        Enriches all queued rows, see ``enrich``.
+        """
+        for _ in self.enrich(stop):
+            pass
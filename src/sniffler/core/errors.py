@@ -0,0 +1,137 @@
+import errno
+import json
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+# errors of network shares and busy devices that may not happen again on a second try
+TRANSIENT_ERRNOS = frozenset(
+    code
+    for code in (
+        errno.EAGAIN,
+        errno.EBUSY,
+        errno.EINTR,
+        errno.EIO,
+        errno.ETIMEDOUT,
+        getattr(errno, "ESTALE", None),
+        getattr(errno, "EHOSTDOWN", None),
+        errno.ECONNRESET,
+        errno.ECONNABORTED,
+    )
+    if code is not None
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether an error is an I/O error that may go away when the file is read again, e.g. a timeout of a share.
+    """
+    if isinstance(error, TimeoutError | InterruptedError | BlockingIOError | ConnectionError):
+        return True
+    return isinstance(error, OSError) and error.errno in TRANSIENT_ERRNOS
+
+
+class ResearchError(NamedTuple):
+    """
+    A researcher that failed on a file.
+    """
+
+    path: str
+    researcher: str
+    error_type: str
+    message: str
+    transient: bool
+    attempts: int = 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+
+class ErrorLog:
+    """
+    The errors of researchers during a collection, instead of a line printed to stdout per failure.
+
+    Only the last ``max_records`` errors are kept in memory, so a share full of damaged files cannot exhaust it,
+    while the counts per researcher and error type cover all of them. Every error can also be appended to a JSON-lines
+    side file as it happens. Errors are recorded under a lock, so researchers may fail in any thread.
+    """
+
+    def __init__(self, max_records: int = 1000, filename: Path | str | None = None) -> None:
+        """
+        Args:
+            max_records (int, optional): The number of errors kept in memory. Defaults to 1000.
+            filename (Path | str | None, optional): A JSON-lines file every error is appended to. Defaults to None.
+
+        Attributes:
+            records (deque[ResearchError]): The last errors, oldest first.
+            counts (Counter[tuple[str, str]]): The number of errors by researcher and error type.
+            total (int): The number of errors.
+            retried (int): The number of transient errors that went away on a retry.
+        """
+        self.records: deque[ResearchError] = deque(maxlen=max_records)
+        self.counts: Counter[tuple[str, str]] = Counter()
+        self.total = 0
+        self.retried = 0
+        self.filename = Path(filename) if filename is not None else None
+        self._file: IO[str] | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __enter__(self) -> "ErrorLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def record(self, path: Path | str, researcher: str, error: BaseException, attempts: int = 1) -> ResearchError:
+        """
+        Records that a researcher failed on a file.
+
+        Args:
+            path (Path | str): The path of the file, usually relative to the collected directory.
+            researcher (str): The name of the researcher class.
+            error (BaseException): The exception it raised.
+            attempts (int, optional): The number of times the file was tried. Defaults to 1.
+
+        Returns:
+            ResearchError: The record.
+        """
+        entry = ResearchError(
+            Path(path).as_posix(), researcher, type(error).__name__, str(error), is_transient(error), attempts
+        )
+        with self._lock:
+            self.records.append(entry)
+            self.counts[(entry.researcher, entry.error_type)] += 1
+            self.total += 1
+            if self.filename is not None:
+                if self._file is None:
+                    self._file = open(self.filename, "a", encoding="utf-8", newline="\n")
+                self._file.write(json.dumps({**entry.as_dict(), "time": time.time()}, ensure_ascii=False) + "\n")
+        return entry
+
+    def record_retried(self) -> None:
+        """
+        Counts a transient error that went away on a retry.
+        """
+        with self._lock:
+            self.retried += 1
+
+    def summary(self) -> list[tuple[str, str, int]]:
+        """
+        Returns the number of errors by researcher and error type, most common first.
+        """
+        with self._lock:
+            return [(researcher, error_type, count) for (researcher, error_type), count in self.counts.most_common()]
+
+    def close(self) -> None:
+        """
+        Closes the side file, if it was opened.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
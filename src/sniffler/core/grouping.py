@@ -0,0 +1,283 @@
+import math
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from .table import format_cell, sort_key
+from .utils import TIMESTAMP_FIELDS
+
+
+class ColumnSummary(NamedTuple):
+    """
+    The number, sum, minimum and maximum of the numeric values of a column in a group, which aggregations are
+    computed from.
+    """
+
+    n: int
+    total: float
+    minimum: float | None
+    maximum: float | None
+
+
+# the aggregations of a column by name, add an entry to support another one
+AGGREGATIONS: dict[str, Callable[[ColumnSummary], Any]] = {
+    "count": lambda summary: summary.n,
+    "sum": lambda summary: summary.total,
+    "min": lambda summary: summary.minimum,
+    "max": lambda summary: summary.maximum,
+    "mean": lambda summary: summary.total / summary.n if summary.n else None,
+}
+
+_NUMBER_TYPES = frozenset({int, float})
+
+
+def _number(value: Any) -> float | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# the parts of epoch timestamps that rows can be grouped by, e.g. "modified:year"
+TIMESTAMP_PARTS: dict[str, Callable[[datetime], Any]] = {
+    "year": lambda moment: moment.year,
+    "month": lambda moment: f"{moment.year}-{moment.month:02d}",
+    "date": lambda moment: moment.date().isoformat(),
+}
+
+
+class Aggregation(NamedTuple):
+    """
+    An aggregation of a column, or the number of rows if the column is None.
+    """
+
+    column: str | None
+    function: str
+
+    @property
+    def name(self) -> str:
+        return self.function if self.column is None else f"{self.column}:{self.function}"
+
+    @classmethod
+    def parse(cls, spec: str) -> "Aggregation":
+        """
+        Parses "count" (the number of rows) or "column:function", e.g. "size:sum".
+
+        Raises:
+            ValueError: If the function is not one of AGGREGATIONS.
+        """
+        column, _, function = spec.rpartition(":")
+        if function not in AGGREGATIONS:
+            expected = ", ".join(AGGREGATIONS)
+            raise ValueError(f"Unknown aggregation '{function}' in '{spec}', expected one of {expected}.")
+        if not column:
+            if function != "count":
+                raise ValueError(f"The aggregation '{spec}' needs a column, e.g. 'size:{function}'.")
+            return cls(None, function)
+        return cls(column, function)
+
+
+# every UTC offset is a multiple of 15 minutes, so all timestamps in a 15 minute slot have the same local date
+_SLOT_SECONDS = 900
+
+
+def _key_function(spec: str) -> tuple[str, Callable[[Mapping[str, Any]], Any] | None]:
+    column, _, part = spec.rpartition(":")
+    if not column or part not in TIMESTAMP_PARTS:
+        return spec, None
+    extract = TIMESTAMP_PARTS[part]
+    parts: dict[int, Any] = {}
+
+    def key(row: Mapping[str, Any]) -> Any:
+        try:
+            slot = int(float(row.get(column)) // _SLOT_SECONDS)  # type: ignore
+        except (TypeError, ValueError, OverflowError):
+            return None
+        value = parts.get(slot)
+        if value is None:
+            try:
+                value = parts[slot] = extract(datetime.fromtimestamp(slot * _SLOT_SECONDS))
+            except (ValueError, OverflowError, OSError):
+                return None
+        return value
+
+    return column, key
+
+
+def _hashable(value: Any) -> Any:
+    return value if value is None or isinstance(value, str | int | float) else str(value)
+
+
+class GroupBy:
+    """
+    Counts and aggregates rows by the values of some columns, like SQL's GROUP BY, in a single pass.
+
+    Every group is an entry of a dict keyed by its values (hash aggregation), holding the number of its rows and the
+    count, sum, minimum and maximum of every aggregated column, so any number of aggregations of a column cost one
+    update per row. Rows can be added one at a time while they are collected or streamed.
+    """
+
+    def __init__(self, keys: Sequence[str], aggregations: Sequence[str | Aggregation] = ("count",)) -> None:
+        """
+        Args:
+            keys (Sequence[str]): The columns to group by. A timestamp column can be grouped by a part of its date,
+                e.g. "modified:year" (see TIMESTAMP_PARTS).
+            aggregations (Sequence[str | Aggregation], optional): The aggregations, e.g. "count" or "size:sum", see
+                ``Aggregation.parse``. Defaults to ("count",).
+
+        Raises:
+            ValueError: If there are no keys or an aggregation is invalid.
+        """
+        if not keys:
+            raise ValueError("At least one column to group by is required.")
+        self.keys = list(keys)
+        self.aggregations = [
+            aggregation if isinstance(aggregation, Aggregation) else Aggregation.parse(aggregation)
+            for aggregation in aggregations
+        ]
+        key_functions = [_key_function(key) for key in self.keys]
+        self._key_columns = [column for column, _ in key_functions]
+        # None for the plain columns, which are looked up directly
+        self._key_functions = [function for _, function in key_functions]
+        self._plain_keys = not any(self._key_functions)
+        self._value_columns = list(dict.fromkeys(a.column for a in self.aggregations if a.column is not None))
+        # the state of every group by its key values, see update()
+        self._groups: dict[tuple[Any, ...], list[Any]] = {}
+        self._key = self._key_of()
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        The columns read from every row, to load only these (e.g. ``PackedCollection.rows(group_by.columns)``).
+        """
+        return list(dict.fromkeys(self._key_columns + self._value_columns))
+
+    def _key_of(self) -> Callable[[Mapping[str, Any]], tuple[Any, ...]]:
+        columns, functions = self._key_columns, self._key_functions
+        if self._plain_keys:
+            return lambda row: tuple(map(row.get, columns))
+        pairs = list(zip(columns, functions, strict=True))
+        return lambda row: tuple([function(row) if function else row.get(column) for column, function in pairs])
+
+    def add(self, row: Mapping[str, Any]) -> None:
+        """
+        Adds a row to its group.
+        """
+        self.update((row,))
+
+    def tee(self, rows: Iterable[Mapping[str, Any]]) -> Iterator[Mapping[str, Any]]:
+        """
+        Adds rows while passing them on, e.g. to group a collection while it is streamed to a file.
+        """
+        for row in rows:
+            self.add(row)
+            yield row
+
+    def update(self, rows: Iterable[Mapping[str, Any]]) -> "GroupBy":
+        """
+        Adds all rows, see ``add``.
+
+        Returns:
+            GroupBy: The GroupBy itself.
+        """
+        groups = self._groups
+        key_of = self._key
+        # a group is a flat list: the number of rows, then count, sum, min and max of every value column
+        positions = [(column, 1 + 4 * idx) for idx, column in enumerate(self._value_columns)]
+        empty: list[Any] = [0] + [0, 0.0, math.inf, -math.inf] * len(positions)
+        for row in rows:
+            key = key_of(row)
+            try:
+                group = groups.get(key)
+            except TypeError:
+                # e.g. a list value
+                key = tuple(map(_hashable, key))
+                group = groups.get(key)
+            if group is None:
+                group = groups[key] = empty.copy()
+            group[0] += 1
+            for column, position in positions:
+                value: Any = row.get(column)
+                if value.__class__ not in _NUMBER_TYPES:
+                    value = _number(value)
+                    if value is None:
+                        continue
+                group[position] += 1
+                group[position + 1] += value
+                if value < group[position + 2]:
+                    group[position + 2] = value
+                if value > group[position + 3]:
+                    group[position + 3] = value
+        return self
+
+    def _summary(self, group: list[Any], column: str) -> ColumnSummary:
+        position = 1 + 4 * self._value_columns.index(column)
+        n, total, minimum, maximum = group[position : position + 4]
+        return ColumnSummary(n, total, minimum if n else None, maximum if n else None)
+
+    def results(self, sort_by: str | None = None, descending: bool = True) -> list[dict[str, Any]]:
+        """
+        Returns one row per group with its key values and aggregations.
+
+        Args:
+            sort_by (str | None, optional): A key column or aggregation name (e.g. "size:sum") to sort by. Defaults
+                to None, the first aggregation.
+            descending (bool, optional): Whether to sort in descending order. Defaults to True.
+
+        Returns:
+            list[dict[str, Any]]: The groups, with a column per key and per aggregation. Groups without a value in
+            the sort column come last.
+
+        Raises:
+            ValueError: If ``sort_by`` is neither a key nor an aggregation.
+        """
+        rows = []
+        for key, group in self._groups.items():
+            row = dict(zip(self.keys, key, strict=True))
+            for aggregation in self.aggregations:
+                if aggregation.column is None:
+                    row[aggregation.name] = group[0]
+                else:
+                    summary = self._summary(group, aggregation.column)
+                    row[aggregation.name] = AGGREGATIONS[aggregation.function](summary)
+            rows.append(row)
+
+        sort_by = sort_by or self.aggregations[0].name
+        if sort_by not in self.keys and sort_by not in (a.name for a in self.aggregations):
+            raise ValueError(f"Cannot sort by '{sort_by}', it is neither a key nor an aggregation.")
+        present = [row for row in rows if row[sort_by] is not None]
+        missing = [row for row in rows if row[sort_by] is None]
+        present.sort(key=lambda row: sort_key(row[sort_by]), reverse=descending)
+        return present + missing
+
+
+def group_by(
+    rows: Iterable[Mapping[str, Any]],
+    keys: Sequence[str],
+    aggregations: Sequence[str | Aggregation] = ("count",),
+    sort_by: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Groups and aggregates rows, see ``GroupBy``.
+
+    Examples:
+        >>> group_by([{"extension": ".pdf", "size": 3}, {"extension": ".pdf", "size": 5}], ["extension"], ["size:sum"])
+        [{'extension': '.pdf', 'size:sum': 8.0}]
+    """
+    return GroupBy(keys, aggregations).update(rows).results(sort_by)
+
+
+def format_group_value(name: str, value: Any) -> str:
+    """
+    Formats a key or aggregated value for display, e.g. sizes in human-readable units.
+    """
+    column, _, function = name.rpartition(":")
+    if not column or function == "count":
+        return "(none)" if value is None else str(value)
+    if function in AGGREGATIONS and (column == "size" or column in TIMESTAMP_FIELDS):
+        return format_cell(column, value)
+    if value is None:
+        return "(none)"
+    return f"{value:,.2f}".rstrip("0").rstrip(".") if isinstance(value, float) else str(value)
@@ -0,0 +1,180 @@
+import logging
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# characters with a meaning inside a regular expression character class
+_CLASS_SPECIAL = frozenset("\\^[]-")
+
+
+def _bracket(pattern: str, start: int) -> tuple[str, int] | None:
+    """
+    Translates the character class starting at ``pattern[start] == "["``.
+
+    As in git, a ``]`` right after ``[`` or ``[!`` is a literal, and a backslash escapes the next character.
+
+    Returns:
+        tuple[str, int] | None: The regular expression class and the position of the closing ``]``, or None if the
+        class is not closed.
+    """
+    i, n = start + 1, len(pattern)
+    negate = i < n and pattern[i] in "!^"
+    if negate:
+        i += 1
+    body = []
+    first = True
+    while i < n:
+        c = pattern[i]
+        if c == "]" and not first:
+            return "[" + ("^" if negate else "") + "".join(body) + "]", i
+        if c == "\\" and i + 1 < n:
+            i += 1
+            c = pattern[i]
+            body.append("\\" + c if c in _CLASS_SPECIAL else c)
+        elif c == "-" and not first and i + 1 < n and pattern[i + 1] != "]":
+            body.append("-")
+        else:
+            body.append("\\" + c if c in _CLASS_SPECIAL else c)
+        first = False
+        i += 1
+    return None
+
+
+def _strip_trailing_spaces(line: str) -> str:
+    # as in git, trailing spaces are ignored unless the last one is escaped with a backslash
+    stripped = line.rstrip(" \t")
+    if len(stripped) < len(line):
+        backslashes = len(stripped) - len(stripped.rstrip("\\"))
+        if backslashes % 2:
+            return stripped + line[len(stripped)]
+    return stripped
+
+
+def translate(pattern: str) -> str:
+    """
+    Translates a gitignore-style glob into a regular expression matching slash-separated relative paths.
+
+    ``*`` and ``?`` do not match ``/``, ``**`` matches across directories, and ``[...]`` is a character class
+    (``[!...]`` negated).
+
+    Args:
+        pattern (str): The glob, without negation, anchoring or trailing slash markers.
+
+    Returns:
+        str: The regular expression source.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                if at_start and pattern.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            bracket = _bracket(pattern, i)
+            if bracket is None:
+                out.append(re.escape(c))
+            else:
+                out.append(bracket[0])
+                i = bracket[1]
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """
+    A list of gitignore-style rules, relative to the directory they were defined in.
+
+    Supports comments, ``!`` negation, trailing ``/`` for directory-only rules, leading or inner ``/`` to anchor
+    a rule to its directory, and ``**``. As in git, the last matching rule wins, and contents of an excluded
+    directory cannot be re-included since the directory is never entered.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """
+        Initializes the rules.
+
+        Args:
+            patterns (Iterable[str]): The rule lines, e.g. the lines of a ``.gitignore`` file.
+        """
+        self.rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        for line in patterns:
+            line = _strip_trailing_spaces(line.rstrip("\r\n"))
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            regex = translate(line)
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            try:
+                compiled = re.compile(regex, re.DOTALL)
+            except re.error as e:
+                logger.warning(f"Skipping the invalid ignore rule '{line}': {e}")
+                continue
+            self.rules.append((compiled, negate, dir_only))
+
+    @classmethod
+    def from_file(cls, path: Path | str) -> "IgnoreRules":
+        """
+        Reads rules from a file.
+
+        Args:
+            path (Path | str): The path to the rule file.
+
+        Returns:
+            IgnoreRules: The parsed rules, empty if the file cannot be read.
+        """
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return cls(f)
+        except OSError:
+            return cls([])
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, relpath: str, is_dir: bool) -> bool | None:
+        """
+        Checks a path against the rules.
+
+        Args:
+            relpath (str): The slash-separated path relative to the directory the rules belong to.
+            is_dir (bool): Whether the path is a directory.
+
+        Returns:
+            bool | None: True if the path is excluded, False if it is explicitly re-included with ``!``,
+            None if no rule matches.
+        """
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(relpath):
+                return not negate
+        return None
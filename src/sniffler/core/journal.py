@@ -0,0 +1,181 @@
+import json
+import os
+import time
+from collections.abc import Generator, Mapping
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from .ndjson_writer import serialize_row
+
+JOURNAL_VERSION = 1
+DIR_MARKER = "__done_dir__"
+
+
+class Journal:
+    """
+    Append-only checkpoint journal of a scan, so a killed scan can be resumed without losing finished work.
+
+    The journal is a JSON-lines file: a header with the scan root, one line per researched file (the collected row
+    with epoch timestamps) and a marker line whenever all files of a directory are done. Lines are buffered and
+    written at most every ``flush_interval`` seconds or ``flush_every`` lines, whichever comes first, so a crash
+    loses only the last few seconds of work. A partially written last line is discarded on resume.
+    """
+
+    def __init__(
+        self,
+        filename: Path | str,
+        root: Path | str,
+        resume: bool = False,
+        flush_interval: float = 5.0,
+        flush_every: int = 1000,
+    ) -> None:
+        """
+        Opens the journal, starting a new one unless ``resume`` is set and the file exists.
+
+        Args:
+            filename (Path | str): The path to the journal file.
+            root (Path | str): The scanned root, checked against the journal on resume.
+            resume (bool, optional): If True, loads the finished work from an existing journal. Defaults to False.
+            flush_interval (float, optional): The maximum number of seconds between writes. Defaults to 5.0.
+            flush_every (int, optional): The maximum number of buffered lines. Defaults to 1000.
+
+        Raises:
+            ValueError: If the existing journal belongs to a scan of a different root.
+        """
+        self.filename = Path(filename)
+        self.root = str(Path(root).resolve())
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.done_dirs: set[str] = set()
+        self.done_files: set[str] = set()
+        self.restored = 0
+        self._restored_size = 0
+        self._buffer: list[str] = []
+        self._last_flush = time.monotonic()
+
+        if resume and self.filename.exists():
+            valid_size = self._restored_size = self._load()
+            self._file = open(self.filename, "r+", encoding="utf-8", newline="\n")
+            self._file.truncate(valid_size)
+            self._file.seek(valid_size)
+        else:
+            self._file = open(self.filename, "w", encoding="utf-8", newline="\n")
+            self._file.write(json.dumps({"journal": JOURNAL_VERSION, "root": self.root}) + "\n")
+            self._file.flush()
+
+    def _load(self) -> int:
+        """
+        Reads the done directories and files, returns the size of the journal up to the last complete line.
+        """
+        decode = json.JSONDecoder().decode
+        files: list[str] = []
+        valid_size = 0
+        with open(self.filename, "rb") as f:
+            header = f.readline()
+            try:
+                root = decode(header.decode("utf-8"))["root"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"'{self.filename}' is not a sniffler journal.") from e
+            if root != self.root:
+                raise ValueError(f"Journal '{self.filename}' belongs to a scan of '{root}', not '{self.root}'.")
+            valid_size = len(header)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = decode(line.decode("utf-8"))
+                except ValueError:
+                    break
+                valid_size += len(line)
+                if DIR_MARKER in entry:
+                    self.done_dirs.add(entry[DIR_MARKER])
+                else:
+                    files.append(entry["path"])
+                    self.restored += 1
+        # files of completed directories are skipped by directory, only the rest needs a per-file lookup
+        self.done_files = {path for path in files if str(PurePosixPath(path).parent) not in self.done_dirs}
+        return valid_size
+
+    def restored_rows(self) -> Generator[dict[str, Any], Any, None]:
+        """
+        Streams the rows recorded by previous runs.
+
+        Yields:
+            Generator[dict[str, Any], Any, None]: The journaled rows, paths as Path objects relative to the root.
+        """
+        if not self.restored:
+            return
+        decode = json.JSONDecoder().decode
+        with open(self.filename, "rb") as f:
+            position = len(f.readline())
+            for line in f:
+                position += len(line)
+                if position > self._restored_size:
+                    break
+                entry = decode(line.decode("utf-8"))
+                if DIR_MARKER not in entry:
+                    entry["path"] = Path(entry["path"])
+                    yield entry
+
+    def is_done(self, relpath: PurePosixPath | Path) -> bool:
+        """
+        Checks whether a file was finished by a previous run.
+
+        Args:
+            relpath (PurePosixPath | Path): The path of the file relative to the scan root.
+        """
+        if relpath.parent.as_posix() in self.done_dirs:
+            return True
+        return bool(self.done_files) and relpath.as_posix() in self.done_files
+
+    def record(self, row: Mapping[str, Any]) -> None:
+        """
+        Appends a finished file to the journal.
+
+        Args:
+            row (Mapping[str, Any]): The collected row, with ``path`` relative to the scan root.
+        """
+        path = row.get("path")
+        if isinstance(path, Path):
+            row = {**row, "path": path.as_posix()}
+        self._buffer.append(serialize_row(row))
+        self._maybe_flush()
+
+    def complete_dir(self, relpath: PurePosixPath | Path) -> None:
+        """
+        Marks all files of a directory (not including subdirectories) as done.
+
+        Args:
+            relpath (PurePosixPath | Path): The directory relative to the scan root.
+        """
+        self._buffer.append(json.dumps({DIR_MARKER: relpath.as_posix()}) + "\n")
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered lines and hands them to the operating system.
+        """
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the journal.
+        """
+        if not self._file.closed:
+            self.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,46 @@
+from collections.abc import Generator, Iterable
+from pathlib import Path
+from typing import Any
+
+from .readers import read_fieldnames, read_rows
+from .stats import StatAccumulator
+
+
+def merge_fieldnames(sources: Iterable[Path | str], delimiter: str = ",") -> list[str]:
+    """
+    Reconciles the column schemas of several scan output files.
+
+    Args:
+        sources (Iterable[Path | str]): The partial result files.
+        delimiter (str, optional): The delimiter of CSV sources. Defaults to ",".
+
+    Returns:
+        list[str]: The union of all columns, in order of first appearance, with "path" first.
+    """
+    fieldnames: dict[str, None] = {"path": None}
+    for source in sources:
+        fieldnames.update(dict.fromkeys(read_fieldnames(source, delimiter)))
+    return list(fieldnames)
+
+
+def merge_rows(
+    sources: Iterable[Path | str],
+    delimiter: str = ",",
+    stats: StatAccumulator | None = None,
+) -> Generator[dict[str, Any], Any, None]:
+    """
+    Streams the rows of several scan output files one after another, one file open at a time.
+
+    Args:
+        sources (Iterable[Path | str]): The partial result files.
+        delimiter (str, optional): The delimiter of CSV sources. Defaults to ",".
+        stats (StatAccumulator | None, optional): If given, every row is added to it on the way. Defaults to None.
+
+    Yields:
+        Generator[dict[str, Any], Any, None]: The merged rows.
+    """
+    for source in sources:
+        for row in read_rows(source, delimiter):
+            if stats is not None:
+                stats.add(row)
+            yield row
@@ -0,0 +1,77 @@
+import json
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path, PurePath
+from typing import Any
+
+from .csv_writer import writer
+from .utils import format_timestamps
+
+WRITE_BUFFER_SIZE = 1 << 16
+
+_encoder = json.JSONEncoder(ensure_ascii=False, check_circular=False, default=str)
+
+
+def serialize_row(row: Mapping[str, Any]) -> str:
+    """
+    Serializes a collected row to a single JSON line.
+
+    The ``path`` value is converted up front, so the encoder only falls back to ``default``
+    for values that are neither JSON types nor the row path.
+
+    Args:
+        row (Mapping[str, Any]): The row to serialize.
+
+    Returns:
+        str: The JSON representation of the row, terminated with a newline.
+    """
+    path = row.get("path")
+    if isinstance(path, PurePath):
+        row = {**row, "path": str(path)}
+    return _encoder.encode(row) + "\n"
+
+
+def write_ndjson(
+    filename: Path | str | None,
+    data: Iterable[Mapping[str, Any]],
+    time_format: str | None = None,
+    batch_size: int = 512,
+    flush_interval: float = 1.0,
+) -> int:
+    """
+    Write data as newline-delimited JSON, one object per row, while the data is still being produced.
+
+    Lines are written in batches, and the output is flushed at least every ``flush_interval`` seconds,
+    so downstream consumers start receiving rows while a long scan is still running.
+
+    Parameters:
+        filename (Path | str | None): The path to the output file. If None, the output will be written to stdout.
+        data (Iterable[Mapping[str, Any]]): An iterable of rows, typically ``Collector.iter_collect()``.
+        time_format (str | None, optional): The ``strftime`` format used for timestamp fields. If None, timestamps are written as epoch seconds.
+        batch_size (int, optional): The number of lines joined into a single write. Defaults to 512.
+        flush_interval (float, optional): The maximum number of seconds between flushes. Defaults to 1.0.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    batch: list[str] = []
+    last_flush = time.monotonic()
+    with writer(filename, encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        for row in data:
+            if time_format is not None:
+                row = format_timestamps(row, time_format)
+            batch.append(serialize_row(row))
+            count += 1
+            if len(batch) >= batch_size:
+                f.write("".join(batch))
+                batch.clear()
+            now = time.monotonic()
+            if now - last_flush >= flush_interval:
+                f.write("".join(batch))
+                batch.clear()
+                f.flush()
+                last_flush = now
+        f.write("".join(batch))
+        f.flush()
+    return count
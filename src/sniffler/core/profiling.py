@@ -0,0 +1,387 @@
+import contextlib
+import heapq
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Generator, Iterable, Iterator
+from pathlib import Path
+from typing import Any, TextIO, TypeVar
+
+from .utils import convert_size
+from ..researchers import researcher_name
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+T = TypeVar("T")
+
+
+class ByteCounter:
+    """
+    Reads the number of bytes the process has read so far (``rchar`` from ``/proc/self/io``), cheaply enough to be
+    called around every item of an iterator. The file is kept open, and the bytes of its own reads, which ``rchar``
+    counts as well, are subtracted.
+    """
+
+    def __init__(self) -> None:
+        self._own = 0
+        try:
+            self._fd: int | None = os.open("/proc/self/io", os.O_RDONLY)
+        except OSError:
+            self._fd = None
+
+    def read(self) -> int | None:
+        """
+        Returns:
+            int | None: The byte count, or None on platforms without procfs I/O accounting.
+        """
+        if self._fd is None:
+            return None
+        try:
+            data = os.pread(self._fd, 4096, 0)
+        except OSError:
+            return None
+        # rchar does not include this read yet, but it will include it from the next one on
+        rchar = int(data.split(b"rchar:", 1)[1].split(None, 1)[0]) - self._own
+        self._own += len(data)
+        return rchar
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def read_bytes() -> int | None:
+    """
+    Returns the number of bytes the process has read so far (``rchar`` from ``/proc/self/io``).
+
+    Returns:
+        int | None: The byte count, or None on platforms without procfs I/O accounting.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss() -> int | None:
+    """
+    Returns the peak resident set size of the process in bytes, since the last ``reset_peak_rss`` where supported.
+
+    Returns:
+        int | None: The peak RSS, or None on platforms without ``resource``.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak RSS of the process to its current RSS, so ``peak_rss`` measures a phase (Linux 4.0 or later).
+
+    Returns:
+        bool: Whether the peak was reset, otherwise ``peak_rss`` stays the peak of the process lifetime.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+class _OpenPhase:
+    """
+    A phase being measured, with what nested phases and timed iterators accounted to themselves.
+    """
+
+    __slots__ = ("nested_seconds", "nested_bytes", "peak_rss", "peak_traced_memory")
+
+    def __init__(self) -> None:
+        self.nested_seconds = 0.0
+        self.nested_bytes = 0
+        self.peak_rss = 0
+        self.peak_traced_memory = 0
+
+
+class Histogram:
+    """
+    Histogram of durations with power-of-two microsecond buckets.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """
+        Adds a duration to the histogram.
+
+        Args:
+            seconds (float): The duration in seconds.
+        """
+        bucket = int(seconds * 1_000_000).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximates a quantile as the upper bound of the bucket it falls into.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The approximate quantile in seconds.
+        """
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min((1 << bucket) / 1_000_000, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "p50_seconds": self.quantile(0.5),
+            "p99_seconds": self.quantile(0.99),
+            "max_seconds": self.max,
+            # bucket upper bounds in microseconds
+            "buckets_us": {str(1 << bucket): count for bucket, count in sorted(self.buckets.items())},
+        }
+
+
+class Profiler:
+    """
+    Collects per-researcher timings, the slowest files and per-phase resource usage of a scan.
+
+    Attach it to a Collector with ``Collector(..., profiler=Profiler())``, and mark additional phases
+    (such as writing the output) with ``profiler.phase(name)``.
+    """
+
+    def __init__(self, top_k: int = 20, trace_memory: bool = False) -> None:
+        """
+        Initializes the Profiler.
+
+        Args:
+            top_k (int, optional): The number of slowest files to keep. Defaults to 20.
+            trace_memory (bool, optional): If True, uses tracemalloc to measure the peak Python memory of each phase.
+                This is more precise than the process peak RSS but slows the scan down. Defaults to False.
+        """
+        self.top_k = top_k
+        self.trace_memory = trace_memory
+        self.researchers: dict[str, Histogram] = {}
+        self.slowest: list[tuple[float, str]] = []
+        self.phases: dict[str, dict[str, Any]] = {}
+        self._open: list[_OpenPhase] = []
+        self._bytes = ByteCounter()
+
+    def record(self, researcher: object, seconds: float) -> None:
+        """
+        Records the duration of a single ``get_info`` call.
+
+        Args:
+            researcher (object): The researcher instance.
+            seconds (float): The duration of the call.
+        """
+        name = researcher_name(researcher)
+        histogram = self.researchers.get(name)
+        if histogram is None:
+            histogram = self.researchers[name] = Histogram()
+        histogram.add(seconds)
+
+    def record_file(self, file: Path, seconds: float) -> None:
+        """
+        Records the total research time of a file, keeping only the ``top_k`` slowest.
+
+        Args:
+            file (Path): The file.
+            seconds (float): The time spent in all researchers for the file.
+        """
+        if len(self.slowest) < self.top_k:
+            heapq.heappush(self.slowest, (seconds, str(file)))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, str(file)))
+
+    def _phase_entry(self, name: str) -> dict[str, Any]:
+        return self.phases.setdefault(
+            name, {"seconds": 0.0, "bytes_read": None, "peak_rss": None, "peak_traced_memory": None}
+        )
+
+    def _checkpoint_peaks(self) -> None:
+        # the peaks are about to be reset, the open phases keep what they reached so far
+        rss = peak_rss() or 0
+        traced = tracemalloc.get_traced_memory()[1] if self.trace_memory and tracemalloc.is_tracing() else 0
+        for frame in self._open:
+            frame.peak_rss = max(frame.peak_rss, rss)
+            frame.peak_traced_memory = max(frame.peak_traced_memory, traced)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None, Any, None]:
+        """
+        Measures wall time, bytes read and peak memory of a phase of the scan.
+
+        Time and bytes of nested phases and of ``timed`` iterators consumed within the phase are accounted to those
+        only. The peak RSS (and the peak traced memory with ``trace_memory``) is the peak within the phase, nested
+        phases included, where the platform allows resetting it.
+
+        Args:
+            name (str): The phase name, such as "walk", "research" or "write".
+        """
+        self._checkpoint_peaks()
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        reset_peak_rss()
+        frame = _OpenPhase()
+        self._open.append(frame)
+        bytes_before = self._bytes.read()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            bytes_after = self._bytes.read()
+            self._open.remove(frame)
+            bytes_read = None
+            if bytes_before is not None and bytes_after is not None:
+                bytes_read = bytes_after - bytes_before
+            self._finish_phase(name, frame, seconds, bytes_read)
+
+    def _finish_phase(self, name: str, frame: _OpenPhase, seconds: float, bytes_read: int | None) -> None:
+        entry = self._phase_entry(name)
+        entry["seconds"] += seconds - frame.nested_seconds
+        if bytes_read is not None:
+            entry["bytes_read"] = (entry["bytes_read"] or 0) + bytes_read - frame.nested_bytes
+        frame.peak_rss = max(frame.peak_rss, peak_rss() or 0)
+        entry["peak_rss"] = max(entry["peak_rss"] or 0, frame.peak_rss) or None
+        if self.trace_memory:
+            frame.peak_traced_memory = max(frame.peak_traced_memory, tracemalloc.get_traced_memory()[1])
+            entry["peak_traced_memory"] = max(entry["peak_traced_memory"] or 0, frame.peak_traced_memory)
+        if self._open:
+            # the enclosing phase excludes this one, whose time already excludes its own nested phases
+            parent = self._open[-1]
+            parent.nested_seconds += seconds
+            parent.nested_bytes += bytes_read or 0
+            parent.peak_rss = max(parent.peak_rss, frame.peak_rss)
+            parent.peak_traced_memory = max(parent.peak_traced_memory, frame.peak_traced_memory)
+
+    def timed(self, iterable: Iterable[T], name: str) -> Iterator[T]:
+        """
+        Wraps an iterable, adding the time spent and the bytes read producing each item to the given phase.
+
+        Both are subtracted from the phases open while the iterable is consumed, e.g. the walk from the research it
+        is interleaved with. As the two overlap, the peak RSS recorded for it is that of the enclosing phases.
+
+        Args:
+            iterable (Iterable[T]): The iterable to wrap, such as ``Explorer.files()``.
+            name (str): The phase to account the time to.
+
+        Yields:
+            T: The items of the iterable.
+        """
+        entry = self._phase_entry(name)
+        counter = self._bytes
+        iterator = iter(iterable)
+        while True:
+            bytes_before = counter.read()
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._account(entry, start, bytes_before)
+                break
+            self._account(entry, start, bytes_before)
+            yield item
+        entry["peak_rss"] = max(entry["peak_rss"] or 0, peak_rss() or 0) or None
+
+    def _account(self, entry: dict[str, Any], start: float, bytes_before: int | None) -> None:
+        # adds the time and the bytes read since start to a phase, and takes them out of the innermost open one
+        seconds = time.perf_counter() - start
+        bytes_after = self._bytes.read()
+        bytes_read = bytes_after - bytes_before if bytes_before is not None and bytes_after is not None else 0
+        entry["seconds"] += seconds
+        if bytes_after is not None:
+            entry["bytes_read"] = (entry["bytes_read"] or 0) + bytes_read
+        if self._open:
+            self._open[-1].nested_seconds += seconds
+            self._open[-1].nested_bytes += bytes_read
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "researchers": {name: histogram.to_dict() for name, histogram in self.researchers.items()},
+            "slowest_files": [
+                {"path": path, "seconds": seconds} for seconds, path in sorted(self.slowest, reverse=True)
+            ],
+            "phases": self.phases,
+        }
+
+    def write_json(self, filename: Path | str) -> None:
+        """
+        Writes the profile as JSON.
+
+        Args:
+            filename (Path | str): The path to the JSON file.
+        """
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def print_summary(self, file: TextIO = sys.stderr) -> None:
+        """
+        Prints a human-readable summary of the profile.
+
+        Args:
+            file (TextIO, optional): The stream to print to. Defaults to stderr, so it never mixes with output on stdout.
+        """
+        print("Researcher timings:", file=file)
+        for name, histogram in sorted(self.researchers.items(), key=lambda item: item[1].total, reverse=True):
+            stats = histogram.to_dict()
+            print(
+                f"\t{name}: {stats['count']} calls, {stats['total_seconds']:.3f}s total, "
+                f"mean {stats['mean_seconds'] * 1000:.3f}ms, p50 <{stats['p50_seconds'] * 1000:.3f}ms, "
+                f"p99 <{stats['p99_seconds'] * 1000:.3f}ms, max {stats['max_seconds'] * 1000:.3f}ms",
+                file=file,
+            )
+
+        print(f"Top {self.top_k} slowest files:", file=file)
+        for seconds, path in sorted(self.slowest, reverse=True):
+            print(f"\t{path} ({seconds * 1000:.3f}ms)", file=file)
+
+        print("Phases:", file=file)
+        for name, entry in self.phases.items():
+            details = [f"{entry['seconds']:.3f}s"]
+            if entry["bytes_read"] is not None:
+                details.append(f"read {convert_size(entry['bytes_read'])}")
+            if entry["peak_rss"] is not None:
+                details.append(f"peak RSS {convert_size(entry['peak_rss'])}")
+            if entry["peak_traced_memory"] is not None:
+                details.append(f"peak traced {convert_size(entry['peak_traced_memory'])}")
+            print(f"\t{name}: {', '.join(details)}", file=file)
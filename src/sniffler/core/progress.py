@@ -0,0 +1,127 @@
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, NamedTuple
+
+from .stats import StatAccumulator
+
+
+class ProgressUpdate(NamedTuple):
+    """
+    A snapshot of a running collection, see ThroughputMeter.
+    """
+
+    files: int
+    total: int | None
+    size: float
+    elapsed: float
+    files_per_sec: float
+    bytes_per_sec: float
+    extensions: list[tuple[str, int]]
+    done: bool
+
+    @property
+    def fraction(self) -> float | None:
+        """
+        The fraction of the files researched so far, None if the total is unknown.
+        """
+        if not self.total:
+            return None
+        return min(1.0, self.files / self.total)
+
+
+class ThroughputMeter:
+    """
+    Measures a running collection and publishes throttled snapshots of it, for progress displays in another thread.
+
+    Rows are counted and added to a StatAccumulator as they are collected, which is cheap. A ProgressUpdate is only
+    built and passed to ``publish`` (e.g. ``queue.SimpleQueue.put``) at most once per ``interval``, so a scan of
+    millions of files sends a few updates per second rather than one per file. Rates are measured over the last
+    ``window`` seconds, so they follow slow and fast parts of the tree instead of averaging over the whole scan.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[ProgressUpdate], Any],
+        interval: float = 1 / 30,
+        window: float = 2.0,
+        top_extensions: int = 5,
+    ) -> None:
+        """
+        Args:
+            publish (Callable[[ProgressUpdate], Any]): Receives the snapshots, called from the collecting thread.
+            interval (float, optional): The minimum number of seconds between snapshots. Defaults to 1/30.
+            window (float, optional): The number of seconds the rates are measured over. Defaults to 2.0.
+            top_extensions (int, optional): The number of most common extensions in a snapshot. Defaults to 5.
+
+        Attributes:
+            total (int | None): The number of files to research, if known, see ``track``.
+            stats (StatAccumulator): The statistics of the rows collected so far.
+        """
+        self.publish = publish
+        self.interval = interval
+        self.window = window
+        self.top_extensions = top_extensions
+        self.total: int | None = None
+        self.stats = StatAccumulator()
+        self.start = time.perf_counter()
+        self._last_publish = 0.0
+        self._samples: deque[tuple[float, int, float]] = deque([(self.start, 0, 0.0)])
+
+    def track(self, iterable: Iterable, total: int | None = None, **kwargs: Any) -> Iterable:
+        """
+        A ProgressBar for ``Collector``: records the total and passes the files through, rows are counted by ``add``.
+        """
+        self.total = total
+        self.start = time.perf_counter()
+        self._samples = deque([(self.start, 0, 0.0)])
+        return iterable
+
+    def add(self, row: Mapping[str, Any]) -> None:
+        """
+        Counts a collected row, and publishes a snapshot if the last one is older than the interval.
+        """
+        self.stats.add(row)
+        now = time.perf_counter()
+        if now - self._last_publish >= self.interval:
+            self._last_publish = now
+            self.publish(self.snapshot(now))
+
+    def update(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Counts collected rows, see ``add``.
+        """
+        for row in rows:
+            self.add(row)
+
+    def finish(self) -> ProgressUpdate:
+        """
+        Publishes and returns the final snapshot.
+        """
+        update = self.snapshot(done=True)
+        self.publish(update)
+        return update
+
+    def snapshot(self, now: float | None = None, done: bool = False) -> ProgressUpdate:
+        """
+        Returns the current state of the collection.
+        """
+        now = time.perf_counter() if now is None else now
+        files, size = self.stats.files, self.stats.size
+        samples = self._samples
+        samples.append((now, files, size))
+        # keep the newest sample that is at least a window old as the base of the rates
+        while len(samples) > 2 and now - samples[1][0] >= self.window:
+            samples.popleft()
+        since, base_files, base_size = samples[0]
+        seconds = now - since
+        return ProgressUpdate(
+            files=files,
+            total=self.total,
+            size=size,
+            elapsed=now - self.start,
+            files_per_sec=(files - base_files) / seconds if seconds > 0 else 0.0,
+            bytes_per_sec=(size - base_size) / seconds if seconds > 0 else 0.0,
+            extensions=self.stats.extensions.most_common(self.top_extensions),
+            done=done,
+        )
@@ -0,0 +1,150 @@
+import csv
+import json
+import sqlite3
+from collections.abc import Generator, Iterator
+from pathlib import Path
+from typing import Any
+
+from .serialization import read_packed
+from .sqlite_writer import CORE_COLUMNS
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+PACKED_SUFFIXES = {".sniff"}
+
+
+def detect_format(filename: Path | str) -> str:
+    """
+    Guesses the format of a scan output file from its suffix.
+
+    Args:
+        filename (Path | str): The path to the file.
+
+    Returns:
+        str: "ndjson", "sqlite", "packed" or "csv".
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix in NDJSON_SUFFIXES:
+        return "ndjson"
+    if suffix in SQLITE_SUFFIXES:
+        return "sqlite"
+    if suffix in PACKED_SUFFIXES:
+        return "packed"
+    return "csv"
+
+
+def read_ndjson(filename: Path | str) -> Generator[dict[str, Any], Any, None]:
+    """
+    Reads rows from a newline-delimited JSON file one at a time.
+
+    Args:
+        filename (Path | str): The path to the file.
+
+    Yields:
+        Generator[dict[str, Any], Any, None]: One row per non-empty line.
+    """
+    decode = json.JSONDecoder().decode
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield decode(line)
+
+
+def read_csv(filename: Path | str, delimiter: str = ",") -> Generator[dict[str, Any], Any, None]:
+    """
+    Reads rows from a CSV file written by ``write_csv``. Values are strings, empty cells are dropped.
+
+    Args:
+        filename (Path | str): The path to the file.
+        delimiter (str, optional): The delimiter (',', ';', or 'tab'). Defaults to ",".
+
+    Yields:
+        Generator[dict[str, Any], Any, None]: One row per CSV record.
+    """
+    if delimiter == "tab":
+        delimiter = "\t"
+    with open(filename, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            yield {k: v for k, v in row.items() if v != ""}
+
+
+def read_sqlite(filename: Path | str) -> Generator[dict[str, Any], Any, None]:
+    """
+    Reads rows from a database written by ``write_sqlite``, joining the attributes back onto each file.
+
+    Both tables are read in file id order and merged, so only one row is held in memory at a time.
+
+    Args:
+        filename (Path | str): The path to the database.
+
+    Yields:
+        Generator[dict[str, Any], Any, None]: One row per file.
+    """
+    con = sqlite3.connect(f"file:{Path(filename).as_posix()}?mode=ro", uri=True)
+    try:
+        files = con.execute(f"SELECT id, {', '.join(CORE_COLUMNS)} FROM files ORDER BY id")
+        attributes = con.cursor().execute("SELECT file_id, key, value FROM attributes ORDER BY file_id")
+        pending = attributes.fetchone()
+        for file_id, *values in files:
+            row = {k: v for k, v in zip(CORE_COLUMNS, values, strict=True) if v is not None}
+            while pending is not None and pending[0] <= file_id:
+                if pending[0] == file_id:
+                    row[pending[1]] = pending[2]
+                pending = attributes.fetchone()
+            yield row
+    finally:
+        con.close()
+
+
+def read_rows(filename: Path | str, delimiter: str = ",") -> Iterator[dict[str, Any]]:
+    """
+    Reads rows from any supported scan output file, see ``detect_format``.
+
+    Args:
+        filename (Path | str): The path to the file.
+        delimiter (str, optional): The CSV delimiter. Defaults to ",".
+
+    Returns:
+        Iterator[dict[str, Any]]: The rows of the file, read lazily.
+    """
+    fmt = detect_format(filename)
+    if fmt == "ndjson":
+        return read_ndjson(filename)
+    if fmt == "sqlite":
+        return read_sqlite(filename)
+    if fmt == "packed":
+        return iter(read_packed(filename, str).rows())
+    return read_csv(filename, delimiter)
+
+
+def read_fieldnames(filename: Path | str, delimiter: str = ",") -> list[str]:
+    """
+    Returns the ordered set of columns in a scan output file.
+
+    For CSV only the header is read, for packed files only the column index. NDJSON and SQLite files are scanned
+    without keeping rows in memory.
+
+    Args:
+        filename (Path | str): The path to the file.
+        delimiter (str, optional): The CSV delimiter. Defaults to ",".
+
+    Returns:
+        list[str]: The column names in order of first appearance.
+    """
+    fmt = detect_format(filename)
+    if fmt == "csv":
+        with open(filename, newline="", encoding="utf-8") as f:
+            return next(csv.reader(f, delimiter="\t" if delimiter == "tab" else delimiter), [])
+    if fmt == "sqlite":
+        con = sqlite3.connect(f"file:{Path(filename).as_posix()}?mode=ro", uri=True)
+        try:
+            keys = [k for (k,) in con.execute("SELECT key FROM attributes GROUP BY key ORDER BY min(rowid)")]
+        finally:
+            con.close()
+        return [*CORE_COLUMNS, *keys]
+    if fmt == "packed":
+        return read_packed(filename).columns
+    fieldnames: dict[str, None] = {}
+    for row in read_ndjson(filename):
+        fieldnames.update(dict.fromkeys(row))
+    return list(fieldnames)
@@ -0,0 +1,238 @@
+import heapq
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from .stats import to_number
+
+# totals summed per directory besides files and sizes, by name and the column they are summed from
+ROLLUP_TOTALS = {"pages": "page_count", "duration": "duration"}
+
+
+class DirectoryNode:
+    """
+    A directory of a DirectoryRollup with the totals of its whole subtree.
+
+    The ``own_*`` attributes count only the files directly in the directory, the others the files of all its
+    subdirectories as well. The recursive totals are computed by ``DirectoryRollup.finish``.
+    """
+
+    __slots__ = (
+        "name",
+        "parent",
+        "children",
+        "files",
+        "size",
+        "totals",
+        "extensions",
+        "own_files",
+        "own_size",
+        "own_totals",
+        "own_extensions",
+    )
+
+    def __init__(self, name: str, parent: "DirectoryNode | None" = None) -> None:
+        self.name = name
+        self.parent = parent
+        self.children: dict[str, DirectoryNode] = {}
+        self.files = 0
+        self.size = 0.0
+        self.totals: dict[str, float] = {}
+        self.extensions: dict[str, int] = {}
+        self.own_files = 0
+        self.own_size = 0.0
+        self.own_totals: dict[str, float] = dict.fromkeys(ROLLUP_TOTALS, 0.0)
+        self.own_extensions: dict[str, int] = {}
+
+    @property
+    def path(self) -> str:
+        """
+        The path of the directory relative to the root, with slashes, empty for the root.
+        """
+        names = []
+        node: DirectoryNode | None = self
+        while node is not None and node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/".join(reversed(names))
+
+    def walk(self) -> Iterator["DirectoryNode"]:
+        """
+        Yields the directory and all its subdirectories, parents before their children.
+        """
+        stack: list[DirectoryNode] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Returns the recursive totals of the directory as a row, e.g. for a table or a template.
+        """
+        return {
+            "directory": self.path or ".",
+            "files": self.files,
+            "size": self.size,
+            **self.totals,
+            "subdirectories": len(self.children),
+        }
+
+    def __repr__(self) -> str:
+        return f"DirectoryNode({self.path or '.'!r}, files={self.files}, size={self.size:.0f})"
+
+
+class DirectoryRollup:
+    """
+    Recursive size, file count and per-extension totals for every directory of a collection, like ``du``.
+
+    Rows are added in one pass, each only to the directory that holds it, found by its path in a dict. ``finish``
+    then sums every directory into its parent once, bottom-up, so a tree of D directories costs O(rows + D) rather
+    than O(rows × depth). Queries on the finished tree (drill-down, heaviest subtrees) never look at rows again.
+    """
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]] | None = None) -> None:
+        """
+        Args:
+            rows (Iterable[Mapping[str, Any]] | None, optional): Rows to add and finish right away, e.g. a Collection.
+                Defaults to None.
+
+        Attributes:
+            root (DirectoryNode): The root of the collection, whose totals are those of all rows.
+        """
+        self.root = DirectoryNode("")
+        self._directories: dict[str, DirectoryNode] = {"": self.root}
+        self._finished = True
+        if rows is not None:
+            self.update(rows)
+            self.finish()
+
+    def _directory(self, path: str) -> DirectoryNode:
+        node = self._directories.get(path)
+        if node is None:
+            parent_path, _, name = path.rpartition("/")
+            parent = self._directory(parent_path)
+            node = parent.children[name] = DirectoryNode(name, parent)
+            self._directories[path] = node
+        return node
+
+    def add(self, row: Mapping[str, Any]) -> None:
+        """
+        Adds a collected row to the directory of its path. Paths use slashes or backslashes, relative to the root.
+        """
+        directory = str(row.get("path") or "").replace("\\", "/").strip("/").rpartition("/")[0]
+        node = self._directories.get(directory) or self._directory(directory)
+        node.own_files += 1
+        node.own_size += to_number(row.get("size"))
+        extension = str(row.get("extension") or "no_extension")
+        node.own_extensions[extension] = node.own_extensions.get(extension, 0) + 1
+        own_totals = node.own_totals
+        for total, column in ROLLUP_TOTALS.items():
+            value = row.get(column)
+            if value:
+                own_totals[total] += to_number(value)
+        self._finished = False
+
+    def update(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Adds all rows, see ``add``. Call ``finish`` before querying the tree.
+        """
+        for row in rows:
+            self.add(row)
+
+    def tee(self, rows: Iterable[Mapping[str, Any]]) -> Iterator[Mapping[str, Any]]:
+        """
+        Adds rows while passing them on, e.g. to build the rollup while a collection is streamed to a file.
+        """
+        for row in rows:
+            self.add(row)
+            yield row
+
+    def finish(self) -> "DirectoryRollup":
+        """
+        Computes the recursive totals of every directory from the rows added so far.
+
+        Returns:
+            DirectoryRollup: The rollup itself.
+        """
+        # children come after their parents in walk(), so the reversed order sums every subtree before its parent
+        nodes = list(self.root.walk())
+        for node in nodes:
+            node.files = node.own_files
+            node.size = node.own_size
+            node.totals = dict(node.own_totals)
+            node.extensions = dict(node.own_extensions)
+        for node in reversed(nodes):
+            parent = node.parent
+            if parent is not None:
+                parent.files += node.files
+                parent.size += node.size
+                extensions = parent.extensions
+                for extension, count in node.extensions.items():
+                    extensions[extension] = extensions.get(extension, 0) + count
+                totals = parent.totals
+                for total, value in node.totals.items():
+                    totals[total] += value
+        self._finished = True
+        return self
+
+    def _check_finished(self) -> None:
+        if not self._finished:
+            raise RuntimeError("Rows were added since the rollup was finished, call finish() first.")
+
+    def node(self, path: str = "") -> DirectoryNode | None:
+        """
+        Returns a directory by its path relative to the root, e.g. to drill down into it.
+
+        Args:
+            path (str, optional): The path, with slashes or backslashes. Defaults to "", the root.
+
+        Returns:
+            DirectoryNode | None: The directory, None if no collected file is in it or below it.
+        """
+        self._check_finished()
+        path = path.replace("\\", "/").strip("/")
+        return self._directories.get("" if path == "." else path)
+
+    def top(self, k: int = 10, by: str = "size", under: str = "", max_depth: int | None = None) -> list[DirectoryNode]:
+        """
+        Returns the heaviest subtrees below a directory.
+
+        Args:
+            k (int, optional): The number of directories. Defaults to 10.
+            by (str, optional): "size", "files", or one of ROLLUP_TOTALS (e.g. "pages"). Defaults to "size".
+            under (str, optional): The path of the directory to search below, see ``node``. Defaults to "", the root.
+            max_depth (int | None, optional): The maximum depth below ``under``, 1 for its subdirectories only.
+                Defaults to None, all depths.
+
+        Returns:
+            list[DirectoryNode]: Up to ``k`` directories, heaviest first. A directory's parent is heavier or as heavy,
+            so ``max_depth=1`` gives a drill-down step and no depth limit the largest nested directories.
+        """
+        start = self.node(under)
+        if start is None:
+            return []
+        if by in ("size", "files"):
+
+            def weight(node: DirectoryNode) -> float:
+                return getattr(node, by)
+
+        elif by in ROLLUP_TOTALS:
+
+            def weight(node: DirectoryNode) -> float:
+                return node.totals[by]
+
+        else:
+            raise ValueError(f"Cannot rank directories by {by!r}, use size, files or one of {list(ROLLUP_TOTALS)}.")
+
+        if max_depth is None:
+            candidates: Iterable[DirectoryNode] = (node for node in start.walk() if node is not start)
+        else:
+            candidates = self._below(start, max_depth)
+        return heapq.nlargest(k, candidates, key=weight)
+
+    @staticmethod
+    def _below(start: DirectoryNode, max_depth: int) -> Iterator[DirectoryNode]:
+        level = list(start.children.values())
+        for _ in range(max_depth):
+            yield from level
+            level = [child for node in level for child in node.children.values()]
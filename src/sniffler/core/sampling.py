@@ -0,0 +1,159 @@
+import math
+import random
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from statistics import NormalDist
+from typing import Any, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+
+def reservoir_sample(iterable: Iterable[T], k: int, rng: random.Random | None = None) -> tuple[list[T], int]:
+    """
+    Draws a uniform random sample of ``k`` items from an iterable of unknown length in a single pass.
+
+    Uses Algorithm L, which draws random numbers only for the items that enter the reservoir,
+    so the cost for the rest of the stream is little more than iterating it.
+
+    Args:
+        iterable (Iterable[T]): The items to sample from, e.g. ``Explorer.files()``.
+        k (int): The sample size.
+        rng (random.Random | None, optional): The random generator, for reproducible samples. Defaults to None.
+
+    Returns:
+        tuple[list[T], int]: The sample (all items if there are fewer than ``k``) and the number of items seen.
+    """
+    rng = rng or random.Random()
+    iterator = iter(iterable)
+    if k <= 0:
+        return [], sum(1 for _ in iterator)
+
+    reservoir: list[T] = []
+    for item in iterator:
+        reservoir.append(item)
+        if len(reservoir) == k:
+            break
+    seen = len(reservoir)
+    if seen < k:
+        return reservoir, seen
+
+    def log_random() -> float:
+        # log of a uniform number in (0, 1)
+        r = rng.random()
+        while r == 0.0:
+            r = rng.random()
+        return math.log(r)
+
+    w = math.exp(log_random() / k)
+    next_index = seen + math.floor(log_random() / math.log(1 - w))
+    for item in iterator:
+        if seen == next_index:
+            reservoir[rng.randrange(k)] = item
+            w *= math.exp(log_random() / k)
+            next_index += math.floor(log_random() / math.log(1 - w)) + 1
+        seen += 1
+    return reservoir, seen
+
+
+class Estimate(NamedTuple):
+    """
+    A population estimate with its confidence interval.
+    """
+
+    value: float
+    low: float
+    high: float
+
+    def __str__(self) -> str:
+        return f"{self.value:.0f} ({self.low:.0f} - {self.high:.0f})"
+
+
+class SampleEstimator:
+    """
+    Estimates population statistics from a simple random sample of files, such as the collection of a Collector
+    run with ``sample_size``.
+    """
+
+    def __init__(self, sample: Sequence[Mapping[str, Any]], population_size: int, confidence: float = 0.95) -> None:
+        """
+        Initializes the estimator.
+
+        Args:
+            sample (Sequence[Mapping[str, Any]]): The researched sample, e.g. a Collection.
+            population_size (int): The total number of files the sample was drawn from.
+            confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+        """
+        self.sample = sample
+        self.population_size = population_size
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def estimate_total(self, values: Iterable[float]) -> Estimate:
+        """
+        Estimates a population total from per-file values of the sample, using the normal approximation
+        with finite population correction.
+
+        Args:
+            values (Iterable[float]): One value per sampled file, 0 for files without the attribute.
+
+        Returns:
+            Estimate: The estimated total. The lower bound is never below the observed sample total.
+        """
+        values = list(values)
+        n = len(values)
+        if n == 0:
+            return Estimate(0.0, 0.0, 0.0)
+        mean = sum(values) / n
+        variance = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+        return self._estimate(n, mean, variance)
+
+    def _estimate(self, n: int, mean: float, variance: float) -> Estimate:
+        population = self.population_size
+        total = n * mean
+        fpc = max(0.0, 1 - n / population) if population else 0.0
+        margin = self.z * population * math.sqrt(fpc * variance / n)
+        value = population * mean
+        return Estimate(value, max(total, value - margin), value + margin)
+
+    def _numeric(self, key: str) -> list[float]:
+        values = []
+        for file in self.sample:
+            try:
+                values.append(float(file.get(key) or 0))  # type: ignore
+            except (TypeError, ValueError):
+                values.append(0.0)
+        return values
+
+    def total_size(self) -> Estimate:
+        """
+        Estimates the total size of all files in bytes.
+        """
+        return self.estimate_total(self._numeric("size"))
+
+    def total_pages(self) -> Estimate:
+        """
+        Estimates the total page count of all documents.
+        """
+        return self.estimate_total(self._numeric("page_count"))
+
+    def total_duration(self) -> Estimate:
+        """
+        Estimates the total duration of all audio files in seconds.
+        """
+        return self.estimate_total(self._numeric("duration"))
+
+    def count_by_extension(self) -> dict[str, Estimate]:
+        """
+        Estimates the number of files per extension, most common first.
+
+        Returns:
+            dict[str, Estimate]: Estimated counts keyed by extension, files without one under "no_extension".
+        """
+        counts = Counter(str(file.get("extension") or "no_extension") for file in self.sample)
+        n = len(self.sample)
+        estimates = {}
+        for ext, count in counts.most_common():
+            # indicator variable per file: mean is the observed proportion
+            p = count / n
+            estimates[ext] = self._estimate(n, p, n * p * (1 - p) / (n - 1) if n > 1 else 0.0)
+        return estimates
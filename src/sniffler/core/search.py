@@ -1,7 +1,13 @@
+import bisect
+import itertools
 import re
+import threading
 from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
 
 from .collector import Collection
+from ..researchers import InfoValue
 
 
 class SearchEngine:
@@ -26,12 +32,93 @@ class SearchEngine:
         """
         index = defaultdict(set)
         for idx, item in enumerate(self.collection):
-            for value in item.values():
-                words = re.findall(r"\w+", str(value).lower())
-                for word in words:
-                    index[word].add(idx)
+            for word in self._words(item):
+                index[word].add(idx)
         return index
 
+    @staticmethod
+    def _words(item: dict[str, InfoValue]) -> set[str]:
+        words = set()
+        for value in item.values():
+            words.update(re.findall(r"\w+", str(value).lower()))
+        return words
+
+    def _index_item(self, idx: int) -> None:
+        for word in self._words(self.collection[idx]):
+            self.index[word].add(idx)
+
+    def _unindex_item(self, idx: int) -> None:
+        for word in self._words(self.collection[idx]):
+            indices = self.index.get(word)
+            if indices is not None:
+                indices.discard(idx)
+                if not indices:
+                    del self.index[word]
+
+    def add(self, item: dict[str, InfoValue]) -> int:
+        """
+        Appends an item to the collection and indexes it.
+
+        Args:
+            item (dict[str, InfoValue]): The item to add.
+
+        Returns:
+            int: The position of the item in the collection.
+        """
+        self.collection.append(item)
+        idx = len(self.collection) - 1
+        self._index_item(idx)
+        return idx
+
+    def replace(self, idx: int, item: dict[str, InfoValue]) -> None:
+        """
+        Replaces the item at a position, e.g. after its file was researched again, and re-indexes it.
+
+        Args:
+            idx (int): The position of the item in the collection.
+            item (dict[str, InfoValue]): The new item.
+        """
+        self._unindex_item(idx)
+        self.collection[idx] = item
+        self._index_item(idx)
+
+    def remove(self, idx: int) -> int | None:
+        """
+        Removes the item at a position in constant time by moving the last item into its place.
+
+        Args:
+            idx (int): The position of the item in the collection.
+
+        Returns:
+            int | None: The old position of the item that was moved to ``idx``, None if no item was moved.
+        """
+        last = len(self.collection) - 1
+        self._unindex_item(idx)
+        if idx == last:
+            self.collection.pop()
+            return None
+        self._unindex_item(last)
+        self.collection[idx] = self.collection.pop()
+        self._index_item(idx)
+        return last
+
+    def search_indices(self, query: str) -> list[int]:
+        """
+        Searches for items in the collection that match the given query.
+
+        Args:
+            query (str): The search query string.
+
+        Returns:
+            list[int]: The positions of the matching items in the collection, in ascending order.
+        """
+        query = query.lower()
+        return [
+            idx
+            for idx, item in enumerate(self.collection)
+            if any(query in str(value).lower() for value in item.values())
+        ]
+
     def search(self, query: str) -> Collection:
         """
         Searches for items in the collection that match the given query.
@@ -42,9 +129,301 @@ class SearchEngine:
         Returns:
             Collection: A new Collection instance containing items that match the query.
         """
+        return Collection(self.collection[idx] for idx in self.search_indices(query))
+
+
+_VALUE_SEPARATOR = "\x1f"
+
+
+def _spans_values(query: str) -> bool:
+    # rows are separated by newlines in the haystack and values by the separator, a query with either character can
+    # only match a value that contains it
+    return "\n" in query or _VALUE_SEPARATOR in query
+
+
+class SubstringIndex:
+    """
+    The lowercase text of every row, for substring search at the speed of ``str.find``.
+
+    The values of a row are joined into one line, and the lines of a block of rows into one string with the offset of
+    each line, so a query scans a block in C and only the hits cost Python work. Blocks keep each string small (a
+    single non-ASCII character widens a whole string) and are the points at which a superseded query or a superseded
+    build is cancelled.
+
+    Newlines in values are replaced by the value separator in the lines. The few rows with a newline or the separator
+    in a value are also kept value by value, and queries that contain either character are only matched against them.
+    """
+
+    # after this many hits in a block, testing its remaining lines one by one is cheaper than locating every hit
+    DENSE_HITS = 64
+
+    def __init__(
+        self,
+        rows: Sequence[Mapping[str, Any]],
+        block_size: int = 4096,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> None:
+        """
+        Args:
+            rows (Sequence[Mapping[str, Any]]): The rows, e.g. a Collection. Changes to the rows of a block after it
+                was indexed are not seen.
+            block_size (int, optional): The number of rows per block. Defaults to 4096.
+            cancelled (Callable[[], bool] | None, optional): Checked between blocks, indexing stops if it returns
+                True and can be resumed with ``build``. Defaults to None.
+
+        Attributes:
+            special (dict[int, list[str]]): The lowercase values of the rows with a newline or the value separator in
+                a value, by position in ascending order.
+        """
+        self.rows = rows
+        self.size = len(rows)
+        self.block_size = block_size
+        self.blocks: list[tuple[str, list[int]]] = []
+        self.special: dict[int, list[str]] = {}
+        self.build(cancelled)
+
+    @property
+    def built(self) -> bool:
+        """
+        Whether every block is indexed.
+        """
+        return len(self.blocks) * self.block_size >= self.size
+
+    def build(self, cancelled: Callable[[], bool] | None = None) -> bool:
+        """
+        Indexes the blocks that are not indexed yet, e.g. after the construction was cancelled.
+
+        Args:
+            cancelled (Callable[[], bool] | None, optional): Checked between blocks, indexing stops if it returns
+                True. Defaults to None.
+
+        Returns:
+            bool: Whether every block is indexed, False if cancelled.
+        """
+        for start in range(len(self.blocks) * self.block_size, self.size, self.block_size):
+            if cancelled is not None and cancelled():
+                return False
+            self._index_block(start)
+        return True
+
+    def _index_block(self, start: int) -> None:
+        rows = self.rows[start : start + self.block_size]
+        lines = [_VALUE_SEPARATOR.join(map(str, row.values())) for row in rows]
+        text = "\n".join(lines)
+        separators = sum(len(row) - 1 for row in rows if row)
+        if text.count("\n") != len(lines) - 1 or text.count(_VALUE_SEPARATOR) != separators:
+            for offset, row in enumerate(rows):
+                values = [str(value) for value in row.values()]
+                if any(_spans_values(value) for value in values):
+                    self.special[start + offset] = [value.lower() for value in values]
+            lines = [line.replace("\n", _VALUE_SEPARATOR) for line in lines]
+            text = "\n".join(lines)
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # a few characters lowercase to several, the offsets must be those of the lowercased lines
+            lines = [line.lower() for line in lines]
+            lowered = "\n".join(lines)
+        offsets = list(itertools.accumulate((len(line) + 1 for line in lines), initial=0))
+        self.blocks.append((lowered, offsets))
+
+    def search(self, query: str, cancelled: Callable[[], bool] | None = None) -> list[int] | None:
+        """
+        Finds the rows that contain a text in any value, case-insensitively, like ``SearchEngine.search``.
+
+        Args:
+            query (str): The text to find.
+            cancelled (Callable[[], bool] | None, optional): Checked between blocks, the search stops if it returns
+                True. Defaults to None.
+
+        Returns:
+            list[int] | None: The positions of the matching rows in ascending order, None if cancelled.
+        """
         query = query.lower()
-        matched_indices = set()
-        for idx, item in enumerate(self.collection):
-            if any(query in str(value).lower() for value in item.values()):
-                matched_indices.add(idx)
-        return Collection(self.collection[idx] for idx in matched_indices)
+        if _spans_values(query):
+            return [idx for idx, values in self.special.items() if any(query in value for value in values)]
+        hits: list[int] = []
+        for number, (text, offsets) in enumerate(self.blocks):
+            if cancelled is not None and cancelled():
+                return None
+            base = number * self.block_size
+            found = 0
+            pos = text.find(query)
+            while pos != -1:
+                row = bisect.bisect_right(offsets, pos) - 1
+                hits.append(base + row)
+                found += 1
+                if found >= self.DENSE_HITS:
+                    row += 1
+                    rest = text[offsets[row] :].split("\n") if row < len(offsets) - 1 else []
+                    hits += [base + row + i for i, line in enumerate(rest) if query in line]
+                    break
+                pos = text.find(query, offsets[row + 1])
+        return hits
+
+    def lines(self, positions: Iterable[int]) -> list[str]:
+        """
+        Returns the lowercase text of rows, e.g. to narrow a search to them, see ``IncrementalSearch``.
+        """
+        lines = []
+        for idx in positions:
+            text, offsets = self.blocks[idx // self.block_size]
+            row = idx % self.block_size
+            lines.append(text[offsets[row] : offsets[row + 1] - 1])
+        return lines
+
+
+class PrefixIndex:
+    """
+    The file names of rows in sorted order, for completion and name prefix lookups by binary search.
+    """
+
+    def __init__(self, rows: Sequence[Mapping[str, Any]], field: str = "name") -> None:
+        """
+        Args:
+            rows (Sequence[Mapping[str, Any]]): The rows, e.g. a Collection.
+            field (str, optional): The indexed value. Defaults to "name".
+        """
+        entries = sorted(
+            (str(row[field]).lower(), str(row[field]), idx) for idx, row in enumerate(rows) if row.get(field)
+        )
+        self.keys = [key for key, _, _ in entries]
+        self.names = [name for _, name, _ in entries]
+        self.positions = [idx for _, _, idx in entries]
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.keys, prefix)
+        # every key with the prefix sorts before the prefix followed by the largest code point
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+        return start, end
+
+    def matches(self, prefix: str) -> list[int]:
+        """
+        Returns the positions of the rows whose name starts with a prefix, case-insensitively, in ascending order.
+        """
+        start, end = self._range(prefix)
+        return sorted(self.positions[start:end])
+
+    def complete(self, prefix: str, limit: int = 5) -> list[str]:
+        """
+        Returns up to ``limit`` distinct names that start with a prefix, case-insensitively, in sorted order.
+        """
+        if not prefix:
+            return []
+        start, end = self._range(prefix)
+        names: dict[str, None] = {}
+        for name in itertools.islice(self.names, start, end):
+            names[name] = None
+            if len(names) >= limit:
+                break
+        return list(names)
+
+
+class IncrementalSearch:
+    """
+    Search-as-you-type over a collection.
+
+    Every query gets a generation number, and a query stops as soon as a newer one starts, so typing never waits for
+    the results of a query that was already superseded. A query that contains the previous one (e.g. it was extended
+    by a keystroke) only tests the text of the previous hits, if there are at most ``NARROW_LIMIT`` of them. The
+    indexes are built on the first query. A superseded query also stops building them, the next query resumes the
+    build where it stopped.
+    """
+
+    NARROW_LIMIT = 250_000
+
+    def __init__(self, rows: Sequence[Mapping[str, Any]], block_size: int = 4096) -> None:
+        """
+        Args:
+            rows (Sequence[Mapping[str, Any]]): The rows, e.g. a Collection.
+            block_size (int, optional): The number of rows per block of the SubstringIndex. Defaults to 4096.
+
+        Attributes:
+            generation (int): The generation of the newest query.
+        """
+        self.rows = rows
+        self.block_size = block_size
+        self.generation = 0
+        self._index: SubstringIndex | None = None
+        self._names: PrefixIndex | None = None
+        # the previous query, its hits and their text if there are few enough to narrow the next query to them
+        self._last: tuple[str, list[int], list[str] | None] | None = None
+        self._build_lock = threading.Lock()
+
+    def _build(self, cancelled: Callable[[], bool] | None = None) -> bool:
+        with self._build_lock:
+            if self._index is None:
+                self._index = SubstringIndex(self.rows, self.block_size, cancelled)
+            if not self._index.build(cancelled):
+                return False
+            if self._names is None:
+                self._names = PrefixIndex(self.rows)
+            return True
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the indexes are built, i.e. a query does not have to wait for them.
+        """
+        return self._names is not None
+
+    def next_generation(self) -> int:
+        """
+        Starts a new query, superseding the running one. Call it as soon as the query changes, e.g. on every keystroke.
+
+        Returns:
+            int: The generation to pass to ``search``.
+        """
+        self.generation += 1
+        return self.generation
+
+    def search(self, query: str, generation: int | None = None) -> list[int] | None:
+        """
+        Finds the rows that contain a text in any value, case-insensitively.
+
+        Args:
+            query (str): The text to find.
+            generation (int | None, optional): The generation of the query, see ``next_generation``. Defaults to
+                None, a new generation.
+
+        Returns:
+            list[int] | None: The positions of the matching rows in ascending order, None if the query was
+            superseded.
+        """
+        if generation is None:
+            generation = self.next_generation()
+        query = query.lower()
+        if not query:
+            return list(range(len(self.rows)))
+
+        def superseded() -> bool:
+            return self.generation != generation
+
+        if not self._build(superseded):
+            return None
+        index: SubstringIndex = self._index  # type: ignore
+        last = self._last
+        spans_values = _spans_values(query)
+        if last is not None and last[2] is not None and last[0] in query and not spans_values:
+            hits, lines = [], []
+            for idx, line in zip(last[1], last[2], strict=True):
+                if query in line:
+                    hits.append(idx)
+                    lines.append(line)
+            if self.generation != generation:
+                return None
+        else:
+            hits = index.search(query, superseded)
+            if hits is None:
+                return None
+            # the lines join the values of a row, they cannot narrow a query that only matches within a value
+            lines = index.lines(hits) if len(hits) <= self.NARROW_LIMIT and not spans_values else None
+        self._last = (query, hits, lines)
+        return hits
+
+    def complete(self, prefix: str, limit: int = 5) -> list[str]:
+        """
+        Returns file names that start with a prefix, see ``PrefixIndex.complete``.
+        """
+        self._build()
+        return self._names.complete(prefix, limit)  # type: ignore
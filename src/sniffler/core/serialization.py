@@ -0,0 +1,449 @@
+import itertools
+import json
+import lzma
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from operator import itemgetter
+from pathlib import Path, PurePath
+from typing import Any
+
+from .collector import Collection
+
+MAGIC = b"SNFC"
+FORMAT_VERSION = 1
+CODECS = {"none": 0, "zlib": 1, "lzma": 2}
+
+# value tags, a column whose values all have the same tag stores the tag once instead of per value
+TAG_MIXED = 0
+TAG_NONE = 1
+TAG_INT = 2
+TAG_FLOAT = 3
+TAG_STR = 4
+TAG_TRUE = 5
+TAG_FALSE = 6
+TAG_PATH = 7
+TAG_BIGINT = 8
+TAG_JSON = 9
+
+# column block flags
+FLAG_DENSE = 1  # every row has a value, the row indices are omitted
+FLAG_NUL_SEPARATED = 2  # the string table is one NUL-separated blob instead of length-prefixed strings
+
+_HEADER = struct.Struct("<4sBBI")
+_BLOCK_HEADER = struct.Struct("<BBIIIII")
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+"""Marks the rows in which a column has no value, see ``PackedCollection.column``."""
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes | memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _compress(data: bytes, codec: int, level: int | None) -> bytes:
+    if codec == CODECS["zlib"]:
+        return zlib.compress(data, 1 if level is None else level)
+    if codec == CODECS["lzma"]:
+        return lzma.compress(data, preset=6 if level is None else level)
+    return data
+
+
+def _decompress(data: bytes | memoryview, codec: int) -> bytes | memoryview:
+    if codec == CODECS["zlib"]:
+        return zlib.decompress(data)
+    if codec == CODECS["lzma"]:
+        return lzma.decompress(data)
+    return data
+
+
+class _ColumnEncoder:
+    """
+    Encodes the values of one column: typed arrays for numbers, references into a string table for text.
+    """
+
+    def __init__(self) -> None:
+        self.tags = bytearray()
+        self.ints = array("q")
+        self.floats = array("d")
+        self.refs = array("I")
+        self.strings: dict[str, int] = {}
+
+    def ref(self, value: str) -> int:
+        return self.strings.setdefault(value, len(self.strings))
+
+    def refs_of(self, values: Iterable[str]) -> array:
+        values = list(values)
+        unique = dict.fromkeys(values)
+        self.strings = {value: ref for ref, value in enumerate(unique)}
+        return array("I", map(self.strings.__getitem__, values))
+
+    def encode(self, values: list[Any]) -> int:
+        """
+        Encodes the present values of the column, returns the common tag or TAG_MIXED.
+        """
+        types = set(map(type, values))
+        if types == {str}:
+            self.refs = self.refs_of(values)
+            return TAG_STR
+        if types == {int}:
+            try:
+                self.ints = array("q", values)
+                return TAG_INT
+            except OverflowError:
+                pass
+        if types == {float}:
+            self.floats = array("d", values)
+            return TAG_FLOAT
+        if all(issubclass(t, PurePath) for t in types):
+            self.refs = self.refs_of(map(str, values))
+            return TAG_PATH
+
+        for value in values:
+            self.tags.append(self.encode_value(value))
+        return self.tags[0] if self.tags.count(self.tags[0]) == len(self.tags) else TAG_MIXED
+
+    def encode_value(self, value: Any) -> int:
+        t = type(value)
+        if t is str:
+            self.refs.append(self.ref(value))
+            return TAG_STR
+        if t is int:
+            if _INT64_MIN <= value <= _INT64_MAX:
+                self.ints.append(value)
+                return TAG_INT
+            self.refs.append(self.ref(str(value)))
+            return TAG_BIGINT
+        if t is float:
+            self.floats.append(value)
+            return TAG_FLOAT
+        if value is None:
+            return TAG_NONE
+        if t is bool:
+            return TAG_TRUE if value else TAG_FALSE
+        if isinstance(value, PurePath):
+            self.refs.append(self.ref(str(value)))
+            return TAG_PATH
+        self.refs.append(self.ref(json.dumps(value, default=str)))
+        return TAG_JSON
+
+    def to_bytes(self, indices: array | None, count: int, tag: int) -> bytes:
+        flags = FLAG_DENSE if indices is None else 0
+        joined = "\0".join(self.strings)
+        # a single blob decodes much faster than one slice per string, but only works if no string contains a NUL
+        if joined.count("\0") == len(self.strings) - 1:
+            flags |= FLAG_NUL_SEPARATED
+            table = [joined.encode("utf-8", "surrogatepass")]
+        else:
+            encoded = [s.encode("utf-8", "surrogatepass") for s in self.strings]
+            table = [_to_bytes(array("I", map(len, encoded))), *encoded]
+        parts = [
+            _BLOCK_HEADER.pack(tag, flags, count, len(self.ints), len(self.floats), len(self.refs), len(self.strings)),
+            _to_bytes(indices) if indices is not None else b"",
+            bytes(self.tags) if tag == TAG_MIXED else b"",
+            _to_bytes(self.ints),
+            _to_bytes(self.floats),
+            _to_bytes(self.refs),
+            *table,
+        ]
+        return b"".join(parts)
+
+
+def pack_collection(rows: Iterable[Mapping[str, Any]], codec: str = "zlib", level: int | None = None) -> bytes:
+    """
+    Serializes rows into a compact, column-oriented binary format.
+
+    Every column is encoded and compressed separately, so readers can decode only the columns they need, see
+    ``PackedCollection``. Numbers are stored in typed arrays, text as references into a per-column string table, so
+    repeated values (extensions, camera models, authors) are stored once. Columns absent from most rows (e.g. EXIF
+    tags) only store the rows they have a value in.
+
+    Args:
+        rows (Iterable[Mapping[str, Any]]): The rows, e.g. a Collection.
+        codec (str, optional): "zlib", "lzma" (smaller, slower) or "none". Defaults to "zlib".
+        level (int | None, optional): The compression level of the codec. Defaults to 1 for zlib, which is about
+            twice as fast as 6 for ~10% more bytes, and 6 for lzma.
+
+    Returns:
+        bytes: The packed rows.
+
+    Raises:
+        ValueError: If the codec is unknown.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}', expected one of {tuple(CODECS)}.")
+    codec_id = CODECS[codec]
+
+    rows = rows if isinstance(rows, list) else list(rows)
+    count = len(rows)
+    # rows of the same kind of file share their keys, so there are only a few distinct key sets. Each gets an
+    # integer id, hashing a small int per row is much cheaper than hashing the tuple of keys
+    key_sets: dict[tuple[str, ...], int] = {}
+    row_kinds = list(map(key_sets.setdefault, map(tuple, rows), itertools.count()))
+    kind_counts = Counter(row_kinds)
+    present: dict[str, int] = {}
+    for keys, kind in key_sets.items():
+        for name in keys:
+            present[name] = present.get(name, 0) + kind_counts[kind]
+
+    blocks = []
+    toc = []
+    offset = 0
+    for name, present_count in present.items():
+        if present_count == count:
+            indices = None
+            values = list(map(itemgetter(name), rows))
+        else:
+            has_name = {kind for keys, kind in key_sets.items() if name in keys}.__contains__
+            indices = array("I", itertools.compress(range(count), map(has_name, row_kinds)))
+            values = list(map(itemgetter(name), itertools.compress(rows, map(has_name, row_kinds))))
+        encoder = _ColumnEncoder()
+        tag = encoder.encode(values)
+        block = _compress(encoder.to_bytes(indices, len(values), tag), codec_id, level)
+        blocks.append(block)
+        toc.append([name, offset, len(block)])
+        offset += len(block)
+
+    header = json.dumps({"rows": count, "columns": toc}, ensure_ascii=False).encode("utf-8", "surrogatepass")
+    return b"".join([_HEADER.pack(MAGIC, FORMAT_VERSION, codec_id, len(header)), header, *blocks])
+
+
+def _decode_block(data: bytes | memoryview, path_factory: Callable[[str], Any]) -> tuple[array | None, list[Any]]:
+    tag, flags, count, n_ints, n_floats, n_refs, n_strings = _BLOCK_HEADER.unpack_from(data)
+    view = memoryview(data)
+    pos = _BLOCK_HEADER.size
+
+    def take(size: int) -> memoryview:
+        nonlocal pos
+        pos += size
+        return view[pos - size : pos]
+
+    indices = None if flags & FLAG_DENSE else _from_bytes("I", take(4 * count))
+    tags = bytes(take(count)) if tag == TAG_MIXED else None
+    ints = _from_bytes("q", take(8 * n_ints))
+    floats = _from_bytes("d", take(8 * n_floats))
+    refs = _from_bytes("I", take(4 * n_refs))
+    if not n_strings:
+        strings = []
+    elif flags & FLAG_NUL_SEPARATED:
+        strings = str(view[pos:], "utf-8", "surrogatepass").split("\0")
+    else:
+        lengths = _from_bytes("I", take(4 * n_strings))
+        blob = bytes(view[pos:])
+        bounds = list(itertools.accumulate(lengths, initial=0))
+        strings = [blob[start:end].decode("utf-8", "surrogatepass") for start, end in itertools.pairwise(bounds)]
+
+    if tag == TAG_STR:
+        values = list(map(strings.__getitem__, refs))
+    elif tag == TAG_INT:
+        values = ints.tolist()
+    elif tag == TAG_FLOAT:
+        values = floats.tolist()
+    elif tag == TAG_PATH:
+        values = [path_factory(strings[ref]) for ref in refs]
+    elif tag == TAG_NONE:
+        values = [None] * count
+    elif tag in (TAG_TRUE, TAG_FALSE):
+        values = [tag == TAG_TRUE] * count
+    else:
+        values = _decode_mixed(tags or bytes([tag]) * count, ints, floats, refs, strings, path_factory)
+
+    return indices, values
+
+
+def _decode_mixed(
+    tags: bytes,
+    ints: array,
+    floats: array,
+    refs: array,
+    strings: list[str],
+    path_factory: Callable[[str], Any],
+) -> list[Any]:
+    next_int, next_float, next_ref = iter(ints).__next__, iter(floats).__next__, iter(refs).__next__
+    values: list[Any] = []
+    append = values.append
+    for tag in tags:
+        if tag == TAG_STR:
+            append(strings[next_ref()])
+        elif tag == TAG_INT:
+            append(next_int())
+        elif tag == TAG_FLOAT:
+            append(next_float())
+        elif tag == TAG_NONE:
+            append(None)
+        elif tag == TAG_TRUE or tag == TAG_FALSE:
+            append(tag == TAG_TRUE)
+        elif tag == TAG_PATH:
+            append(path_factory(strings[next_ref()]))
+        elif tag == TAG_BIGINT:
+            append(int(strings[next_ref()]))
+        else:
+            append(json.loads(strings[next_ref()]))
+    return values
+
+
+class PackedCollection:
+    """
+    Reads data written by ``pack_collection``, decoding each column only when it is first accessed.
+    """
+
+    def __init__(self, data: bytes | memoryview, path_factory: Callable[[str], Any] = Path) -> None:
+        """
+        Parses the header of packed data.
+
+        Args:
+            data (bytes | memoryview): The packed rows.
+            path_factory (Callable[[str], Any], optional): Converts stored paths back, ``str`` skips the cost of
+                creating Path objects. Defaults to Path.
+
+        Raises:
+            ValueError: If the data is not in the packed format, or in a newer version of it.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Not a packed sniffler collection.")
+        magic, version, codec, header_size = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a packed sniffler collection.")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported packed collection version {version}.")
+        self._data = memoryview(data)
+        self._codec = codec
+        self._path_factory = path_factory
+        start = _HEADER.size + header_size
+        header = json.loads(bytes(self._data[_HEADER.size : start]).decode("utf-8", "surrogatepass"))
+        self._rows: int = header["rows"]
+        self._blocks = {name: (start + offset, length) for name, offset, length in header["columns"]}
+        self._decoded: dict[str, tuple[array | None, list[Any]]] = {}
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        The column names, in order of first appearance.
+        """
+        return list(self._blocks)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _decode(self, name: str) -> tuple[array | None, list[Any]]:
+        decoded = self._decoded.get(name)
+        if decoded is None:
+            offset, length = self._blocks[name]
+            block = _decompress(self._data[offset : offset + length], self._codec)
+            decoded = self._decoded[name] = _decode_block(block, self._path_factory)
+        return decoded
+
+    def column(self, name: str) -> list[Any]:
+        """
+        Decodes a column.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            list[Any]: One value per row, ``MISSING`` for rows without a value.
+
+        Raises:
+            KeyError: If there is no such column.
+        """
+        indices, values = self._decode(name)
+        if indices is None:
+            return values
+        column = [MISSING] * self._rows
+        for idx, value in zip(indices, values, strict=True):
+            column[idx] = value
+        return column
+
+    def rows(self, columns: Sequence[str] | None = None) -> list[dict[str, Any]]:
+        """
+        Reassembles the rows from their columns.
+
+        Args:
+            columns (Sequence[str] | None, optional): The columns to decode, columns missing from the data are
+                ignored. Defaults to None, all columns.
+
+        Returns:
+            list[dict[str, Any]]: The rows, with only the requested columns. Columns present in every row come
+            first in each row.
+        """
+        names = [name for name in columns if name in self._blocks] if columns is not None else self.columns
+        decoded = [(name, *self._decode(name)) for name in names]
+        dense = [(name, values) for name, indices, values in decoded if indices is None]
+        if dense:
+            dense_names = [name for name, _ in dense]
+            rows = [
+                dict(zip(dense_names, values, strict=True))
+                for values in zip(*(values for _, values in dense), strict=True)
+            ]
+        else:
+            rows = [{} for _ in range(self._rows)]
+        for name, indices, values in decoded:
+            if indices is not None:
+                for idx, value in zip(indices, values, strict=True):
+                    rows[idx][name] = value
+        return rows
+
+    def to_collection(self, columns: Sequence[str] | None = None) -> Collection:
+        """
+        Decodes the rows into a Collection, see ``rows``.
+        """
+        return Collection(self.rows(columns))
+
+
+def unpack_collection(data: bytes | memoryview, columns: Sequence[str] | None = None) -> Collection:
+    """
+    Decodes packed rows into a Collection.
+
+    Args:
+        data (bytes | memoryview): The packed rows, see ``pack_collection``.
+        columns (Sequence[str] | None, optional): Only decode these columns. Defaults to None, all columns.
+
+    Returns:
+        Collection: The rows.
+    """
+    return PackedCollection(data).to_collection(columns)
+
+
+def write_packed(filename: Path | str, data: Iterable[Mapping[str, Any]], codec: str = "zlib") -> int:
+    """
+    Writes rows to a file in the packed format, see ``pack_collection``.
+
+    Args:
+        filename (Path | str): The path to the file, conventionally with the ``.sniff`` suffix.
+        data (Iterable[Mapping[str, Any]]): The rows.
+        codec (str, optional): The compression codec. Defaults to "zlib".
+
+    Returns:
+        int: The number of rows written.
+    """
+    rows = data if isinstance(data, list) else list(data)
+    Path(filename).write_bytes(pack_collection(rows, codec))
+    return len(rows)
+
+
+def read_packed(filename: Path | str, path_factory: Callable[[str], Any] = Path) -> PackedCollection:
+    """
+    Opens a file written by ``write_packed``, its columns are decoded on first access.
+    """
+    return PackedCollection(Path(filename).read_bytes(), path_factory)
@@ -0,0 +1,42 @@
+import zlib
+
+SHARD_STRATEGIES = ("top", "hash")
+
+
+def shard_of(key: str, count: int) -> int:
+    """
+    Deterministically assigns a key to one of ``count`` shards.
+
+    Uses CRC-32 of the UTF-8 encoded key, so the assignment is stable across processes, hosts and Python versions
+    (unlike the builtin ``hash``, which is salted per process).
+
+    Args:
+        key (str): The key, a top-level directory name or a slash-separated relative path.
+        count (int): The number of shards.
+
+    Returns:
+        int: The shard index, between 0 and ``count - 1``.
+    """
+    return zlib.crc32(key.encode("utf-8", "surrogateescape")) % count
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """
+    Parses a shard specification of the form ``INDEX/COUNT``, with ``0 <= INDEX < COUNT``.
+
+    Args:
+        value (str): The specification, e.g. "0/8".
+
+    Returns:
+        tuple[int, int]: The shard index and the number of shards.
+
+    Raises:
+        ValueError: If the specification is malformed or out of range.
+    """
+    index, sep, count = value.partition("/")
+    if not sep:
+        raise ValueError(f"Invalid shard '{value}', expected INDEX/COUNT.")
+    shard = int(index), int(count)
+    if not 0 <= shard[0] < shard[1]:
+        raise ValueError(f"Invalid shard '{value}', expected 0 <= INDEX < COUNT.")
+    return shard
@@ -0,0 +1,109 @@
+import json
+import sqlite3
+from collections.abc import Iterable, Mapping
+from pathlib import Path, PurePath
+from typing import Any
+
+CORE_COLUMNS = ("path", "name", "extension", "size", "modified", "created")
+
+SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    name TEXT,
+    extension TEXT,
+    size INTEGER,
+    modified INTEGER,
+    created INTEGER
+);
+CREATE TABLE attributes (
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    key TEXT NOT NULL,
+    value
+);
+"""
+
+INDEXES = """
+CREATE INDEX files_extension ON files (extension);
+CREATE INDEX files_size ON files (size);
+CREATE INDEX files_modified ON files (modified);
+CREATE INDEX attributes_file_id ON attributes (file_id);
+CREATE INDEX attributes_key_value ON attributes (key, value);
+"""
+
+
+def to_sql_value(value: Any) -> Any:
+    """
+    Converts a collected value to a type that SQLite can store.
+
+    Args:
+        value (Any): The collected value.
+
+    Returns:
+        Any: The value itself for SQLite-native types, a JSON string for tuples, lists and dicts,
+        and ``str(value)`` for anything else.
+    """
+    if value is None or isinstance(value, str | int | float | bytes):
+        return value
+    if isinstance(value, PurePath):
+        return str(value)
+    if isinstance(value, tuple | list | dict):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    return str(value)
+
+
+def write_sqlite(
+    filename: Path | str,
+    data: Iterable[Mapping[str, Any]],
+    batch_size: int = 10_000,
+) -> int:
+    """
+    Write data to an SQLite database for ad-hoc querying.
+
+    Core columns (see CORE_COLUMNS) are stored in the typed ``files`` table, every other non-empty value
+    goes to the ``attributes`` key/value table, referencing ``files.id``. Timestamps are stored as epoch
+    seconds, use ``datetime(modified, 'unixepoch')`` to format them in queries. Rows are inserted in batches
+    with ``executemany``, one transaction per batch, and indexes are built once loading is finished.
+    An existing file at ``filename`` is replaced.
+
+    Parameters:
+        filename (Path | str): The path to the database file.
+        data (Iterable[Mapping[str, Any]]): An iterable of rows, such as a Collection or ``Collector.iter_collect()``.
+        batch_size (int, optional): The number of files inserted per transaction. Defaults to 10000.
+
+    Returns:
+        int: The number of files written.
+    """
+    Path(filename).unlink(missing_ok=True)
+    con = sqlite3.connect(filename, isolation_level=None)
+    try:
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        con.executescript(SCHEMA)
+
+        files: list[tuple] = []
+        attributes: list[tuple] = []
+
+        def flush() -> None:
+            con.execute("BEGIN")
+            con.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", files)
+            con.executemany("INSERT INTO attributes VALUES (?, ?, ?)", attributes)
+            con.execute("COMMIT")
+            files.clear()
+            attributes.clear()
+
+        file_id = 0
+        for file_id, row in enumerate(data, start=1):
+            files.append((file_id, *(to_sql_value(row.get(column)) for column in CORE_COLUMNS)))
+            for key, value in row.items():
+                if key not in CORE_COLUMNS and value is not None and value != "":
+                    attributes.append((file_id, key, to_sql_value(value)))
+            if len(files) >= batch_size:
+                flush()
+        flush()
+
+        con.executescript(INDEXES)
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+    return file_id
@@ -1,8 +1,20 @@
+import heapq
 from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from .collector import Collection
-from ..researchers import ImageResearcher, LegacyOfficeResearcher, ModernOfficeResearcher, PdfResearcher
+from .grouping import Aggregation, GroupBy
+from ..researchers.extensions import DOCUMENT_EXTENSIONS, IMAGE_EXTENSIONS
+
+if TYPE_CHECKING:
+    from .analytics import NumericAnalytics
+
+
+# the only columns StatCalculator, its analytics and DirectoryRollup read, loading just these is enough to compute
+# every statistic
+STAT_COLUMNS = ("path", "extension", "size", "width", "height", "page_count", "duration", "modified", "created")
 
 
 class StatCalculator:
@@ -14,6 +26,41 @@ class StatCalculator:
             collection (Collection): The collectoin instance used for gathering statistics.
         """
         self.collection = collection
+        self._analytics: NumericAnalytics | None = None
+
+    def analytics(self) -> "NumericAnalytics":
+        """
+        Returns the numeric columns of the collection as NumPy arrays, for percentiles and histograms.
+
+        The columns are extracted on the first call only. NumPy is imported here, so only reports that need the
+        distributions pay for it.
+        """
+        if self._analytics is None:
+            from .analytics import NumericAnalytics
+
+            self._analytics = NumericAnalytics.from_rows(self.collection)
+        return self._analytics
+
+    def group_by(
+        self,
+        keys: Sequence[str],
+        aggregations: Sequence[str | Aggregation] = ("count",),
+        sort_by: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Counts and aggregates the files by the values of some columns, e.g. the total size per author.
+
+        Args:
+            keys (Sequence[str]): The columns to group by, e.g. ["extension", "modified:year"], see ``GroupBy``.
+            aggregations (Sequence[str | Aggregation], optional): E.g. "count", "size:sum" or "duration:mean".
+                Defaults to ("count",).
+            sort_by (str | None, optional): The key or aggregation to sort the groups by, descending. Defaults to
+                None, the first aggregation.
+
+        Returns:
+            list[dict[str, Any]]: One row per group, with a column per key and per aggregation.
+        """
+        return GroupBy(keys, aggregations).update(self.collection).results(sort_by)
 
     def total_files(self) -> int:
         """
@@ -74,7 +121,7 @@ class StatCalculator:
         Returns:
             Collection: A collection of the top N largest images, sorted by size in descending order.
         """
-        images = [file for file in self.collection if ImageResearcher().accepts(Path(str(file.get("path"))))]
+        images = [file for file in self.collection if Path(str(file.get("path"))).suffix.lower() in IMAGE_EXTENSIONS]
 
         def get_area(file):
             return float(file.get("width", 0)) * float(file.get("height", 0))
@@ -96,13 +143,123 @@ class StatCalculator:
             else:
                 return Path("")
 
-        documents = [
-            file
-            for file in self.collection
-            if any(
-                researcher.accepts(file=get_path(file))
-                for researcher in (PdfResearcher, ModernOfficeResearcher, LegacyOfficeResearcher)
-            )
-        ]
+        documents = [file for file in self.collection if get_path(file).suffix.lower() in DOCUMENT_EXTENSIONS]
 
         return Collection(sorted(documents, key=get_page_count, reverse=True)[:n])
+
+
+def to_number(value: Any) -> float:
+    """
+    Converts a collected value to a number, treating missing and malformed values as 0.
+    """
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class StatAccumulator:
+    """
+    Computes the basic statistics of StatCalculator incrementally, one row at a time, without keeping rows in memory.
+    Useful for results that do not fit in memory, such as merged shards.
+    """
+
+    def __init__(self, top_n: int = 10) -> None:
+        """
+        Initializes an empty accumulator.
+
+        Args:
+            top_n (int, optional): The number of largest files to keep track of. Defaults to 10.
+        """
+        self.top_n = top_n
+        self.files = 0
+        self.size = 0.0
+        self.extensions: Counter[str] = Counter()
+        self._largest: list[tuple[float, int, Mapping[str, Any]]] = []
+        self._seq = 0
+
+    def add(self, row: Mapping[str, Any]) -> None:
+        """
+        Adds a row to the statistics.
+
+        Args:
+            row (Mapping[str, Any]): The collected row.
+        """
+        self.files += 1
+        size = to_number(row.get("size"))
+        self.size += size
+        self.extensions[str(row.get("extension") or "no_extension")] += 1
+        self._push_largest(row, size)
+
+    def _push_largest(self, row: Mapping[str, Any], size: float) -> None:
+        self._seq += 1
+        entry = (size, self._seq, {"path": row.get("path"), "size": row.get("size")})
+        if len(self._largest) < self.top_n:
+            heapq.heappush(self._largest, entry)
+        elif size > self._largest[0][0]:
+            heapq.heapreplace(self._largest, entry)
+
+    def remove(self, row: Mapping[str, Any]) -> bool:
+        """
+        Removes a row that was added before, e.g. a deleted file or the old version of a modified one.
+
+        Args:
+            row (Mapping[str, Any]): The row as it was added.
+
+        Returns:
+            bool: True if the row was one of the largest files. The largest files are then incomplete
+            until refilled with ``refill_largest``.
+        """
+        self.files -= 1
+        self.size -= to_number(row.get("size"))
+        extension = str(row.get("extension") or "no_extension")
+        self.extensions[extension] -= 1
+        if self.extensions[extension] <= 0:
+            del self.extensions[extension]
+
+        path = row.get("path")
+        remaining = [entry for entry in self._largest if entry[2]["path"] != path]
+        if len(remaining) == len(self._largest):
+            return False
+        heapq.heapify(remaining)
+        self._largest = remaining
+        return True
+
+    def refill_largest(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Recomputes the largest files from all current rows, after ``remove`` dropped one of them.
+
+        Args:
+            rows (Iterable[Mapping[str, Any]]): All rows currently counted.
+        """
+        self._largest = []
+        for row in rows:
+            self._push_largest(row, to_number(row.get("size")))
+
+    def update(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Adds all rows to the statistics.
+        """
+        for row in rows:
+            self.add(row)
+
+    def total_files(self) -> int:
+        return self.files
+
+    def total_size(self) -> float:
+        return self.size
+
+    def count_by_extension(self) -> Counter[str]:
+        return Counter(self.extensions)
+
+    def top_n_largest_files(self, n: int | None = None) -> list[Mapping[str, Any]]:
+        """
+        Returns the largest files seen, sorted by size in descending order.
+
+        Args:
+            n (int | None, optional): The number of files, at most ``top_n``. Defaults to ``top_n``.
+
+        Returns:
+            list[Mapping[str, Any]]: The path and size of the largest files.
+        """
+        return [row for _, _, row in sorted(self._largest, key=lambda e: (-e[0], e[1]))][:n]
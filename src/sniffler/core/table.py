@@ -0,0 +1,139 @@
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from .utils import TIMESTAMP_FIELDS, convert_size, format_timestamp
+
+# numbers sort before text, and rows without a value last, whatever the direction
+_NUMBER, _TEXT, _MISSING = 0, 1, 2
+
+
+def sort_key(value: Any) -> tuple[int, Any]:
+    """
+    A sort key that orders values of mixed types: numbers by value, then text case-insensitively, then missing values.
+    """
+    if value is None:
+        return (_MISSING, 0)
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return (_NUMBER, value)
+    return (_TEXT, str(value).lower())
+
+
+def format_cell(column: str, value: Any) -> str:
+    """
+    Formats a collected value for display: sizes in human-readable units, timestamps as local time.
+    """
+    if value is None:
+        return ""
+    if column == "size" and isinstance(value, int | float):
+        return convert_size(value)
+    if column in TIMESTAMP_FIELDS and isinstance(value, int | float):
+        return str(format_timestamp(value))
+    return str(value)
+
+
+class TableModel:
+    """
+    The rows of a table view over a collection, by position in the collection rather than by copy.
+
+    The model holds the positions of the shown rows in display order, so filtering (e.g. to search hits) and sorting
+    are operations on a list of integers, and views only format the rows they actually display. Sorting by a column
+    ranks all rows of the collection once, later sorts of any subset by the same column are a sort of integers.
+    Rows without a value in the sort column are shown last in both directions.
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Mapping[str, Any]],
+        columns: Sequence[str],
+        indices: Sequence[int] | None = None,
+        formatter: Callable[[str, Any], str] = format_cell,
+    ) -> None:
+        """
+        Args:
+            rows (Sequence[Mapping[str, Any]]): The rows, e.g. a Collection.
+            columns (Sequence[str]): The columns to show.
+            indices (Sequence[int] | None, optional): The positions of the rows to show. Defaults to None, all rows.
+            formatter (Callable[[str, Any], str], optional): Formats a cell from its column and value. Defaults to
+                ``format_cell``.
+
+        Attributes:
+            sort_column (str | None): The column the rows are sorted by, None for collection order.
+            descending (bool): Whether the rows are sorted in descending order.
+        """
+        self.rows = rows
+        self.columns = list(columns)
+        self.formatter = formatter
+        self.indices: list[int] = list(range(len(rows))) if indices is None else list(indices)
+        self.sort_column: str | None = None
+        self.descending = False
+        self._ranks: dict[tuple[str, bool], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def row(self, position: int) -> Mapping[str, Any]:
+        """
+        Returns the row shown at a position.
+        """
+        return self.rows[self.indices[position]]
+
+    def cells(self, position: int) -> list[str]:
+        """
+        Returns the formatted cells of the row shown at a position, one per column.
+        """
+        row = self.rows[self.indices[position]]
+        return [self.formatter(column, row.get(column)) for column in self.columns]
+
+    def _rank(self, column: str, descending: bool) -> list[int]:
+        rank = self._ranks.get((column, descending))
+        if rank is None:
+            rows = self.rows
+            keys = [sort_key(row.get(column)) for row in rows]
+            order = sorted(range(len(rows)), key=keys.__getitem__)
+            present = len(order) - sum(1 for key in keys if key[0] == _MISSING)
+            if descending:
+                # reverse the rows with a value, those without stay last
+                order[:present] = order[present - 1 :: -1] if present else []
+            rank = [0] * len(rows)
+            for position, idx in enumerate(order):
+                rank[idx] = position
+            self._ranks[(column, descending)] = rank
+        return rank
+
+    def sort(self, column: str | None, descending: bool = False) -> None:
+        """
+        Sorts the shown rows.
+
+        Args:
+            column (str | None): The column to sort by, None for collection order.
+            descending (bool, optional): Whether to sort in descending order. Defaults to False.
+        """
+        self.sort_column = column
+        self.descending = descending
+        if column is None:
+            self.indices.sort(reverse=descending)
+        else:
+            self.indices.sort(key=self._rank(column, descending).__getitem__)
+
+    def toggle_sort(self, column: str) -> None:
+        """
+        Sorts by a column, ascending first and reversing the direction if it is already the sort column.
+        """
+        self.sort(column, descending=not self.descending if column == self.sort_column else False)
+
+    def filter(self, indices: Sequence[int] | None) -> None:
+        """
+        Shows only some rows, in the current sort order.
+
+        Args:
+            indices (Sequence[int] | None): The positions of the rows to show, None for all rows.
+        """
+        self.indices = list(range(len(self.rows))) if indices is None else list(indices)
+        self.sort(self.sort_column, self.descending)
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached ranks after rows of the collection have changed, and sorts the shown rows again.
+        """
+        self._ranks.clear()
+        self.sort(self.sort_column, self.descending)
@@ -0,0 +1,101 @@
+import bisect
+import math
+import random
+from collections.abc import Sequence
+from unittest import TestCase
+
+from ..analytics import AGE_BOUNDS, SIZE_BOUNDS, NumericAnalytics, numeric_array
+
+
+def naive_percentile(values: list[float], percentile: float) -> float:
+    # linear interpolation between the closest ranks, NumPy's default method
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percentile / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def naive_histogram(
+    rows: list[dict], keys: Sequence[float | None], bounds: Sequence[float]
+) -> tuple[list[int], list[float]]:
+    counts = [0] * (len(bounds) + 1)
+    sizes = [0.0] * (len(bounds) + 1)
+    for row, key in zip(rows, keys, strict=True):
+        if key is None:
+            continue
+        bucket = bisect.bisect_right(bounds, key)
+        counts[bucket] += 1
+        sizes[bucket] += float(row.get("size") or 0)
+    return counts, sizes
+
+
+def make_rows(count: int = 1000, seed: int = 17) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        row: dict = {"size": int(rng.lognormvariate(10, 3)), "modified": 1e9 - rng.random() * 4e8}
+        if rng.random() < 0.3:
+            row["width"], row["height"] = rng.randrange(1, 5000), rng.randrange(1, 5000)
+        if rng.random() < 0.1:
+            # CSV scans store numbers as text
+            row["size"] = str(row["size"])
+        if rng.random() < 0.05:
+            del row["size"]
+        rows.append(row)
+    return rows
+
+
+class NumericArrayTests(TestCase):
+    def test_conversion(self):
+        values = numeric_array([1, "2.5", None, "n/a", 3.0, [4]])
+        self.assertEqual(values[:2].tolist(), [1.0, 2.5])
+        self.assertTrue(math.isnan(values[2]) and math.isnan(values[3]) and math.isnan(values[5]))
+        self.assertEqual(values[4], 3.0)
+
+
+class NumericAnalyticsTests(TestCase):
+    def setUp(self):
+        self.rows = make_rows()
+        self.analytics = NumericAnalytics.from_rows(self.rows)
+        self.sizes = [float(row["size"]) for row in self.rows if "size" in row]
+
+    def test_percentiles_against_naive(self):
+        percentiles = self.analytics.percentiles("size", (0, 25, 50, 90, 99, 100))
+        for percentile, value in percentiles.items():
+            self.assertAlmostEqual(value, naive_percentile(self.sizes, percentile), delta=1e-6 * max(1.0, value))
+
+    def test_area_percentiles(self):
+        areas = [row["width"] * row["height"] for row in self.rows if "width" in row]
+        median = self.analytics.percentiles("area", (50,))[50]
+        self.assertAlmostEqual(median, naive_percentile(areas, 50))
+
+    def test_percentiles_of_missing_column(self):
+        self.assertEqual(self.analytics.percentiles("duration"), {})
+        self.assertEqual(NumericAnalytics.from_rows([]).percentiles(), {})
+
+    def test_size_histogram_against_naive(self):
+        histogram = self.analytics.size_histogram()
+        keys = [float(row["size"]) if "size" in row else None for row in self.rows]
+        counts, sizes = naive_histogram(self.rows, keys, list(SIZE_BOUNDS))
+        self.assertEqual(histogram.counts, counts)
+        for size, expected in zip(histogram.sizes, sizes, strict=True):
+            self.assertAlmostEqual(size, expected, delta=1e-9 * max(1.0, expected))
+        self.assertEqual(len(histogram.labels), len(SIZE_BOUNDS) + 1)
+        self.assertAlmostEqual(sum(row["percent"] for row in histogram.rows()), 100)
+
+    def test_bucket_bounds_are_exclusive(self):
+        histogram = NumericAnalytics.from_rows([{"size": 1023}, {"size": 1024}, {"size": 1025}]).size_histogram()
+        self.assertEqual(histogram.counts[:2], [1, 2])
+
+    def test_age_histogram_against_naive(self):
+        now = 1e9 + 86400
+        histogram = self.analytics.age_histogram(now=now)
+        keys = [max((now - row["modified"]) / 86400, 0) for row in self.rows]
+        counts, sizes = naive_histogram(self.rows, keys, [bound for bound, _ in AGE_BOUNDS])
+        self.assertEqual(histogram.counts, counts)
+        self.assertEqual([round(size) for size in histogram.sizes], [round(size) for size in sizes])
+        self.assertEqual(histogram.labels[-1], f"≥ {AGE_BOUNDS[-1][1]}")
+
+    def test_future_timestamps_count_as_new(self):
+        histogram = NumericAnalytics.from_rows([{"modified": 2e9, "size": 5}]).age_histogram(now=1e9)
+        self.assertEqual((histogram.counts[0], histogram.sizes[0]), (1, 5.0))
@@ -0,0 +1,88 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+
+from ..collector import Collector
+from ..concurrency import AdaptivePool
+
+
+class WaitingResearcher:
+    """
+    Waits on every file like a researcher reading from a slow share, and records how many calls overlap.
+    """
+
+    def __init__(self, wait: float = 0.002) -> None:
+        self.wait = wait
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def accepts(self, file: Path) -> bool:
+        return True
+
+    def get_info(self, file: Path) -> dict:
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.wait)
+        with self.lock:
+            self.active -= 1
+        return {"name": file.name}
+
+
+class SingleThreadedResearcher(WaitingResearcher):
+    thread_safe = False
+
+
+class AdaptivePoolTests(TestCase):
+    def run_calls(self, pool: AdaptivePool, calls: int = 300) -> None:
+        try:
+            futures = [pool.submit(time.sleep, 0.002) for _ in range(calls)]
+            for future in futures:
+                future.result()
+        finally:
+            pool.shutdown()
+
+    def test_waiting_calls_add_workers(self):
+        pool = AdaptivePool("waiting", max_workers=4, interval=0.02)
+        self.run_calls(pool)
+        self.assertGreater(pool.peak_workers, 1)
+        self.assertLessEqual(pool.peak_workers, 4)
+
+    def test_single_worker_pool_stays_inline(self):
+        pool = AdaptivePool("single", max_workers=1, interval=0.02)
+        self.run_calls(pool)
+        self.assertEqual((pool.workers, pool.peak_workers), (1, 1))
+        self.assertIsNone(pool._executor)
+        # the I/O wait was measured, the pool just could not grow
+        self.assertTrue(pool.history)
+        self.assertTrue(all(step.workers == 1 for step in pool.history))
+
+
+class CollectorPoolTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for i in range(300):
+            (self.root / f"file{i:03}.txt").write_text("x")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_researchers_that_are_not_thread_safe_keep_one_worker(self):
+        safe, unsafe = WaitingResearcher(), SingleThreadedResearcher()
+        collector = Collector(self.root, [safe, unsafe], jobs=4)
+        collector.collect()
+
+        self.assertEqual(len(collector.collection), 300)
+        # rows stay in walk order
+        sequential = Collector(self.root, [WaitingResearcher(wait=0)])
+        sequential.collect()
+        self.assertEqual([row["name"] for row in collector.collection], [row["name"] for row in sequential.collection])
+        report = collector.concurrency_report()
+        self.assertEqual(report["SingleThreadedResearcher"]["peak_workers"], 1)
+        self.assertEqual(unsafe.max_active, 1)
+        self.assertGreater(report["WaitingResearcher"]["peak_workers"], 1)
+        self.assertLessEqual(report["WaitingResearcher"]["peak_workers"], 4)
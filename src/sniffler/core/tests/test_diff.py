@@ -0,0 +1,108 @@
+import random
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from ..diff import DiffEntry, DiffSummary, diff_scans, sorted_by_path
+
+
+def make_row(path: str, size: int, modified: str = "2024-01-01 00:00:00") -> dict:
+    return {"path": path, "extension": Path(path).suffix[1:], "size": size, "modified": modified}
+
+
+def naive_diff(old_rows: list[dict], new_rows: list[dict]) -> list[tuple[str, str]]:
+    old = {row["path"]: row for row in old_rows}
+    new = {row["path"]: row for row in new_rows}
+    changes = []
+    for path in sorted(old.keys() | new.keys()):
+        if path not in new:
+            changes.append(("removed", path))
+        elif path not in old:
+            changes.append(("added", path))
+        elif new[path]["size"] > old[path]["size"]:
+            changes.append(("grown", path))
+        elif new[path]["size"] < old[path]["size"]:
+            changes.append(("shrunk", path))
+        elif new[path]["modified"] != old[path]["modified"]:
+            changes.append(("modified", path))
+    return changes
+
+
+class SortedByPathTests(TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.rows = [make_row(f"d{rng.randrange(20)}/f{i}.txt", rng.randrange(1000)) for i in range(500)]
+        rng.shuffle(self.rows)
+        self.expected = sorted(row["path"] for row in self.rows)
+
+    def test_in_memory(self):
+        self.assertEqual([row["path"] for row in sorted_by_path(self.rows)], self.expected)
+
+    def test_spilled_runs_are_merged(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            rows = list(sorted_by_path(self.rows, chunk_size=64, tmp_dir=tmp_dir))
+            # the runs are removed once the merge is done
+            self.assertEqual(list(Path(tmp_dir).iterdir()), [])
+        self.assertEqual([row["path"] for row in rows], self.expected)
+        self.assertEqual(sorted(rows, key=lambda row: row["path"]), sorted(self.rows, key=lambda row: row["path"]))
+
+    def test_empty(self):
+        self.assertEqual(list(sorted_by_path([], chunk_size=1)), [])
+
+
+class DiffScansTests(TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.old = [make_row(f"d{i % 7}/f{i}.{rng.choice('abc')}", rng.randrange(100)) for i in range(300)]
+        self.new = []
+        for row in self.old:
+            roll = rng.random()
+            if roll < 0.1:
+                continue
+            row = dict(row)
+            if roll < 0.2:
+                row["size"] += rng.randrange(1, 10)
+            elif roll < 0.3:
+                row["size"] = max(0, row["size"] - rng.randrange(1, 10))
+            elif roll < 0.4:
+                row["modified"] = "2024-06-01 00:00:00"
+            self.new.append(row)
+        self.new += [make_row(f"new/f{i}.c", i) for i in range(30)]
+        rng.shuffle(self.old)
+        rng.shuffle(self.new)
+
+    def test_against_naive_diff(self):
+        expected = naive_diff(self.old, self.new)
+        for chunk_size in (50_000, 17):
+            entries = list(diff_scans(self.old, self.new, chunk_size=chunk_size))
+            self.assertEqual([(entry.change, entry.path) for entry in entries], expected, chunk_size)
+
+    def test_identical_scans(self):
+        self.assertEqual(list(diff_scans(self.old, list(reversed(self.old)), chunk_size=10)), [])
+
+    def test_values_compared_as_text(self):
+        # a CSV scan has every value as a string
+        old = [make_row("a.txt", 5)]
+        new = [{key: str(value) for key, value in old[0].items()}]
+        self.assertEqual(list(diff_scans(old, new)), [])
+
+    def test_one_side_empty(self):
+        self.assertEqual({entry.change for entry in diff_scans([], self.new, chunk_size=10)}, {"added"})
+        self.assertEqual({entry.change for entry in diff_scans(self.old, [], chunk_size=10)}, {"removed"})
+
+    def test_to_row(self):
+        row = DiffEntry("grown", "a.txt", make_row("a.txt", 5), make_row("a.txt", 8)).to_row()
+        self.assertEqual((row["old_size"], row["new_size"], row["size_delta"]), (5, 8, 3))
+        row = DiffEntry("removed", "a.txt", make_row("a.txt", 5), None).to_row()
+        self.assertEqual((row["extension"], row["new_size"], row["size_delta"]), ("txt", None, -5))
+
+
+class DiffSummaryTests(TestCase):
+    def test_summary(self):
+        old = [make_row("a.txt", 10), make_row("b.txt", 10), make_row("c.py", 10), make_row("d", 1)]
+        new = [make_row("a.txt", 15), make_row("c.py", 10, "2024-06-01 00:00:00"), make_row("e.py", 4)]
+        summary = DiffSummary()
+        entries = list(summary.track(diff_scans(old, new)))
+        self.assertEqual(len(entries), 5)
+        self.assertEqual(summary.changes, {"grown": 1, "removed": 2, "modified": 1, "added": 1})
+        self.assertEqual(summary.by_extension(), [("txt", -1, -5.0), ("py", 1, 4.0), ("no_extension", -1, -1.0)])
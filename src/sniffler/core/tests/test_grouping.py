@@ -0,0 +1,115 @@
+import random
+from collections import defaultdict
+from datetime import datetime
+from unittest import TestCase
+
+from ..grouping import Aggregation, GroupBy, group_by
+
+
+def make_rows(count: int = 600, seed: int = 19) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        row: dict = {
+            "extension": rng.choice(["pdf", "jpg", "txt", None]),
+            "owner": rng.choice(["ann", "bob"]),
+            "size": rng.choice([rng.randrange(1 << 30), str(rng.randrange(1000)), None, "n/a", True]),
+            "modified": rng.uniform(1.5e9, 1.7e9),
+        }
+        if rng.random() < 0.3:
+            row["page_count"] = rng.randrange(1, 400)
+        rows.append(row)
+    return rows
+
+
+def naive_number(value) -> float | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def naive_group_by(rows: list[dict], keys, column: str) -> dict[tuple, dict]:
+    groups = defaultdict(list)
+    for row in rows:
+        groups[tuple(key(row) for key in keys)].append(row)
+    results = {}
+    for key, members in groups.items():
+        values = [number for row in members if (number := naive_number(row.get(column))) is not None]
+        results[key] = {
+            "count": len(members),
+            f"{column}:count": len(values),
+            f"{column}:sum": float(sum(values)),
+            f"{column}:min": min(values) if values else None,
+            f"{column}:max": max(values) if values else None,
+            f"{column}:mean": sum(values) / len(values) if values else None,
+        }
+    return results
+
+
+AGGREGATIONS = ["count", "size:count", "size:sum", "size:min", "size:max", "size:mean"]
+
+
+class GroupByTests(TestCase):
+    def setUp(self):
+        self.rows = make_rows()
+
+    def assert_groups(self, results: list[dict], keys: list[str], expected: dict[tuple, dict]):
+        self.assertEqual(len(results), len(expected))
+        for row in results:
+            naive = expected[tuple(row[key] for key in keys)]
+            for name, value in naive.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(row[name], value, places=3, msg=name)
+                else:
+                    self.assertEqual(row[name], value, name)
+
+    def test_against_naive_grouping(self):
+        keys = ["extension", "owner"]
+        results = GroupBy(keys, AGGREGATIONS).update(self.rows).results()
+        expected = naive_group_by(self.rows, [lambda row: row["extension"], lambda row: row["owner"]], "size")
+        self.assert_groups(results, keys, expected)
+
+    def test_timestamp_parts(self):
+        results = group_by(self.rows, ["modified:year"], AGGREGATIONS)
+        expected = naive_group_by(self.rows, [lambda row: datetime.fromtimestamp(row["modified"]).year], "size")
+        self.assert_groups(results, ["modified:year"], expected)
+
+        months = {row["modified:month"] for row in group_by(self.rows, ["modified:month"])}
+        self.assertEqual(months, {datetime.fromtimestamp(row["modified"]).strftime("%Y-%m") for row in self.rows})
+
+    def test_rows_added_one_at_a_time(self):
+        grouped = GroupBy(["extension"], AGGREGATIONS)
+        list(grouped.tee(iter(self.rows)))
+        self.assertEqual(grouped.results(), GroupBy(["extension"], AGGREGATIONS).update(self.rows).results())
+
+    def test_sorting(self):
+        results = group_by(self.rows, ["extension"], ["page_count:max", "count"], sort_by="page_count:max")
+        values = [row["page_count:max"] for row in results]
+        self.assertEqual(values, sorted(values, reverse=True))
+        ascending = GroupBy(["extension"], ["count"]).update(self.rows).results("count", descending=False)
+        self.assertEqual([row["count"] for row in ascending], sorted(row["count"] for row in ascending))
+        with self.assertRaises(ValueError):
+            group_by(self.rows, ["extension"], sort_by="size:sum")
+
+    def test_groups_without_values_sort_last(self):
+        rows = [{"kind": "a", "size": None}, {"kind": "b", "size": 3}, {"kind": "c", "size": 1}]
+        results = group_by(rows, ["kind"], ["size:max"])
+        self.assertEqual([(row["kind"], row["size:max"]) for row in results], [("b", 3), ("c", 1), ("a", None)])
+
+    def test_unhashable_keys(self):
+        results = group_by([{"tags": ["a"]}, {"tags": ["a"]}, {"tags": "x"}], ["tags"])
+        self.assertEqual([(row["tags"], row["count"]) for row in results], [("['a']", 2), ("x", 1)])
+
+    def test_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            GroupBy([])
+        with self.assertRaises(ValueError):
+            Aggregation.parse("size:median")
+        with self.assertRaises(ValueError):
+            Aggregation.parse("sum")
+        self.assertEqual(
+            GroupBy(["extension", "modified:year"], ["size:sum"]).columns, ["extension", "modified", "size"]
+        )
@@ -0,0 +1,109 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from ..collector import Explorer
+from ..ignore import IgnoreRules, translate
+
+
+class IgnoreRulesTests(TestCase):
+    def test_last_matching_rule_wins(self):
+        rules = IgnoreRules(["*.log", "!keep.log"])
+        self.assertTrue(rules.match("debug.log", False))
+        self.assertFalse(rules.match("keep.log", False))
+        self.assertIsNone(rules.match("notes.txt", False))
+
+    def test_directory_only_and_anchored_rules(self):
+        rules = IgnoreRules(["build/", "/top.txt", "docs/*.md"])
+        self.assertTrue(rules.match("src/build", True))
+        self.assertIsNone(rules.match("src/build", False))
+        self.assertTrue(rules.match("top.txt", False))
+        self.assertIsNone(rules.match("sub/top.txt", False))
+        self.assertTrue(rules.match("docs/readme.md", False))
+        self.assertIsNone(rules.match("docs/api/readme.md", False))
+
+    def test_double_star(self):
+        rules = IgnoreRules(["**/cache", "logs/**", "a/**/b"])
+        self.assertTrue(rules.match("cache", True))
+        self.assertTrue(rules.match("x/y/cache", True))
+        self.assertTrue(rules.match("logs/2024/app.log", False))
+        self.assertTrue(rules.match("a/b", False))
+        self.assertTrue(rules.match("a/x/y/b", False))
+        self.assertIsNone(rules.match("ab", False))
+
+    def test_wildcards_do_not_cross_slashes(self):
+        rules = IgnoreRules(["src/*.py", "src/?.c"])
+        self.assertTrue(rules.match("src/main.py", False))
+        self.assertIsNone(rules.match("src/pkg/main.py", False))
+        self.assertTrue(rules.match("src/a.c", False))
+        self.assertIsNone(rules.match("src/ab.c", False))
+
+    def test_bracket_edge_cases(self):
+        self.assertTrue(IgnoreRules(["[]x]"]).match("]", False))
+        self.assertTrue(IgnoreRules(["[]x]"]).match("x", False))
+        self.assertTrue(IgnoreRules(["[!a]b"]).match("cb", False))
+        self.assertIsNone(IgnoreRules(["[!a]b"]).match("ab", False))
+        self.assertTrue(IgnoreRules(["[^a]b"]).match("cb", False))
+        self.assertTrue(IgnoreRules(["file[0-9].txt"]).match("file7.txt", False))
+        self.assertTrue(IgnoreRules([r"[\]]"]).match("]", False))
+        # an unclosed class is a literal bracket, as in git
+        self.assertTrue(IgnoreRules(["a[b"]).match("a[b", False))
+        self.assertTrue(IgnoreRules(["x[a-]"]).match("x-", False))
+        self.assertEqual(translate("*.[ch]"), "[^/]*\\.[ch]")
+
+    def test_invalid_rule_is_skipped(self):
+        with self.assertLogs("sniffler.core.ignore", level="WARNING"):
+            rules = IgnoreRules(["[z-a]", "*.tmp"])
+        self.assertEqual(len(rules.rules), 1)
+        self.assertTrue(rules.match("x.tmp", False))
+
+    def test_comments_escapes_and_trailing_spaces(self):
+        rules = IgnoreRules(["# comment", r"\#hash", r"\!bang", "spaces   ", "kept\\ ", ""])
+        self.assertEqual(len(rules.rules), 4)
+        self.assertTrue(rules.match("#hash", False))
+        self.assertTrue(rules.match("!bang", False))
+        self.assertTrue(rules.match("spaces", False))
+        self.assertIsNone(rules.match("spaces ", False))
+        self.assertTrue(rules.match("kept ", False))
+        self.assertIsNone(rules.match("kept", False))
+
+    def test_from_missing_file(self):
+        self.assertFalse(IgnoreRules.from_file("/nonexistent/.gitignore"))
+
+
+class ExplorerPruningTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for relpath in (
+            "a.txt",
+            "b.tmp",
+            ".hidden/c.txt",
+            "node_modules/d.js",
+            "src/e.py",
+            "src/f.log",
+            "src/deep/g.py",
+        ):
+            path = self.root / relpath
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(relpath)
+        (self.root / "src" / ".gitignore").write_text("*.log\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def files(self, **kwargs) -> set[str]:
+        return {path.relative_to(self.root).as_posix() for path in Explorer(self.root, **kwargs).files()}
+
+    def test_exclude_and_ignore_files(self):
+        files = self.files(exclude=["node_modules/", "*.tmp"], ignore_file_names=[".gitignore"], skip_hidden=True)
+        self.assertEqual(files, {"a.txt", "src/e.py", "src/deep/g.py"})
+
+    def test_include_and_max_depth(self):
+        self.assertEqual(self.files(include=["*.py"]), {"src/e.py", "src/deep/g.py"})
+        self.assertEqual(self.files(max_depth=0), {"a.txt", "b.tmp"})
+
+    def test_concurrent_walk_matches_sequential(self):
+        sequential = list(Explorer(self.root).files())
+        self.assertEqual(list(Explorer(self.root, threads=4, max_pending=2).files()), sequential)
+        self.assertEqual(set(Explorer(self.root, threads=4, ordered=False).files()), set(sequential))
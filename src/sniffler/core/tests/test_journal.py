@@ -0,0 +1,93 @@
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+from ..collector import Collector
+from ..journal import Journal
+
+
+class CountingResearcher:
+    """
+    Records the files it researched, and sets ``stop`` after ``stop_after`` of them.
+    """
+
+    def __init__(self, stop: threading.Event | None = None, stop_after: int | None = None) -> None:
+        self.stop = stop
+        self.stop_after = stop_after
+        self.researched: list[str] = []
+        self.lock = threading.Lock()
+
+    def accepts(self, file: Path) -> bool:
+        return True
+
+    def get_info(self, file: Path) -> dict:
+        with self.lock:
+            self.researched.append(file.name)
+            if self.stop is not None and len(self.researched) == self.stop_after:
+                self.stop.set()
+        return {"name": file.name, "size": file.stat().st_size}
+
+
+class JournalResumeTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "tree"
+        for d in range(4):
+            for i in range(5):
+                path = self.root / f"dir{d}" / f"file{d}{i}.txt"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text("x" * i)
+        self.journal_path = Path(self.tmp.name) / "scan.journal"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def scan(self, researcher: CountingResearcher, resume: bool, stop: threading.Event | None = None, **kwargs):
+        with Journal(self.journal_path, self.root, resume=resume, flush_every=1) as journal:
+            collector = Collector(self.root, [researcher], journal=journal, **kwargs)
+            collector.collect(stop=stop)
+        return collector, journal
+
+    def assert_resumes(self, **kwargs):
+        stop = threading.Event()
+        interrupted, _ = self.scan(CountingResearcher(stop, stop_after=7), resume=False, stop=stop, **kwargs)
+        self.assertLess(len(interrupted.collection), 20)
+
+        researcher = CountingResearcher()
+        collector, journal = self.scan(researcher, resume=True, **kwargs)
+        names = sorted(str(row["name"]) for row in collector.collection)
+        self.assertEqual(names, sorted(f"file{d}{i}.txt" for d in range(4) for i in range(5)))
+        # only the files missing from the journal are researched again
+        self.assertEqual(journal.restored, len(interrupted.collection))
+        self.assertEqual(len(researcher.researched), 20 - journal.restored)
+        self.assertTrue(set(researcher.researched).isdisjoint(row["name"] for row in interrupted.collection))
+
+    def test_resume_after_interruption(self):
+        self.assert_resumes()
+
+    def test_resume_after_interruption_with_jobs(self):
+        self.assert_resumes(jobs=4)
+
+    def test_partial_last_line_is_discarded(self):
+        self.scan(CountingResearcher(), resume=False)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"path": "dir0/file00.tx')
+        researcher = CountingResearcher()
+        collector, journal = self.scan(researcher, resume=True)
+        self.assertEqual(journal.restored, 20)
+        self.assertEqual(researcher.researched, [])
+        self.assertEqual(len(collector.collection), 20)
+        self.assertTrue(self.journal_path.read_text(encoding="utf-8").endswith("\n"))
+
+    def test_completed_directories_are_skipped(self):
+        self.scan(CountingResearcher(), resume=False)
+        with Journal(self.journal_path, self.root, resume=True) as journal:
+            self.assertEqual(journal.done_dirs, {f"dir{d}" for d in range(4)})
+            self.assertTrue(journal.is_done(Path("dir2/new.txt")))
+            self.assertFalse(journal.is_done(Path("dir9/file.txt")))
+
+    def test_journal_of_another_root(self):
+        self.scan(CountingResearcher(), resume=False)
+        with self.assertRaises(ValueError):
+            Journal(self.journal_path, self.tmp.name, resume=True)
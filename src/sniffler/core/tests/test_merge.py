@@ -0,0 +1,85 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from ..collector import Explorer
+from ..csv_writer import write_csv
+from ..merge import merge_fieldnames, merge_rows
+from ..ndjson_writer import write_ndjson
+from ..readers import detect_format, read_rows
+from ..serialization import write_packed
+from ..sharding import parse_shard, shard_of
+from ..sqlite_writer import CORE_COLUMNS, write_sqlite
+from ..stats import StatAccumulator
+
+
+class ShardingTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for top in range(6):
+            for sub in range(3):
+                path = self.root / f"top{top}" / f"sub{sub}" / f"file{top}{sub}.txt"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text("x")
+        (self.root / "root.txt").write_text("x")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shards_partition_the_tree(self):
+        everything = set(Explorer(self.root).files())
+        for shard_by in ("top", "hash"):
+            shards = [set(Explorer(self.root, shard=(index, 4), shard_by=shard_by).files()) for index in range(4)]
+            self.assertEqual(set().union(*shards), everything, shard_by)
+            self.assertEqual(sum(map(len, shards)), len(everything), shard_by)
+
+    def test_top_shards_keep_subtrees_together(self):
+        for index in range(3):
+            for f in Explorer(self.root, shard=(index, 3)).files():
+                top = f.relative_to(self.root).parts[0]
+                self.assertEqual(shard_of(top, 3), index)
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/8"), (2, 8))
+        for value in ("8/8", "-1/4", "3", "a/b"):
+            with self.assertRaises(ValueError, msg=value):
+                parse_shard(value)
+        with self.assertRaises(ValueError):
+            Explorer(self.root, shard=(0, 2), shard_by="random")
+
+
+class MergeTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_merge_every_format(self):
+        parts = [
+            [{"path": f"part{part}/file{i}.txt", "name": f"file{i}.txt", "size": i + 1} for i in range(3)]
+            for part in range(4)
+        ]
+        parts[2][0]["title"] = "Report"
+        parts[3][1]["exif:Model"] = "Camera"
+
+        sources = [self.dir / "a.csv", self.dir / "b.ndjson", self.dir / "c.db", self.dir / "d.sniff"]
+        write_csv(sources[0], ["path", "name", "size"], parts[0])
+        write_ndjson(sources[1], parts[1])
+        write_sqlite(sources[2], parts[2])
+        write_packed(sources[3], parts[3])
+        self.assertEqual([detect_format(source) for source in sources], ["csv", "ndjson", "sqlite", "packed"])
+
+        fieldnames = merge_fieldnames(sources)
+        self.assertEqual(fieldnames[0], "path")
+        # the SQLite sink has a column for every core field, used or not
+        self.assertEqual(set(fieldnames), {"path", "name", "size", "title", "exif:Model", *CORE_COLUMNS})
+
+        stats = StatAccumulator()
+        rows = list(merge_rows(sources, stats=stats))
+        self.assertEqual([row["path"] for row in rows], [row["path"] for part in parts for row in part])
+        self.assertEqual(stats.total_files(), 12)
+        self.assertEqual(stats.total_size(), 4 * (1 + 2 + 3))
+        self.assertEqual(next(row for row in read_rows(sources[2]) if "title" in row)["title"], "Report")
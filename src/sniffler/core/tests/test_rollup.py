@@ -0,0 +1,93 @@
+import random
+from unittest import TestCase
+
+from ..rollup import DirectoryNode, DirectoryRollup
+
+
+def make_rows(count: int = 400, seed: int = 13) -> list[dict]:
+    rng = random.Random(seed)
+    directories = ["", "a", "a/b", "a/b/c", "a/d", "e", "e/f/g"]
+    rows = []
+    for i in range(count):
+        directory = rng.choice(directories)
+        row = {
+            "path": f"{directory}/file{i}.{rng.choice(['pdf', 'jpg', ''])}".strip("/").rstrip("."),
+            "size": rng.randrange(1 << 20),
+        }
+        row["extension"] = row["path"].rpartition(".")[2] if "." in row["path"] else ""
+        if row["extension"] == "pdf":
+            row["page_count"] = rng.randrange(1, 50)
+        rows.append(row)
+    return rows
+
+
+def naive_totals(rows: list[dict], directory: str) -> tuple[int, float, float, dict[str, int]]:
+    prefix = f"{directory}/" if directory else ""
+    below = [row for row in rows if row["path"].startswith(prefix)]
+    extensions: dict[str, int] = {}
+    for row in below:
+        extension = row["extension"] or "no_extension"
+        extensions[extension] = extensions.get(extension, 0) + 1
+    return (
+        len(below),
+        float(sum(row["size"] for row in below)),
+        float(sum(row.get("page_count", 0) for row in below)),
+        extensions,
+    )
+
+
+class DirectoryRollupTests(TestCase):
+    def setUp(self):
+        self.rows = make_rows()
+        self.rollup = DirectoryRollup(self.rows)
+
+    def node(self, path: str) -> DirectoryNode:
+        node = self.rollup.node(path)
+        assert node is not None
+        return node
+
+    def test_totals_against_naive_sums(self):
+        paths = {node.path for node in self.rollup.root.walk()}
+        self.assertEqual(paths, {"", "a", "a/b", "a/b/c", "a/d", "e", "e/f", "e/f/g"})
+        for path in paths:
+            with self.subTest(path=path):
+                node = self.node(path)
+                self.assertEqual(
+                    (node.files, node.size, node.totals["pages"], node.extensions), naive_totals(self.rows, path)
+                )
+
+    def test_own_totals(self):
+        node = self.node("a/b")
+        own = [row for row in self.rows if row["path"].rpartition("/")[0] == "a/b"]
+        self.assertEqual((node.own_files, node.own_size), (len(own), float(sum(row["size"] for row in own))))
+        self.assertEqual(self.node("e/f").own_files, 0)
+
+    def test_node_lookup(self):
+        self.assertIs(self.rollup.node("."), self.rollup.root)
+        self.assertIs(self.rollup.node("\\a\\b\\"), self.rollup.node("a/b"))
+        self.assertIsNone(self.rollup.node("missing"))
+
+    def test_top(self):
+        def naive_top(paths, k, column):
+            return sorted(paths, key=lambda path: naive_totals(self.rows, path)[column], reverse=True)[:k]
+
+        subdirectories = ["a", "a/b", "a/b/c", "a/d", "e", "e/f", "e/f/g"]
+        self.assertEqual([node.path for node in self.rollup.top(3)], naive_top(subdirectories, 3, 1))
+        self.assertEqual([node.path for node in self.rollup.top(2, by="pages")], naive_top(subdirectories, 2, 2))
+        self.assertEqual(
+            [node.path for node in self.rollup.top(10, by="files", under="a", max_depth=1)],
+            naive_top(["a/b", "a/d"], 10, 0),
+        )
+        with self.assertRaises(ValueError):
+            self.rollup.top(by="name")
+
+    def test_incremental_update(self):
+        rollup = DirectoryRollup()
+        rollup.update(self.rows[:100])
+        rollup.finish()
+        rollup.update(self.rows[100:])
+        with self.assertRaises(RuntimeError):
+            rollup.node("a")
+        rollup.finish()
+        self.assertEqual(rollup.root.summary(), self.rollup.root.summary())
+        self.assertEqual(rollup.root.summary()["files"], len(self.rows))
@@ -0,0 +1,81 @@
+import random
+import tempfile
+from collections import Counter
+from pathlib import Path
+from unittest import TestCase
+
+from ..collector import Collector
+from ..sampling import SampleEstimator, reservoir_sample
+from ...researchers import BasicResearcher
+
+
+class ReservoirSampleTests(TestCase):
+    def test_fixed_seed_is_reproducible(self):
+        first = reservoir_sample(range(10_000), 50, random.Random(7))
+        second = reservoir_sample(range(10_000), 50, random.Random(7))
+        self.assertEqual(first, second)
+        sample, seen = first
+        self.assertEqual(seen, 10_000)
+        self.assertEqual(len(sample), 50)
+        self.assertEqual(len(set(sample)), 50)
+
+    def test_short_and_empty_streams(self):
+        self.assertEqual(reservoir_sample(range(3), 5, random.Random(0)), ([0, 1, 2], 3))
+        self.assertEqual(reservoir_sample(range(3), 0, random.Random(0)), ([], 3))
+        self.assertEqual(reservoir_sample([], 5, random.Random(0)), ([], 0))
+
+    def test_every_item_is_equally_likely(self):
+        rng = random.Random(1)
+        counts = Counter()
+        runs, n, k = 4000, 40, 5
+        for _ in range(runs):
+            counts.update(reservoir_sample(range(n), k, rng)[0])
+        expected = runs * k / n
+        # 500 per item, the standard deviation is about 21
+        for item in range(n):
+            self.assertLess(abs(counts[item] - expected), 100, item)
+
+
+class SampleEstimatorTests(TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.population = [
+            {"size": rng.randrange(1, 10_000), "extension": rng.choice([".txt", ".pdf", ".jpg"])} for _ in range(2000)
+        ]
+
+    def test_full_sample_is_exact(self):
+        estimator = SampleEstimator(self.population, len(self.population))
+        total = sum(row["size"] for row in self.population)
+        self.assertEqual(tuple(estimator.total_size()), (total, total, total))
+        counts = Counter(row["extension"] for row in self.population)
+        for ext, estimate in estimator.count_by_extension().items():
+            self.assertAlmostEqual(estimate.value, counts[ext])
+            self.assertAlmostEqual(estimate.low, estimate.high)
+
+    def test_interval_covers_the_total(self):
+        sample, seen = reservoir_sample(self.population, 200, random.Random(11))
+        estimator = SampleEstimator(sample, seen)
+        total = sum(row["size"] for row in self.population)
+        estimate = estimator.total_size()
+        self.assertLessEqual(estimate.low, total)
+        self.assertGreaterEqual(estimate.high, total)
+        self.assertGreaterEqual(estimate.low, sum(row["size"] for row in sample))
+
+    def test_missing_values_count_as_zero(self):
+        estimator = SampleEstimator([{"page_count": 4}, {"page_count": "n/a"}, {}], 3)
+        self.assertEqual(estimator.total_pages().value, 4)
+
+
+class SampledCollectionTests(TestCase):
+    def test_collector_sample_is_reproducible(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(30):
+                Path(tmp, f"file{i:02d}.txt").write_text("x" * i)
+            runs = []
+            for _ in range(2):
+                collector = Collector(tmp, [BasicResearcher()], sample_size=10, seed=5)
+                collector.collect()
+                runs.append([row["name"] for row in collector.collection])
+                self.assertEqual(collector.population_size, 30)
+            self.assertEqual(len(runs[0]), 10)
+            self.assertEqual(runs[0], runs[1])
@@ -0,0 +1,97 @@
+import random
+from unittest import TestCase
+
+from ..collector import Collection
+from ..search import IncrementalSearch, PrefixIndex, SearchEngine, SubstringIndex
+
+
+def make_rows(count: int, seed: int = 3) -> Collection:
+    rng = random.Random(seed)
+    words = ["Report", "draft", "ÄRGER", "straße", "İstanbul", "notes", "a b", "a\nb", "x\x1fy", ""]
+    rows = Collection()
+    for i in range(count):
+        rows.append(
+            {
+                "name": f"{rng.choice(words)}{i}.txt",
+                "title": " ".join(rng.choices(words, k=rng.randrange(3))),
+                "size": rng.randrange(10_000),
+            }
+        )
+    return rows
+
+
+class SubstringSearchTests(TestCase):
+    def test_separators_match_within_values_only(self):
+        rows = Collection([{"name": "a\nb"}, {"name": "a b"}, {"name": "a", "title": "b"}, {"name": "x\x1fy"}])
+        engine = SearchEngine(rows)
+        for query in ("a b", "a\nb", "a\x1fb", "x\x1fy", "\n", "\x1f", "b"):
+            with self.subTest(query=query):
+                expected = engine.search_indices(query)
+                self.assertEqual(SubstringIndex(rows, block_size=2).search(query), expected)
+                self.assertEqual(IncrementalSearch(rows, block_size=2).search(query), expected)
+        self.assertEqual(engine.search_indices("a b"), [1])
+        self.assertEqual(engine.search_indices("a\nb"), [0])
+
+    def test_matches_search_engine(self):
+        rows = make_rows(500)
+        engine = SearchEngine(rows)
+        index = SubstringIndex(rows, block_size=64)
+        for query in ("report", "RE", "t1", "straße", "i̇stanbul", "a b", "a\nb", "\x1f", ".txt", "1.txt", "zzz"):
+            with self.subTest(query=query):
+                self.assertEqual(index.search(query), engine.search_indices(query))
+
+    def test_incremental_queries_match_search_engine(self):
+        rows = make_rows(500)
+        engine = SearchEngine(rows)
+        searcher = IncrementalSearch(rows, block_size=64)
+        # each query extends the previous one, so most of them are narrowed to the previous hits
+        for query in ("r", "re", "rep", "repo", "a", "a ", "a b", "a\n", "a\nb", "", "n", "no", "notes1"):
+            with self.subTest(query=query):
+                self.assertEqual(searcher.search(query), engine.search_indices(query) if query else list(range(500)))
+
+    def test_cancelled_search(self):
+        index = SubstringIndex(make_rows(100), block_size=10)
+        self.assertIsNone(index.search("report", lambda: True))
+
+
+class IndexBuildTests(TestCase):
+    def test_cancelled_build_resumes(self):
+        rows = make_rows(100)
+        checks = []
+
+        def cancelled() -> bool:
+            checks.append(None)
+            return len(checks) > 3
+
+        index = SubstringIndex(rows, block_size=10, cancelled=cancelled)
+        self.assertFalse(index.built)
+        self.assertEqual(len(index.blocks), 3)
+        self.assertTrue(index.build())
+        self.assertTrue(index.built)
+        self.assertEqual(index.search("report"), SubstringIndex(rows, block_size=10).search("report"))
+
+    def test_superseded_query_stops_the_build(self):
+        rows = make_rows(100)
+        searcher = IncrementalSearch(rows, block_size=10)
+        generation = searcher.next_generation()
+        # a newer query started before this one ran
+        searcher.next_generation()
+        self.assertIsNone(searcher.search("report", generation))
+        self.assertFalse(searcher.ready)
+        self.assertEqual(searcher.search("report"), SearchEngine(rows).search_indices("report"))
+        self.assertTrue(searcher.ready)
+
+    def test_empty_query_does_not_build(self):
+        searcher = IncrementalSearch(make_rows(10))
+        self.assertEqual(searcher.search(""), list(range(10)))
+        self.assertFalse(searcher.ready)
+
+
+class PrefixIndexTests(TestCase):
+    def test_matches_and_complete(self):
+        rows = [{"name": "Report.pdf"}, {"name": "report.txt"}, {"name": "notes"}, {}, {"name": "Report.pdf"}]
+        names = PrefixIndex(rows)
+        self.assertEqual(names.matches("REP"), [0, 1, 4])
+        self.assertEqual(names.complete("rep"), ["Report.pdf", "report.txt"])
+        self.assertEqual(names.complete("rep", limit=1), ["Report.pdf"])
+        self.assertEqual(names.complete(""), [])
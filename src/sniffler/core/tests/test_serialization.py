@@ -0,0 +1,109 @@
+import random
+import tempfile
+from pathlib import Path, PurePosixPath
+from unittest import TestCase
+
+from ..serialization import MISSING, PackedCollection, pack_collection, read_packed, unpack_collection, write_packed
+
+
+def sample_rows() -> list[dict]:
+    rng = random.Random(5)
+    rows = []
+    for i in range(200):
+        row = {
+            "path": Path(f"dir{i % 9}/file{i}.txt"),
+            "name": f"file{i}.txt",
+            "size": rng.randrange(1 << 40),
+            "modified": rng.random() * 1e9,
+        }
+        if i % 3 == 0:
+            row["title"] = rng.choice(["Report", "Notes", "", "Zürich \ud800 surrogate", "nul\0inside"])
+        if i % 5 == 0:
+            row["width"] = rng.randrange(4000)
+        rows.append(row)
+    return rows
+
+
+class PackRoundTripTests(TestCase):
+    def assert_round_trip(self, rows: list[dict], **kwargs):
+        unpacked = unpack_collection(pack_collection(rows, **kwargs))
+        self.assertEqual(list(unpacked), rows)
+        return unpacked
+
+    def test_codecs(self):
+        rows = sample_rows()
+        for codec in ("none", "zlib", "lzma"):
+            with self.subTest(codec=codec):
+                self.assert_round_trip(rows, codec=codec)
+
+    def test_mixed_types(self):
+        rows = [
+            {"value": 1},
+            {"value": 1.5},
+            {"value": "text"},
+            {"value": None},
+            {"value": True},
+            {"value": False},
+            {"value": Path("a/b")},
+            {"value": 1 << 70},
+            {"value": -(1 << 70)},
+            {"value": ["a", 1]},
+            {"value": {"nested": 2}},
+            {},
+        ]
+        unpacked = self.assert_round_trip(rows)
+        self.assertIs(type(unpacked[4]["value"]), bool)
+        self.assertIsInstance(unpacked[6]["value"], Path)
+
+    def test_big_ints_in_an_int_column(self):
+        self.assert_round_trip([{"size": 1}, {"size": 1 << 64}, {"size": -5}])
+
+    def test_paths(self):
+        rows = [{"path": PurePosixPath("a/b.txt")}, {"path": Path("c")}]
+        self.assertEqual(PackedCollection(pack_collection(rows), str).column("path"), ["a/b.txt", "c"])
+
+    def test_empty(self):
+        self.assertEqual(list(unpack_collection(pack_collection([]))), [])
+        self.assertEqual(list(unpack_collection(pack_collection([{}, {}]))), [{}, {}])
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            PackedCollection(b"nope")
+        with self.assertRaises(ValueError):
+            PackedCollection(b"XXXX" + pack_collection([{"a": 1}])[4:])
+
+
+class PackedCollectionTests(TestCase):
+    def setUp(self):
+        self.rows = sample_rows()
+        self.packed = PackedCollection(pack_collection(self.rows))
+
+    def test_columns(self):
+        self.assertEqual(self.packed.columns, ["path", "name", "size", "modified", "title", "width"])
+        self.assertEqual(len(self.packed), len(self.rows))
+
+    def test_column_with_missing_values(self):
+        self.assertEqual(self.packed.column("width"), [row.get("width", MISSING) for row in self.rows])
+        with self.assertRaises(KeyError):
+            self.packed.column("unknown")
+
+    def test_column_subset(self):
+        expected = [{key: row[key] for key in ("size", "width") if key in row} for row in self.rows]
+        self.assertEqual(self.packed.rows(["size", "width", "unknown"]), expected)
+        # only the requested columns were decoded
+        self.assertEqual(set(self.packed._decoded), {"size", "width"})
+
+    def test_sparse_columns_only(self):
+        self.assertEqual(
+            self.packed.rows(["width"]), [{"width": row["width"]} if "width" in row else {} for row in self.rows]
+        )
+
+
+class PackedFileTests(TestCase):
+    def test_write_and_read(self):
+        rows = sample_rows()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = Path(tmp_dir) / "scan.sniff"
+            self.assertEqual(write_packed(filename, iter(rows), codec="lzma"), len(rows))
+            self.assertEqual(read_packed(filename).rows(), rows)
+            self.assertEqual(read_packed(filename, str).column("path"), [str(row["path"]) for row in rows])
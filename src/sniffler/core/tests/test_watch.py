@@ -0,0 +1,125 @@
+import re
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase, skipUnless
+
+from ..collector import Collector, Explorer
+from ..search import SearchEngine
+from ..stats import to_number
+from ..watch import Changes, InotifyWatcher, LiveCollection, PollingWatcher
+from ...researchers import BasicResearcher
+
+
+class LiveCollectionTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name).resolve()
+        for i in range(6):
+            self.write(f"dir{i % 2}/file{i}.txt", "x" * (i + 1))
+        self.collector = Collector(self.root, [BasicResearcher()])
+        self.collector.collect()
+        self.live = LiveCollection(self.collector, PollingWatcher(self.collector.explorer, interval=0.01))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relpath: str, text: str) -> Path:
+        path = self.root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def assert_consistent(self):
+        live = self.live
+        fresh = Collector(self.root, [BasicResearcher()])
+        fresh.collect()
+        expected = {row["path"]: to_number(row["size"]) for row in fresh.collection}
+        self.assertEqual({row["path"]: to_number(row["size"]) for row in live.collection}, expected)
+        # every row can be found at the position recorded for its path
+        self.assertEqual(live._positions, {row["path"]: idx for idx, row in enumerate(live.collection)})
+        # the patched index answers like one built from scratch
+        rebuilt = SearchEngine(live.collection)
+        for word in {w for row in live.collection for value in row.values() for w in re.findall(r"\w+", str(value))}:
+            self.assertEqual(live.search_engine.index.get(word.lower()), rebuilt.index.get(word.lower()), word)
+        self.assertEqual(live.stats.total_files(), len(expected))
+        self.assertEqual(live.stats.total_size(), sum(expected.values()))
+        largest = [row["path"] for row in live.stats.top_n_largest_files(3)]
+        self.assertEqual(largest, [path for path, _ in sorted(expected.items(), key=lambda item: -item[1])[:3]])
+
+    def test_add_modify_remove(self):
+        added = self.write("dir2/new.txt", "y" * 100)
+        update = self.live.apply(Changes({added}, set()))
+        self.assertEqual(tuple(update), (1, 0, 0))
+        self.assert_consistent()
+
+        modified = self.write("dir0/file0.txt", "z" * 50)
+        self.assertEqual(tuple(self.live.apply(Changes({modified}, set()))), (0, 1, 0))
+        self.assert_consistent()
+
+        # the added file is the last and largest row, the others sit in the middle and get the last rows swapped in
+        self.assertEqual(self.live.collection[-1]["path"], Path("dir2/new.txt"))
+        removed = {added, self.root / "dir1/file3.txt", self.root / "dir0/file4.txt"}
+        for path in removed:
+            path.unlink()
+        self.assertEqual(tuple(self.live.apply(Changes(set(), removed))), (0, 0, 3))
+        self.assert_consistent()
+
+    def test_file_removed_before_research(self):
+        ghost = self.root / "dir0/file2.txt"
+        ghost.unlink()
+        self.assertEqual(tuple(self.live.apply(Changes({ghost}, set()))), (0, 0, 1))
+        self.assert_consistent()
+
+    def test_remove_every_row(self):
+        files = {self.root / str(row["path"]) for row in self.live.collection}
+        for path in files:
+            path.unlink()
+        self.live.apply(Changes(set(), files))
+        self.assertEqual(len(self.live.collection), 0)
+        self.assertEqual(self.live._positions, {})
+        self.assertEqual(self.live.stats.total_files(), 0)
+
+
+class WatcherTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name).resolve()
+        (self.root / "sub").mkdir()
+        self.kept = self.root / "kept.txt"
+        self.kept.write_text("a")
+        self.doomed = self.root / "sub" / "doomed.txt"
+        self.doomed.write_text("b")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def next_changes(self, watcher) -> Changes:
+        stop = threading.Event()
+        # never hang the suite if no change is reported
+        timer = threading.Timer(10, stop.set)
+        timer.start()
+        try:
+            return next(watcher.changes(stop), Changes(set(), set()))
+        finally:
+            timer.cancel()
+            watcher.close()
+
+    def change_tree(self) -> Path:
+        added = self.root / "sub" / "added.txt"
+        added.write_text("c")
+        self.kept.write_text("longer")
+        self.doomed.unlink()
+        return added
+
+    def test_polling_watcher(self):
+        watcher = PollingWatcher(Explorer(self.root), interval=0.01)
+        added = self.change_tree()
+        self.assertEqual(self.next_changes(watcher), Changes({added, self.kept}, {self.doomed}))
+
+    @skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_watcher(self):
+        watcher = InotifyWatcher(Explorer(self.root), debounce=0.05)
+        added = self.change_tree()
+        self.assertEqual(self.next_changes(watcher), Changes({added, self.kept}, {self.doomed}))
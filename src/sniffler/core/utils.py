@@ -1,11 +1,15 @@
 import math
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from datetime import datetime
 from functools import update_wrapper
-from typing import ParamSpec, TypeVar
+from typing import Any, ParamSpec, TypeVar
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
+DEFAULT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMESTAMP_FIELDS = frozenset({"modified", "created"})
+
 
 def inherit_signature_from(original: Callable[P, T]) -> Callable[[Callable], Callable[P, T]]:
     """Set the signature of one function to the signature of another."""
@@ -40,3 +44,42 @@ def convert_size(size_bytes: int | float) -> str:
     p = math.pow(1024, i)
     s = round(size_bytes / p, 2)
     return f"{s} {size_name[i]}"
+
+
+def format_timestamp(timestamp: int | float | None, time_format: str = DEFAULT_TIME_FORMAT) -> str | None:
+    """
+    Format an epoch timestamp as a local time string.
+
+    Args:
+        timestamp (int | float | None): Seconds since the epoch, None is passed through.
+        time_format (str, optional): A ``strftime`` format string. Defaults to DEFAULT_TIME_FORMAT.
+
+    Returns:
+        str | None: The formatted timestamp, or None if no timestamp was given.
+
+    Examples:
+        >>> format_timestamp(None) is None
+        True
+    """
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).strftime(time_format)
+
+
+def format_timestamps(row: Mapping[str, Any], time_format: str = DEFAULT_TIME_FORMAT) -> dict[str, Any]:
+    """
+    Format the epoch timestamp fields (see TIMESTAMP_FIELDS) of a row, leaving all other values untouched.
+
+    Args:
+        row (Mapping[str, Any]): A collected row.
+        time_format (str, optional): A ``strftime`` format string. Defaults to DEFAULT_TIME_FORMAT.
+
+    Returns:
+        dict[str, Any]: A new dictionary with formatted timestamps.
+    """
+    formatted = dict(row)
+    for key in TIMESTAMP_FIELDS.intersection(row):
+        value = row[key]
+        if isinstance(value, int | float):
+            formatted[key] = format_timestamp(value, time_format)
+    return formatted
@@ -0,0 +1,492 @@
+import abc
+import ctypes
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .collector import Collector, Explorer, RuleSet
+from .search import SearchEngine
+from .stats import StatAccumulator
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_ONLYDIR
+    | IN_EXCL_UNLINK
+)
+_EVENT = struct.Struct("iIII")
+
+
+class Changes(NamedTuple):
+    """
+    A coalesced batch of file system changes, as absolute paths.
+    """
+
+    changed: set[Path]
+    removed: set[Path]
+
+
+class Update(NamedTuple):
+    """
+    The number of rows patched into a LiveCollection for one batch of changes.
+    """
+
+    added: int
+    modified: int
+    removed: int
+
+
+class Watcher(abc.ABC):
+    """
+    Base class for watchers, which report changes to the files an Explorer would yield.
+    """
+
+    def __init__(self, explorer: Explorer) -> None:
+        self.explorer = explorer
+
+    @abc.abstractmethod
+    def changes(self, stop: threading.Event | None = None) -> Generator[Changes, Any, None]:
+        """
+        Waits for changes and yields them in batches, until ``stop`` is set.
+
+        Args:
+            stop (threading.Event | None, optional): Ends the generator when set. Defaults to None (never).
+
+        Yields:
+            Generator[Changes, Any, None]: The changed (created or modified) and removed files.
+        """
+
+    def close(self) -> None:  # noqa: B027, a watcher without resources has nothing to close
+        pass
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class PollingWatcher(Watcher):
+    """
+    Portable watcher that walks the tree every ``interval`` seconds and compares modification times and sizes.
+    All changes between two polls are reported as one batch.
+    """
+
+    def __init__(self, explorer: Explorer, interval: float = 2.0) -> None:
+        """
+        Takes the initial snapshot of the tree.
+
+        Args:
+            explorer (Explorer): The Explorer defining the watched files.
+            interval (float, optional): The number of seconds between polls. Defaults to 2.0.
+        """
+        super().__init__(explorer)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for file in self.explorer.files():
+            try:
+                st = os.stat(file)
+            except OSError:
+                continue
+            snapshot[file] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def changes(self, stop: threading.Event | None = None) -> Generator[Changes, Any, None]:
+        stop = stop or threading.Event()
+        while not stop.wait(self.interval):
+            previous, self._snapshot = self._snapshot, self._take_snapshot()
+            changed = {file for file, signature in self._snapshot.items() if previous.get(file) != signature}
+            removed = previous.keys() - self._snapshot.keys()
+            if changed or removed:
+                yield Changes(changed, set(removed))
+
+
+class _WatchedDir:
+    __slots__ = ("wd", "relpath", "depth", "rules", "dir_id", "files", "subdirs")
+
+    def __init__(
+        self,
+        wd: int,
+        relpath: str,
+        depth: int,
+        rules: tuple[RuleSet, ...],
+        dir_id: tuple[int, int] | None,
+        files: set[str],
+        subdirs: set[str],
+    ) -> None:
+        self.wd = wd
+        self.relpath = relpath
+        self.depth = depth
+        self.rules = rules
+        self.dir_id = dir_id
+        self.files = files
+        self.subdirs = subdirs
+
+
+class InotifyWatcher(Watcher):
+    """
+    Linux watcher based on inotify, with one watch per directory.
+
+    Events are coalesced per directory: once events arrive, the watcher keeps reading until there has been no event
+    for ``debounce`` seconds (or for at most ``max_delay`` seconds), then lists every touched directory once, with
+    the Explorer's filters, and reports the difference. A burst of writes to a file therefore yields a single change.
+    If the kernel event queue overflows, the whole tree is resynchronized.
+    """
+
+    def __init__(self, explorer: Explorer, debounce: float = 0.5, max_delay: float = 5.0) -> None:
+        """
+        Watches every directory the Explorer would descend into.
+
+        Args:
+            explorer (Explorer): The Explorer defining the watched files.
+            debounce (float, optional): The quiet period in seconds that ends a batch. Defaults to 0.5.
+            max_delay (float, optional): The maximum age in seconds of a batch under continuous events.
+                Defaults to 5.0.
+
+        Raises:
+            OSError: If inotify is not available or the watch limit is exceeded.
+        """
+        super().__init__(explorer)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            init = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+            self._rm_watch = libc.inotify_rm_watch
+        except (OSError, AttributeError) as e:
+            raise OSError(errno.ENOSYS, "inotify is not available") from e
+        init.argtypes = [ctypes.c_int]
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+
+        root = str(explorer.path)
+        self._dirs: dict[str, _WatchedDir] = {}
+        self._wds: dict[int, str] = {}
+        self._root_dev = os.stat(root).st_dev if explorer.one_file_system else None
+        self._visited: set[tuple[int, int]] | None = set() if explorer.follow_symlinks else None
+        try:
+            self._walk(root, "", 0, explorer.root_rules)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, dirpath: str) -> int | None:
+        wd = self._add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached, raise fs.inotify.max_user_watches or use polling")
+            return None  # the directory is gone or not readable
+        return wd
+
+    def _walk(self, dirpath: str, relpath: str, depth: int, rules: tuple[RuleSet, ...]) -> list[str]:
+        """
+        Watches and registers a directory tree, returns the files in it.
+        """
+        found: list[str] = []
+        stack = [(dirpath, relpath, depth, rules)]
+        while stack:
+            path, relpath, depth, rules = stack.pop()
+            if path in self._dirs:
+                continue
+            # watch before listing, so files created in between are not missed
+            wd = self._watch(path)
+            if wd is None:
+                continue
+            dir_id = None
+            if self._visited is not None:
+                try:
+                    dir_id = self.explorer.dir_id(path)
+                except OSError:
+                    continue
+                self._visited.add(dir_id)
+            files, subdirs = self.explorer.list_dir(path, relpath, depth, rules, self._root_dev, self._visited)
+            self._dirs[path] = _WatchedDir(wd, relpath, depth, rules, dir_id, set(files), {s[0] for s in subdirs})
+            self._wds[wd] = path
+            found += files
+            stack.extend(subdirs)
+        return found
+
+    def _drop(self, dirpath: str) -> set[str]:
+        """
+        Unwatches and unregisters a directory tree, returns the files that were in it.
+        """
+        removed: set[str] = set()
+        stack = [dirpath]
+        while stack:
+            state = self._dirs.pop(stack.pop(), None)
+            if state is None:
+                continue
+            removed |= state.files
+            stack.extend(state.subdirs)
+            if self._wds.pop(state.wd, None) is not None:
+                self._rm_watch(self.fd, state.wd)
+            if self._visited is not None and state.dir_id is not None:
+                self._visited.discard(state.dir_id)
+        return removed
+
+    def _resync(self, dirpath: str, all_changed: bool = False) -> tuple[set[str], set[str]]:
+        """
+        Walks a directory tree again, e.g. after its ignore rules changed.
+
+        Returns:
+            tuple[set[str], set[str]]: The changed files (only newly included ones unless ``all_changed``)
+            and the removed files.
+        """
+        state = self._dirs[dirpath]
+        old = self._drop(dirpath)
+        new = set(self._walk(dirpath, state.relpath, state.depth, state.rules))
+        return (new if all_changed else new - old), old - new
+
+    def _process(self, pending: dict[str, set[str]]) -> Changes:
+        changed: set[str] = set()
+        removed: set[str] = set()
+        for dirpath, names in pending.items():
+            state = self._dirs.get(dirpath)
+            if state is None:
+                continue  # removed along with a parent directory in this batch
+            touched = {os.path.join(dirpath, name) for name in names}
+            if not names.isdisjoint(self.explorer.ignore_file_names):
+                # the rules of the whole subtree changed
+                resync_changed, resync_removed = self._resync(dirpath)
+                changed |= resync_changed
+                removed |= resync_removed
+                if dirpath in self._dirs:
+                    changed |= touched & self._dirs[dirpath].files
+                continue
+
+            files, subdirs = self.explorer.list_dir(
+                dirpath, state.relpath, state.depth, state.rules, self._root_dev, self._visited
+            )
+            listed = set(files)
+            removed |= state.files - listed
+            changed |= (listed - state.files) | (listed & touched)
+            state.files = listed
+
+            for subdir in state.subdirs & touched:
+                if not os.path.isdir(subdir):
+                    removed |= self._drop(subdir)
+                    state.subdirs.discard(subdir)
+            for subdir in subdirs:
+                if subdir[0] not in self._dirs:
+                    changed.update(self._walk(*subdir))
+                    state.subdirs.add(subdir[0])
+        removed -= changed
+        return Changes({Path(f) for f in changed}, {Path(f) for f in removed})
+
+    def _read_events(self) -> Generator[tuple[int, int, str], Any, None]:
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            yield wd, mask, os.fsdecode(name)
+
+    def _queue_events(self, pending: dict[str, set[str]]) -> bool:
+        """
+        Adds the names of the available events to ``pending`` by directory, returns whether the event queue overflowed.
+        """
+        overflow = False
+        for wd, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif mask & IN_IGNORED:
+                self._wds.pop(wd, None)
+            elif name and wd in self._wds:
+                pending.setdefault(self._wds[wd], set()).add(name)
+        return overflow
+
+    def _batch(self, pending: dict[str, set[str]], overflow: bool) -> Changes:
+        if overflow:
+            changed, removed = self._resync(str(self.explorer.path), all_changed=True)
+            return Changes({Path(f) for f in changed}, {Path(f) for f in removed})
+        return self._process(pending)
+
+    def changes(self, stop: threading.Event | None = None) -> Generator[Changes, Any, None]:
+        stop = stop or threading.Event()
+        pending: dict[str, set[str]] = {}
+        overflow = False
+        first_event: float | None = None
+        while not stop.is_set():
+            if first_event is None:
+                timeout = 0.5
+            else:
+                timeout = max(0.0, min(self.debounce, first_event + self.max_delay - time.monotonic()))
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if ready:
+                overflow |= self._queue_events(pending)
+                if first_event is None and (pending or overflow):
+                    first_event = time.monotonic()
+                if first_event is None or time.monotonic() - first_event < self.max_delay:
+                    continue
+            if first_event is None:
+                continue
+
+            batch = self._batch(pending, overflow)
+            pending = {}
+            overflow = False
+            first_event = None
+            if batch.changed or batch.removed:
+                yield batch
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(
+    explorer: Explorer,
+    poll: bool = False,
+    interval: float = 2.0,
+    debounce: float = 0.5,
+) -> Watcher:
+    """
+    Creates an inotify watcher on Linux, and a polling watcher elsewhere or if inotify fails.
+
+    Args:
+        explorer (Explorer): The Explorer defining the watched files.
+        poll (bool, optional): If True, always polls. Defaults to False.
+        interval (float, optional): The number of seconds between polls. Defaults to 2.0.
+        debounce (float, optional): The quiet period in seconds that ends an inotify batch. Defaults to 0.5.
+
+    Returns:
+        Watcher: The watcher.
+    """
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(explorer, debounce=debounce)
+        except OSError as e:
+            logger.warning(f"Cannot use inotify ({e}), falling back to polling.")
+    return PollingWatcher(explorer, interval=interval)
+
+
+class LiveCollection:
+    """
+    Keeps the collection of a Collector, a search index and statistics up to date with changes on disk.
+
+    Only changed files are researched again, and each change is patched into the collection, the SearchEngine
+    index and the StatAccumulator in place. Removed rows are swapped with the last row, so the order of the
+    collection is not preserved.
+    """
+
+    def __init__(self, collector: Collector, watcher: Watcher) -> None:
+        """
+        Indexes the current collection of the collector.
+
+        Args:
+            collector (Collector): The collector, after its initial collection.
+            watcher (Watcher): The watcher, created before the initial collection so no change is missed.
+
+        Attributes:
+            collection (Collection): The live collection, the same object as ``collector.collection``.
+            search_engine (SearchEngine): The live search index.
+            stats (StatAccumulator): The live statistics.
+            lock (threading.Lock): Held while a batch is applied, for readers in other threads.
+        """
+        self.collector = collector
+        self.watcher = watcher
+        self.collection = collector.collection
+        self.search_engine = SearchEngine(self.collection)
+        self.stats = StatAccumulator()
+        self.stats.update(self.collection)
+        self.lock = threading.Lock()
+        self._positions = {Path(row["path"]): idx for idx, row in enumerate(self.collection)}  # type: ignore
+
+    def apply(self, changes: Changes) -> Update:
+        """
+        Researches changed files and patches the collection, index and statistics.
+
+        Args:
+            changes (Changes): A batch of changes from the watcher.
+
+        Returns:
+            Update: The number of added, modified and removed rows.
+        """
+        root = self.collector.path
+        added = modified = removed = 0
+        refill = False
+        with self.lock:
+            gone = set(changes.removed)
+            for file in sorted(changes.changed):
+                if not file.is_file():
+                    gone.add(file)  # removed again before it could be researched
+                    continue
+                relpath = file.relative_to(root)
+                row = self.collector.research(file, relpath)
+                idx = self._positions.get(relpath)
+                if idx is None:
+                    self._positions[relpath] = self.search_engine.add(row)
+                    added += 1
+                else:
+                    refill |= self.stats.remove(self.collection[idx])
+                    self.search_engine.replace(idx, row)
+                    modified += 1
+                self.stats.add(row)
+
+            for file in gone:
+                idx = self._positions.pop(file.relative_to(root), None)
+                if idx is None:
+                    continue
+                refill |= self.stats.remove(self.collection[idx])
+                if self.search_engine.remove(idx) is not None:
+                    self._positions[Path(self.collection[idx]["path"])] = idx  # type: ignore
+                removed += 1
+
+            if refill:
+                self.stats.refill_largest(self.collection)
+        return Update(added, modified, removed)
+
+    def updates(self, stop: threading.Event | None = None) -> Generator[Update, Any, None]:
+        """
+        Applies batches of changes as they are reported by the watcher, until ``stop`` is set.
+
+        Args:
+            stop (threading.Event | None, optional): Ends the generator when set. Defaults to None (never).
+
+        Yields:
+            Generator[Update, Any, None]: The result of every applied batch.
+        """
+        for changes in self.watcher.changes(stop):
+            yield self.apply(changes)
@@ -1,3 +1,4 @@
+import contextlib
 import logging
 import sys
 import threading
@@ -11,19 +12,16 @@ import customtkinter as ctk
 
 from .core.collector import Collection, Collector
 from .core.csv_writer import write_csv
-from .core.search import SearchEngine
+from .core.enrichment import ENRICH_ORDERS, Enricher, split_researchers
+from .core.progress import ProgressUpdate, ThroughputMeter
+from .core.rollup import DirectoryNode, DirectoryRollup
+from .core.search import IncrementalSearch
 from .core.stats import StatCalculator
+from .core.table import TableModel
 from .core.utils import convert_size
-from .gui_components import AutoHidingScrollableFrame, CTkTqdm
-from .researchers import (
-    AudioResearcher,
-    BasicResearcher,
-    ImageResearcher,
-    LegacyOfficeResearcher,
-    ModernOfficeResearcher,
-    PdfResearcher,
-    Researcher,
-)
+from .core.watch import LiveCollection, Watcher, create_watcher
+from .gui_components import AutoHidingScrollableFrame, MainLoopDispatcher, VirtualTable
+from .researchers import Researcher, registry
 
 ICON_PATH = Path(__file__).parent / "assets" / "sniffler.png"
 
@@ -66,6 +64,9 @@ class ChoosePath(ctk.CTkFrame):
 
 
 class CollectTab(ctk.CTkFrame):
+    # the number of times per second progress is redrawn, however fast files are researched
+    FPS = 30
+
     def __init__(
         self,
         master,
@@ -79,6 +80,7 @@ class CollectTab(ctk.CTkFrame):
         self.callback = callback
 
         self.grid_columnconfigure((0, 1), weight=1)
+        self.grid_rowconfigure(0, weight=1)
 
         self.source = ChoosePath(self, Path("."), title="Choose a directory to sniff", button_text="Browse")
         self.source.grid(row=0, column=0, columnspan=2, pady=(20, 0), padx=20, sticky="ew")
@@ -86,6 +88,21 @@ class CollectTab(ctk.CTkFrame):
         self.target = ChoosePath(self, Path("."), title="Choose output directory", button_text="Browse")
         self.target.grid(row=2, column=0, columnspan=2, pady=(0, 20), padx=20, sticky="ew")
 
+        self.options = ctk.CTkFrame(self, fg_color="transparent")
+        self.options.grid(row=1, column=0, columnspan=2, pady=(0, 10), padx=20, sticky="ew")
+        self.two_phase_checkbox = ctk.CTkCheckBox(self.options, text="Basic results first, details in background")
+        self.two_phase_checkbox.grid(row=0, column=0, padx=(0, 10), sticky="w")
+        self.two_phase_checkbox.select()
+        self.order_menu = ctk.CTkOptionMenu(self.options, values=list(ENRICH_ORDERS), width=110)
+        self.order_menu.grid(row=0, column=1, padx=(0, 10), sticky="w")
+        self.order_menu.set("smallest")
+        self.watch_checkbox = ctk.CTkCheckBox(self.options, text="Keep watching for changes")
+        self.watch_checkbox.grid(row=0, column=2, sticky="w")
+
+        self.stop_event = threading.Event()
+        self.live: LiveCollection | None = None
+        self.enricher: Enricher | None = None
+
         self.start_button = ctk.CTkButton(self, text="Start", height=40, command=self.start_collection)
         self.start_button.grid(row=3, column=0, columnspan=2, pady=(0, 20), padx=20, sticky="ew")
 
@@ -94,115 +111,409 @@ class CollectTab(ctk.CTkFrame):
         self.progress_bar.set(0)
 
         self.status_label = ctk.CTkLabel(self, text="Ready for sniffling", font=ctk.CTkFont(size=10))
-        self.status_label.grid(row=5, column=0, columnspan=2, pady=(0, 10))
+        self.status_label.grid(row=5, column=0, columnspan=2, pady=(0, 0))
+
+        self.rate_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=10))
+        self.rate_label.grid(row=6, column=0, columnspan=2, pady=(0, 10))
+
+        # the collection runs in a worker thread, which must not touch the widgets: it posts its updates here
+        self.dispatcher = MainLoopDispatcher(self, fps=self.FPS)
+        self.dispatcher.start()
+
+    def set_status(self, text: str) -> None:
+        self.status_label.configure(text=text)
+
+    def set_button(self, text: str, command: Callable[[], None], state: str = "normal") -> None:
+        self.start_button.configure(text=text, command=command, state=state)
+
+    def show_progress(self, update: ProgressUpdate) -> None:
+        """
+        Shows a snapshot of the running collection, on the main loop.
+        """
+        if update.fraction is not None:
+            self.progress_bar.set(update.fraction)
+        of_total = f" of {update.total:,}" if update.total is not None else ""
+        self.set_status(f"Sniffling: {update.files:,}{of_total} files, {convert_size(update.size)}")
+        extensions = ", ".join(f"{ext} {count:,}" for ext, count in update.extensions)
+        self.rate_label.configure(
+            text=(
+                f"{update.files_per_sec:,.0f} files/s, {convert_size(update.bytes_per_sec)}/s"
+                + (f"  |  {extensions}" if extensions else "")
+            )
+        )
 
     def start_collection(self) -> None:
         logger.info("Starting collection...")
-        self.start_button.configure(state="disabled")
-        self.status_label.configure(text="Sniffling...")
+        self.set_button("Cancel", self.stop_event.set)
+        self.set_status("Counting files...")
+        self.rate_label.configure(text="")
+        self.progress_bar.set(0)
         researchers = [researcher() for researcher in self.researchers]
-        pbar = partial(CTkTqdm, progressbar=self.progress_bar)
+        watch = bool(self.watch_checkbox.get())
+        two_phase = bool(self.two_phase_checkbox.get())
+        order = self.order_menu.get()
+        self.stop_event.clear()
+        post = self.dispatcher.post
 
         def task():
             collector = None
-            time_start = time.time()
+            watcher = None
+            expensive: list[Researcher] = []
+            meter = ThroughputMeter(partial(post, "progress", self.show_progress), interval=1 / self.FPS)
+            final = None
             try:
-                collector = Collector(self.source.path, researchers, progress_bar=pbar)
-                collector.collect(show_progress=True)
+                first_pass = researchers
+                if two_phase:
+                    first_pass, expensive = split_researchers(researchers)
+                collector = Collector(self.source.path, first_pass, progress_bar=meter.track)
+                if watch:
+                    watcher = create_watcher(collector.explorer)
+                meter.update(collector.iter_collect(show_progress=True, stop=self.stop_event))
+                final = meter.finish()
             except Exception as e:
                 logger.exception(e)
-                self.status_label.configure(text="An error occurred, please check the logs.")
-            time_complete = time.time() - time_start
-
-            if collector and collector.collection:
-                self.progress_bar.set(1)
-                logger.info("Collection finished.")
-                self.collection = collector.collection
-                write_csv(
-                    self.target.path.joinpath("out.csv"),
-                    collector.collection.keys,
-                    collector.collection,
-                    delimiter=";",
-                )
-                logger.info("CSV saved.")
-                self.start_button.configure(state="normal")
-                self.status_label.configure(
-                    text=f"Sniffling complete in {time_complete:.2f}s, output saved to 'out.csv' in the target directory."
-                )
-                if self.callback is not None:
-                    self.callback()
+                post("status", self.set_status, "An error occurred, please check the logs.")
+            cancelled = self.stop_event.is_set()
+
+            if collector and collector.collection and final is not None:
+                self.report_collection(collector, final, cancelled)
+                if expensive and not cancelled:
+                    self.enrich(collector, expensive, order)
+                    collector.researchers = researchers
+                if watcher is not None and not self.stop_event.is_set():
+                    self.watch(collector, watcher)
+                    watcher = None
+            elif final is not None:
+                post("status", self.set_status, "Cancelled." if cancelled else "No files found.")
+            if watcher is not None:
+                watcher.close()
+            post("button", self.set_button, "Start", self.start_collection)
 
         threading.Thread(target=task).start()
 
+    def report_collection(self, collector: Collector, final: ProgressUpdate, cancelled: bool) -> None:
+        """
+        Saves a finished or cancelled collection and shows its summary. Runs in the collection thread.
+        """
+        post = self.dispatcher.post
+        logger.info("Collection cancelled." if cancelled else "Collection finished.")
+        self.collection = collector.collection
+        self.write_output(collector.collection)
+        logger.info("CSV saved.")
+        done = "Cancelled after" if cancelled else "Sniffling complete:"
+        errors = collector.errors
+        for researcher, error_type, count in errors.summary():
+            logger.warning(f"{researcher} failed on {count} files with {error_type}.")
+        failed = f", {errors.total:,} research errors (see the log)" if errors.total else ""
+        post("bar", self.progress_bar.set, (final.fraction or 0) if cancelled else 1)
+        post(
+            "status",
+            self.set_status,
+            f"{done} {final.files:,} files in {final.elapsed:.2f}s{failed}, "
+            "output saved to 'out.csv' in the target directory.",
+        )
+        post(
+            "rate",
+            self.rate_label.configure,
+            f"{final.files / final.elapsed if final.elapsed else 0:,.0f} files/s on average",
+        )
+        post("refresh", self.refresh_tabs)
+
+    def write_output(self, collection: Collection) -> None:
+        write_csv(
+            self.target.path.joinpath("out.csv"),
+            collection.keys,
+            collection,
+            delimiter=";",
+        )
+
+    def enrich(self, collector: Collector, researchers: list[Researcher], order: str) -> None:
+        """
+        Runs the expensive researchers after the basic pass, then refreshes the views. Runs in the collection thread.
+
+        Until enrichment is done, the views keep showing the basic pass: rebuilding the stats and the search index
+        on the Tk thread while holding the enricher's lock would stall both the UI and the enrichment.
+        """
+        post = self.dispatcher.post
+        self.enricher = enricher = Enricher(collector, researchers, order=order)
+        post("button", self.set_button, "Stop", self.stop_event.set)
+        time_start = time.time()
+        try:
+            for _ in enricher.enrich(self.stop_event):
+                post("bar", self.progress_bar.set, enricher.done / enricher.total)
+                post("status", self.set_status, f"Adding details: {enricher.done} of {enricher.total} files...")
+        except Exception as e:
+            logger.exception(e)
+        post("bar", self.progress_bar.set, 1)
+        with enricher.lock:
+            self.write_output(collector.collection)
+        post(
+            "status",
+            self.set_status,
+            (
+                f"Added details to {enricher.done} of {enricher.total} files in {time.time() - time_start:.2f}s, "
+                "output saved to 'out.csv' in the target directory."
+            ),
+        )
+        post("refresh", self.refresh_tabs)
+        self.enricher = None
+
+    def watch(self, collector: Collector, watcher: Watcher) -> None:
+        """
+        Keeps the collection and the output up to date until stopped, runs in the collection thread.
+        """
+        post = self.dispatcher.post
+        self.live = LiveCollection(collector, watcher)
+        self.stop_event.clear()
+        post("button", self.set_button, "Stop watching", self.stop_event.set)
+        try:
+            for update in self.live.updates(self.stop_event):
+                with self.live.lock:
+                    self.write_output(self.live.collection)
+                post(
+                    "status",
+                    self.set_status,
+                    (
+                        f"Watching: +{update.added} ~{update.modified} -{update.removed}, "
+                        f"{self.live.stats.total_files()} files, output updated."
+                    ),
+                )
+                post("refresh", self.refresh_tabs)
+        except Exception as e:
+            logger.exception(e)
+            post("status", self.set_status, "Watching stopped with an error, please check the logs.")
+        finally:
+            watcher.close()
+            self.live = None
+
+    def refresh_tabs(self) -> None:
+        if self.callback is None:
+            return
+        if self.live is not None:
+            lock = self.live.lock
+        elif self.enricher is not None:
+            lock = self.enricher.lock
+        else:
+            lock = contextlib.nullcontext()
+        with lock:
+            self.callback()
+
 
 class StatsTab(ctk.CTkFrame):
     def __init__(self, master, collection: Collection | None = None, **kwargs):
         super().__init__(master, **kwargs)
+        self.grid_columnconfigure(0, weight=1)
         if collection is None:
+            self.grid_rowconfigure(0, weight=1)
             self.label = ctk.CTkLabel(self, text="No files are sniffled yet.")
             self.label.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
             return
 
         self.stats = StatCalculator(collection)
 
-        self.textbox = ctk.CTkTextbox(self, font=ctk.CTkFont(size=12), height=300)
-        self.textbox.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
+        self.summary_label = ctk.CTkLabel(
+            self,
+            text=f"Total files: {self.stats.total_files()}    Total size: {convert_size(self.stats.total_size())}",
+            font=ctk.CTkFont(size=12, weight="bold"),
+        )
+        self.summary_label.grid(row=0, column=0, padx=20, pady=(20, 10), sticky="w")
 
-        self.textbox.insert("end", f"Total files: {self.stats.total_files()}\n")
-        self.textbox.insert("end", f"Total size: {convert_size(self.stats.total_size())}\n\n")
-        self.textbox.insert("end", "Count by extension:\n")
+        extensions = [
+            {"extension": ext, "files": count} for ext, count in self.stats.count_by_extension().most_common()
+        ]
+        self.extensions_table = VirtualTable(self, TableModel(extensions, ["extension", "files"]))
+        self.extensions_table.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="nsew")
 
-        for ext, count in self.stats.count_by_extension().most_common():
-            self.textbox.insert("end", f"\t{ext}: {count}\n")
+        largest = self.stats.top_n_largest_files(10)
+        self.largest_table = VirtualTable(
+            self, TableModel(largest, ["path", "size"]), column_widths={"path": 400, "size": 100}
+        )
+        self.largest_table.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="nsew")
+
+        # directories are drilled into by double-clicking them, the rollup is computed once for all of them
+        self.rollup = DirectoryRollup(collection)
+        self.directory_bar = ctk.CTkFrame(self, fg_color="transparent")
+        self.directory_bar.grid(row=3, column=0, padx=20, pady=(0, 5), sticky="ew")
+        self.directory_bar.grid_columnconfigure(1, weight=1)
+        self.up_button = ctk.CTkButton(self.directory_bar, text="Up", width=60, command=self.go_up)
+        self.up_button.grid(row=0, column=0, padx=(0, 10))
+        self.directory_label = ctk.CTkLabel(self.directory_bar, text="", anchor="w")
+        self.directory_label.grid(row=0, column=1, sticky="ew")
+        self.directories_table = VirtualTable(
+            self,
+            column_widths={"directory": 300, "size": 90, "files": 70, "pages": 70},
+            on_activate=self.open_subdirectory,
+        )
+        self.directories_table.grid(row=4, column=0, padx=20, pady=(0, 20), sticky="nsew")
+        self.grid_rowconfigure((1, 2, 4), weight=1)
+        self.show_directory(self.rollup.root)
+
+    def show_directory(self, directory: DirectoryNode) -> None:
+        """
+        Lists the subdirectories of a directory, heaviest first.
+        """
+        self.directory = directory
+        subdirectories = self.rollup.top(len(directory.children), under=directory.path, max_depth=1)
+        self.directories_table.set_model(
+            TableModel([node.summary() for node in subdirectories], ["directory", "size", "files", "pages"])
+        )
+        self.directory_label.configure(
+            text=f"{directory.path or '.'}: {directory.files} files, {convert_size(directory.size)}"
+        )
+        self.up_button.configure(state="normal" if directory.parent is not None else "disabled")
 
-        self.textbox.insert("end", "\nTop 10 largest files:\n")
-        for file in self.stats.top_n_largest_files(10):
-            self.textbox.insert("end", f"\t{file['path']} ({convert_size(int(file['size']))})\n")  # type: ignore
+    def open_subdirectory(self, position: int) -> None:
+        node = self.rollup.node(self.directories_table.model.row(position)["directory"])
+        if node is not None:
+            self.show_directory(node)
 
-        self.textbox.configure(state="disabled")
+    def go_up(self) -> None:
+        if self.directory.parent is not None:
+            self.show_directory(self.directory.parent)
 
 
 class SearchTab(ctk.CTkFrame):
+    RESULT_COLUMNS = ("path", "extension", "size", "modified")
+    # milliseconds without a keystroke before the query runs
+    DEBOUNCE = 150
+
     def __init__(self, master, collection: Collection | None = None, **kwargs):
         super().__init__(master, **kwargs)
         self.collection = collection
-        self.search_engine = SearchEngine(collection) if collection else None
+        self.searcher = IncrementalSearch(collection) if collection else None
+        self._debounce_id: str | None = None
+        self._started = 0.0
 
         self.grid_columnconfigure(0, weight=1)
-        self.grid_rowconfigure(0, weight=1)
+        self.grid_rowconfigure(3, weight=1)
 
-        self.search_entry = ctk.CTkEntry(self, placeholder_text="Enter search query")
+        self.search_entry = ctk.CTkEntry(self, placeholder_text="Search as you type, Tab completes a file name")
         self.search_entry.grid(row=0, column=0, padx=20, pady=(20, 10), sticky="ew")
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
+        self.search_entry.bind("<Return>", lambda event: self.perform_search())
+        self.search_entry.bind("<Tab>", self.complete)
 
-        self.search_button = ctk.CTkButton(self, text="Search", command=self.perform_search)
-        self.search_button.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="ew")
+        self.suggestions_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=10), anchor="w")
+        self.suggestions_label.grid(row=1, column=0, padx=20, sticky="ew")
 
-        self.results_textbox = ctk.CTkTextbox(self, font=ctk.CTkFont(size=12), height=300)
-        self.results_textbox.grid(row=2, column=0, padx=20, pady=20, sticky="nsew")
+        self.status_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=10))
+        self.status_label.grid(row=2, column=0, padx=20, sticky="w")
+
+        # the table shows the collection itself, a search only changes which positions of it are shown
+        self.model = TableModel(collection or [], self.RESULT_COLUMNS)
+        self.results_table = VirtualTable(
+            self, self.model, column_widths={"path": 320, "extension": 80, "size": 90, "modified": 150}
+        )
+        self.results_table.grid(row=3, column=0, padx=20, pady=(0, 20), sticky="nsew")
+
+        # queries run in worker threads, which post their results here
+        self.dispatcher = MainLoopDispatcher(self)
+        self.dispatcher.start()
+
+        self._show_total()
+
+    def set_collection(self, collection: Collection | None) -> None:
+        """
+        Shows another collection, or the same one after its rows changed, keeping the query and the sort order.
+        The search index is dropped, it is built again by the next query. A build for the previous rows that is still
+        running stops at its next block, as starting a new generation supersedes its query.
+        """
+        if self.searcher is not None:
+            # the running query searches the previous rows, its results are dropped
+            generation = self.searcher.next_generation()
+        else:
+            generation = 0
+        self.collection = collection
+        self.searcher = IncrementalSearch(collection) if collection else None
+        if self.searcher is not None:
+            # generations keep counting, so no result of a previous query can pass for a current one
+            self.searcher.generation = generation
+        model = TableModel(collection or [], self.RESULT_COLUMNS)
+        model.sort(self.model.sort_column, self.model.descending)
+        self.model = model
+        self.results_table.set_model(model)
+        if self.searcher is not None and self.search_entry.get().strip():
+            self.perform_search()
+        else:
+            self.suggestions_label.configure(text="")
+            self._show_total()
 
-        if not collection:
-            self.results_textbox.insert("end", "No files are sniffled yet.")
-            self.results_textbox.configure(state="disabled")
+    def _show_total(self) -> None:
+        if self.collection:
+            self.status_label.configure(text=f"{len(self.collection)} files")
+        else:
+            self.status_label.configure(text="No files are sniffled yet.")
 
-    def perform_search(self):
-        if not self.collection:
+    def schedule_search(self, event=None) -> None:
+        """
+        Runs the query once typing pauses for ``DEBOUNCE`` milliseconds, and stops the running one right away.
+        """
+        if self.searcher is None or (event is not None and event.keysym in ("Return", "Tab")):
             return
+        self.searcher.next_generation()
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+        self._debounce_id = self.after(self.DEBOUNCE, self.perform_search)
 
-        query = self.search_entry.get()
-        if not query or not self.search_engine:
+    def perform_search(self) -> None:
+        if self.searcher is None:
             return
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounce_id = None
 
-        results = self.search_engine.search(query)
-        self.results_textbox.configure(state="normal")
-        self.results_textbox.delete("1.0", "end")
+        searcher = self.searcher
+        query = self.search_entry.get()
+        generation = searcher.next_generation()
+        self._started = time.perf_counter()
+        if not searcher.ready:
+            self.status_label.configure(text="Indexing files...")
+        post = self.dispatcher.post
 
-        if not results:
-            self.results_textbox.insert("end", "No results found.\n")
+        def task():
+            hits = searcher.search(query, generation)
+            if hits is None:
+                return
+            # the file name being typed is the last word of the query
+            suggestions = searcher.complete(query.split()[-1]) if query.strip() else []
+            post("results", self.show_results, query, hits, suggestions, generation)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def show_results(self, query: str, hits: list[int], suggestions: list[str], generation: int) -> None:
+        """
+        Shows the hits of a query, on the main loop, unless a newer query was started in the meantime.
+        """
+        if self.searcher is None or generation != self.searcher.generation:
+            return
+        elapsed = (time.perf_counter() - self._started) * 1000
+        self.model.filter(hits if query.strip() else None)
+        self.results_table.first = 0
+        self.results_table.refresh()
+        self.suggestions_label.configure(text="   ".join(suggestions))
+
+        if not query.strip():
+            self.status_label.configure(text=f"{len(self.model)} files")
+        elif not self.model:
+            self.status_label.configure(text="No results found.")
         else:
-            for item in results:
-                self.results_textbox.insert("end", f"{item}\n")
-
-        self.results_textbox.configure(state="disabled")
+            self.status_label.configure(text=f"{len(self.model)} results in {elapsed:.0f} ms")
+
+    def complete(self, event=None) -> str:
+        """
+        Replaces the last word of the query with the first suggested file name.
+        """
+        if self.searcher is None or not self.searcher.ready or not self.search_entry.get().strip():
+            return "break"
+        query = self.search_entry.get()
+        prefix = query.split()[-1]
+        suggestions = self.searcher.complete(prefix, limit=1)
+        if suggestions:
+            self.search_entry.delete(len(query.rstrip()) - len(prefix), "end")
+            self.search_entry.insert("end", suggestions[0])
+            self.perform_search()
+        # keep the focus in the entry
+        return "break"
 
 
 class AboutTab(ctk.CTkFrame):
@@ -260,11 +571,12 @@ class AppUI(ctk.CTk):
         self.focus_force()
 
     def collect_callback(self) -> None:
+        self.stats_tab.destroy()
         self.stats_tab = StatsTab(self.tabs.tab("Stats"), collection=self.collect_tab.collection)
         self.configure_tab_fullwindow(self.stats_tab)
 
-        self.search_tab = SearchTab(self.tabs.tab("Search"), collection=self.collect_tab.collection)
-        self.configure_tab_fullwindow(self.search_tab)
+        # the search tab is kept, so its query and its workers survive a refresh
+        self.search_tab.set_collection(self.collect_tab.collection)
 
     @staticmethod
     def configure_tab_fullwindow(tab: ctk.CTkFrame | ctk.CTkScrollableFrame, **kwargs) -> None:
@@ -272,19 +584,11 @@ class AppUI(ctk.CTk):
         tab.master.grid_rowconfigure(0, weight=1)
 
         tab.grid(row=0, column=0, sticky="nsew")
-        tab.grid_columnconfigure(0, weight=1)
-        tab.grid_rowconfigure(0, weight=1)
 
 
 def main() -> None:
-    researchers = [
-        BasicResearcher,
-        ImageResearcher,
-        AudioResearcher,
-        PdfResearcher,
-        ModernOfficeResearcher,
-        LegacyOfficeResearcher,
-    ]
+    registry.load_entry_points()
+    researchers = registry.factories()
 
     app = AppUI(researchers)
     app.mainloop()
@@ -1,6 +1,12 @@
+import math
+import queue
+import tkinter as tk
+from collections.abc import Callable, Hashable, Mapping
+from typing import Any
+
 import customtkinter as ctk
-from tqdm import tqdm
 
+from .core.table import TableModel
 from .core.utils import inherit_signature_from
 
 
@@ -28,20 +34,278 @@ class AutoHidingScrollableFrame(ctk.CTkScrollableFrame):
             return self._parent_frame.winfo_width() < self.winfo_reqwidth()
 
 
-class CTkTqdm(tqdm):
-    def __init__(self, *args, progressbar: ctk.CTkProgressBar | None = None, **kwargs):
-        self.progressbar = progressbar
-        if self.progressbar is not None:
-            self.progressbar.set(0)
-        super().__init__(*args, **kwargs)
+class MainLoopDispatcher:
+    """
+    Runs calls posted from worker threads on the Tk main loop, at most once per frame.
+
+    Tk widgets must only be used from the main thread. Workers ``post`` calls to a queue instead, which the main loop
+    drains every ``1 / fps`` seconds with ``after()``. Calls posted with the same key replace each other within a
+    frame, so a worker can post progress for every file while the widgets are redrawn at a fixed rate.
+    """
+
+    def __init__(self, widget: tk.Misc, fps: int = 30) -> None:
+        """
+        Args:
+            widget (tk.Misc): Any widget of the application, used to schedule the polling.
+            fps (int, optional): The number of times per second the queue is drained. Defaults to 30.
+        """
+        self.widget = widget
+        self.delay = max(1, 1000 // fps)
+        self._queue: queue.SimpleQueue[tuple[Hashable | None, Callable[..., Any], tuple[Any, ...]]]
+        self._queue = queue.SimpleQueue()
+        self._after_id: str | None = None
+
+    def post(self, key: Hashable | None, func: Callable[..., Any], *args: Any) -> None:
+        """
+        Schedules a call on the main loop, safe to use from any thread.
+
+        Args:
+            key (Hashable | None): Calls with the same key in a frame are coalesced, only the last one runs.
+                None runs every call.
+            func (Callable[..., Any]): The function to call.
+            *args (Any): The arguments of the call.
+        """
+        self._queue.put((key, func, args))
+
+    def start(self) -> None:
+        """
+        Starts draining the queue, call from the main thread.
+        """
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.delay, self._drain)
+
+    def stop(self) -> None:
+        """
+        Stops draining the queue after running the calls posted so far, call from the main thread.
+        """
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Runs the calls posted so far, in order, coalescing calls with the same key.
+        """
+        calls: dict[Hashable, tuple[Callable[..., Any], tuple[Any, ...]]] = {}
+        while True:
+            try:
+                key, func, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if key is None:
+                key = object()
+            else:
+                # a coalesced call runs at the position of its last post
+                calls.pop(key, None)
+            calls[key] = (func, args)
+        for func, args in calls.values():
+            func(*args)
+
+    def _drain(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._after_id = self.widget.after(self.delay, self._drain)
+
+
+class VirtualTable(ctk.CTkFrame):
+    """
+    A table that draws only its visible rows, so it shows any number of rows instantly.
+
+    The rows come from a TableModel, which addresses them by position: scrolling reconfigures a fixed pool of canvas
+    text items (one line per visible row) with the cells of the rows now in view, instead of inserting every row into
+    a widget. Clicking a column header sorts by that column, clicking it again reverses the order.
+    """
+
+    DEFAULT_COLUMN_WIDTH = 120
+    PADDING = 6
+
+    def __init__(
+        self,
+        master,
+        model: TableModel | None = None,
+        column_widths: Mapping[str, int] | None = None,
+        font: ctk.CTkFont | None = None,
+        on_activate: Callable[[int], Any] | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            master: The parent widget.
+            model (TableModel | None, optional): The rows to show. Defaults to None, an empty table.
+            column_widths (Mapping[str, int] | None, optional): Column widths in pixels, the last column stretches to
+                fill the table. Defaults to None, DEFAULT_COLUMN_WIDTH for every column.
+            font (ctk.CTkFont | None, optional): The font of the cells. Defaults to None, size 12.
+            on_activate (Callable[[int], Any] | None, optional): Called with the position of a row in the model when it
+                is double-clicked. Defaults to None.
+        """
+        super().__init__(master, **kwargs)
+        self.model = model if model is not None else TableModel([], [])
+        self.column_widths = dict(column_widths or {})
+        self.font = font or ctk.CTkFont(size=12)
+        self.row_height = self.font.metrics("linespace") + self.PADDING
+        self.char_width = max(1, self.font.measure("0"))
+        self.on_activate = on_activate
+        self.first = 0  # the position of the topmost visible row
+
+        theme = ctk.ThemeManager.theme
+        self.text_color = self._apply_appearance_mode(theme["CTkLabel"]["text_color"])
+        self.background = self._apply_appearance_mode(theme["CTkTextbox"]["fg_color"])
+        self.stripe_color = self._apply_appearance_mode(theme["CTkFrame"]["top_fg_color"])
+        self.header_color = self._apply_appearance_mode(theme["CTkFrame"]["fg_color"])
+
+        self.header = tk.Canvas(self, height=self.row_height, bg=self.header_color, highlightthickness=0, borderwidth=0)
+        self.header.grid(row=0, column=0, sticky="ew")
+        self.body = tk.Canvas(self, bg=self.background, takefocus=True, highlightthickness=0, borderwidth=0)
+        self.body.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, rowspan=2, sticky="ns")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._lines: list[tuple[int, list[int]]] = []  # a stripe and one text item per column, per visible row
+        self._bounds: list[tuple[int, int]] = []  # the x range of each column
+        self._layout_columns()
+
+        self.header.bind("<Button-1>", self._on_header_click)
+        self.body.bind("<Configure>", lambda event: self._build())
+        for widget in (self.body, self.header):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda event: self.scroll(-3))
+            widget.bind("<Button-5>", lambda event: self.scroll(3))
+        self.body.bind("<Button-1>", lambda event: self.body.focus_set())
+        self.body.bind("<Double-Button-1>", self._on_double_click)
+        self.body.bind("<Prior>", lambda event: self.scroll(-self.page_size()))
+        self.body.bind("<Next>", lambda event: self.scroll(self.page_size()))
+        self.body.bind("<Up>", lambda event: self.scroll(-1))
+        self.body.bind("<Down>", lambda event: self.scroll(1))
+        self.body.bind("<Home>", lambda event: self.scroll_to(0))
+        self.body.bind("<End>", lambda event: self.scroll_to(len(self.model)))
+
+    def set_model(self, model: TableModel) -> None:
+        """
+        Shows other rows, from the top.
+        """
+        self.model = model
+        self.first = 0
+        self._build()
+
+    def refresh(self) -> None:
+        """
+        Redraws the visible rows, e.g. after the model was filtered or sorted.
+        """
+        self._draw_header()
+        self._draw_rows()
+
+    def page_size(self) -> int:
+        """
+        The number of rows that fit in the table.
+        """
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def scroll(self, rows: int) -> None:
+        self.scroll_to(self.first + rows)
+
+    def scroll_to(self, position: int) -> None:
+        first = max(0, min(position, len(self.model) - self.page_size()))
+        if first != self.first:
+            self.first = first
+            self._draw_rows()
+
+    def _layout_columns(self) -> None:
+        width = self.body.winfo_width()
+        x = 0
+        self._bounds = []
+        for column in self.model.columns:
+            column_width = self.column_widths.get(column, self.DEFAULT_COLUMN_WIDTH)
+            self._bounds.append((x, x + column_width))
+            x += column_width
+        if self._bounds and x < width:
+            # the last column takes the remaining space
+            self._bounds[-1] = (self._bounds[-1][0], width)
+
+    def _build(self) -> None:
+        """
+        Recreates the pool of canvas items for the current size and columns.
+        """
+        self.body.delete("all")
+        self._layout_columns()
+        self._lines = []
+        lines = math.ceil(self.body.winfo_height() / self.row_height) + 1
+        for line in range(lines):
+            top = line * self.row_height
+            stripe = self.body.create_rectangle(0, top, self.body.winfo_width(), top + self.row_height, width=0)
+            items = [
+                self.body.create_text(
+                    start + self.PADDING,
+                    top + self.row_height // 2,
+                    anchor="w",
+                    font=self.font,
+                    fill=self.text_color,
+                )
+                for start, _ in self._bounds
+            ]
+            self._lines.append((stripe, items))
+        self.first = max(0, min(self.first, len(self.model) - self.page_size()))
+        self.refresh()
+
+    def _elide(self, text: str, width: int) -> str:
+        max_chars = max(1, (width - 2 * self.PADDING) // self.char_width)
+        return text if len(text) <= max_chars else text[: max_chars - 1] + "…"
+
+    def _draw_header(self) -> None:
+        self.header.delete("all")
+        for column, (start, end) in zip(self.model.columns, self._bounds, strict=True):
+            label = column
+            if column == self.model.sort_column:
+                label += " ▼" if self.model.descending else " ▲"
+            self.header.create_text(
+                start + self.PADDING,
+                self.row_height // 2,
+                anchor="w",
+                text=self._elide(label, end - start),
+                font=self.font,
+                fill=self.text_color,
+            )
+
+    def _draw_rows(self) -> None:
+        model = self.model
+        total = len(model)
+        blank = [""] * len(model.columns)
+        for line, (stripe, items) in enumerate(self._lines):
+            position = self.first + line
+            cells = model.cells(position) if position < total else blank
+            fill = self.stripe_color if position < total and position % 2 else ""
+            self.body.itemconfigure(stripe, fill=fill)
+            for item, text, (start, end) in zip(items, cells, self._bounds, strict=True):
+                self.body.itemconfigure(item, text=self._elide(text, end - start))
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.page_size()) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action: str, value: str | float, unit: str | None = None) -> None:
+        if action == "moveto":
+            self.scroll_to(round(float(value) * len(self.model)))
+        elif action == "scroll":
+            step = self.page_size() if unit == "pages" else 1
+            self.scroll(int(float(value)) * step)
 
-    def display(self, *args, **kwargs):
-        pass  # Prevent console output
+    def _on_mousewheel(self, event: tk.Event) -> None:
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll(-3 * delta)
 
-    def refresh(self, *args, **kwargs):
-        pass  # Prevent console output
+    def _on_header_click(self, event: tk.Event) -> None:
+        for column, (start, end) in zip(self.model.columns, self._bounds, strict=True):
+            if start <= event.x < end:
+                self.model.toggle_sort(column)
+                self.first = 0
+                self.refresh()
+                return
 
-    def update(self, n=1) -> None:
-        super().update(n)
-        if self.progressbar and self.total:
-            self.progressbar.set(self.n / self.total)
+    def _on_double_click(self, event: tk.Event) -> None:
+        position = self.first + event.y // self.row_height
+        if self.on_activate is not None and position < len(self.model):
+            self.on_activate(position)
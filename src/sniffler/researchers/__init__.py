@@ -1,8 +1,32 @@
-from .audio import AudioResearcher
+import importlib
+
 from .base import BasicResearcher, InfoValue, Researcher
-from .image import ImageResearcher
-from .office import LegacyOfficeResearcher, ModernOfficeResearcher
-from .pdf import PdfResearcher
+from .registry import (
+    ENTRY_POINT_GROUP,
+    LazyResearcher,
+    ResearcherRegistry,
+    default_researchers,
+    is_thread_safe,
+    registry,
+    researcher_name,
+)
+
+# the researchers below depend on heavy libraries and are only imported when accessed
+_LAZY_MODULES = {
+    "ImageResearcher": ".image",
+    "AudioResearcher": ".audio",
+    "PdfResearcher": ".pdf",
+    "ModernOfficeResearcher": ".office",
+    "LegacyOfficeResearcher": ".office",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
 
 __all__ = [
     "Researcher",
@@ -13,4 +37,11 @@ __all__ = [
     "InfoValue",
     "ModernOfficeResearcher",
     "LegacyOfficeResearcher",
+    "LazyResearcher",
+    "ResearcherRegistry",
+    "registry",
+    "default_researchers",
+    "researcher_name",
+    "is_thread_safe",
+    "ENTRY_POINT_GROUP",
 ]
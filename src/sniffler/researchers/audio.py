@@ -3,6 +3,7 @@ from pathlib import Path
 from mutagen._file import File
 
 from .base import InfoValue
+from .extensions import AUDIO_EXTENSIONS
 
 
 class AudioResearcher:
@@ -12,7 +13,7 @@ class AudioResearcher:
 
     @staticmethod
     def accepts(file: Path) -> bool:
-        return file.suffix.lower() in {".mp3", ".flac", ".ogg", ".wav", ".m4a"}
+        return file.suffix.lower() in AUDIO_EXTENSIONS
 
     def get_info(self, file: Path) -> dict[str, InfoValue]:
         audio = File(file, easy=True)
@@ -1,8 +1,13 @@
-from datetime import datetime
+import ctypes
+import os
+import struct
+import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import Protocol
+from typing import Literal, Protocol
 
-InfoValue = str | int | float | None
+# researchers return text and numbers, rows also hold the relative path of their file under "path"
+InfoValue = str | int | float | Path | None
 
 
 class Researcher(Protocol):
@@ -47,13 +52,78 @@ class BasicResearcher:
     def get_info(self, file: Path) -> dict[str, InfoValue]:
         stat = file.stat()
 
-        def to_dt(timestamp: float | int) -> str:
-            return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
-
+        # Timestamps are kept as integer epoch seconds, formatting is left to the output sinks.
         return {
             "name": file.name,
             "extension": file.suffix.lower(),
             "size": stat.st_size,
-            "modified": to_dt(stat.st_mtime),
-            "created": to_dt(stat.st_birthtime),
+            "modified": int(stat.st_mtime),
+            "created": birthtime(file, stat),
         }
+
+
+STATX_BTIME = 0x800
+AT_FDCWD = -100
+_STATX_BUFFER_SIZE = 256
+_STATX_BTIME_OFFSET = 80
+
+_libc_statx: Callable[..., int] | Literal[False] | None = None
+
+
+def _load_libc_statx() -> Callable[..., int] | None:
+    """
+    Looks up the ``statx`` wrapper in the C library, returns None when it is not available.
+    """
+    global _libc_statx
+    if _libc_statx is None:
+        try:
+            func = ctypes.CDLL(None, use_errno=True).statx
+            func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.c_void_p]
+            func.restype = ctypes.c_int
+            _libc_statx = func
+        except (AttributeError, OSError):
+            _libc_statx = False
+    return _libc_statx or None
+
+
+def birthtime(file: Path, stat: os.stat_result) -> int | None:
+    """
+    Returns the creation time of a file in epoch seconds.
+
+    Uses ``st_birthtime`` where the platform provides it, and falls back to ``statx`` on Linux,
+    either through ``os.statx`` (Python 3.15+) or the C library.
+
+    Args:
+        file (Path): The path to the file.
+        stat (os.stat_result): The already retrieved stat result of the file.
+
+    Returns:
+        int | None: The creation time in epoch seconds, or None if the filesystem does not record it.
+    """
+    btime = getattr(stat, "st_birthtime", None)
+    if btime is not None:
+        return int(btime)
+
+    if not sys.platform.startswith("linux"):
+        return None
+
+    if hasattr(os, "statx"):
+        try:
+            result = os.statx(file, STATX_BTIME)  # type: ignore[attr-defined]
+        except OSError:
+            return None
+        btime = getattr(result, "stx_btime", None)
+        return int(btime) if btime is not None else None
+
+    statx = _load_libc_statx()
+    if statx is None:
+        return None
+
+    buffer = ctypes.create_string_buffer(_STATX_BUFFER_SIZE)
+    if statx(AT_FDCWD, os.fsencode(file), 0, STATX_BTIME, buffer) != 0:
+        return None
+    (mask,) = struct.unpack_from("=I", buffer, 0)
+    if not mask & STATX_BTIME:
+        return None
+    (seconds,) = struct.unpack_from("=q", buffer, _STATX_BTIME_OFFSET)
+    return seconds
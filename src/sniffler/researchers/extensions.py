@@ -0,0 +1,11 @@
+"""
+The file extensions each built-in researcher accepts, kept apart from the researchers so they can be checked without
+importing the libraries the researchers depend on.
+"""
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".png", ".jpeg", ".gif", ".bmp", ".tiff", ".webp"})
+AUDIO_EXTENSIONS = frozenset({".mp3", ".flac", ".ogg", ".wav", ".m4a"})
+PDF_EXTENSIONS = frozenset({".pdf"})
+MODERN_OFFICE_EXTENSIONS = frozenset({".docx", ".pptx", ".xlsx"})
+LEGACY_OFFICE_EXTENSIONS = frozenset({".doc", ".ppt", ".xls"})
+DOCUMENT_EXTENSIONS = PDF_EXTENSIONS | MODERN_OFFICE_EXTENSIONS | LEGACY_OFFICE_EXTENSIONS
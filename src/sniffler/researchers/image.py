@@ -4,6 +4,7 @@ from PIL import Image, TiffImagePlugin
 from PIL.ExifTags import GPSTAGS, IFD, TAGS
 
 from .base import InfoValue
+from .extensions import IMAGE_EXTENSIONS
 
 
 class ImageResearcher:
@@ -13,15 +14,7 @@ class ImageResearcher:
 
     @staticmethod
     def accepts(file: Path) -> bool:
-        return file.suffix.lower() in {
-            ".jpg",
-            ".png",
-            ".jpeg",
-            ".gif",
-            ".bmp",
-            ".tiff",
-            ".webp",
-        }
+        return file.suffix.lower() in IMAGE_EXTENSIONS
 
     def get_info(self, file: Path) -> dict[str, InfoValue]:
         with Image.open(file) as img:
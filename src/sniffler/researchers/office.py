@@ -5,12 +5,13 @@ from pathlib import Path
 import olefile
 
 from .base import InfoValue
+from .extensions import LEGACY_OFFICE_EXTENSIONS, MODERN_OFFICE_EXTENSIONS
 
 
 class ModernOfficeResearcher:
     @staticmethod
     def accepts(file: Path) -> bool:
-        return file.suffix.lower() in {".docx", ".pptx", ".xlsx"}
+        return file.suffix.lower() in MODERN_OFFICE_EXTENSIONS
 
     def get_info(self, file: Path) -> dict[str, InfoValue]:
         reserved_keys = {"created", "modified"}
@@ -23,7 +24,7 @@ class ModernOfficeResearcher:
 class LegacyOfficeResearcher:
     @staticmethod
     def accepts(file: Path) -> bool:
-        return file.suffix.lower() in {".doc", ".ppt", ".xls"}
+        return file.suffix.lower() in LEGACY_OFFICE_EXTENSIONS
 
     def get_info(self, file: Path) -> dict[str, InfoValue]:
         reserved_keys = {"created", "modified"}
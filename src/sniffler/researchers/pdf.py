@@ -3,6 +3,7 @@ from pathlib import Path
 import pymupdf
 
 from .base import InfoValue
+from .extensions import PDF_EXTENSIONS
 
 
 class PdfResearcher:
@@ -10,9 +11,12 @@ class PdfResearcher:
     A class to perform research operations on PDF files.
     """
 
+    # PyMuPDF documents itself as not thread-safe
+    thread_safe = False
+
     @staticmethod
     def accepts(file: Path) -> bool:
-        return file.suffix.lower() == ".pdf"
+        return file.suffix.lower() in PDF_EXTENSIONS
 
     def get_info(self, file: Path) -> dict[str, InfoValue]:
         with pymupdf.open(file) as pdf:
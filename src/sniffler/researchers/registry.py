@@ -0,0 +1,218 @@
+import importlib
+import threading
+from collections.abc import Callable, Iterable
+from functools import partial
+from pathlib import Path
+
+from .base import BasicResearcher, InfoValue, Researcher
+from .extensions import (
+    AUDIO_EXTENSIONS,
+    IMAGE_EXTENSIONS,
+    LEGACY_OFFICE_EXTENSIONS,
+    MODERN_OFFICE_EXTENSIONS,
+    PDF_EXTENSIONS,
+)
+
+ENTRY_POINT_GROUP = "sniffler.researchers"
+
+
+class LazyResearcher:
+    """
+    A researcher that imports its implementation only when it is first needed.
+
+    If the accepted extensions are known upfront, ``accepts`` checks them without importing anything, so the module
+    of the implementation (and the libraries it depends on, e.g. pymupdf for PDFs) is only imported once a matching
+    file is researched. Otherwise the implementation is imported on the first ``accepts`` call.
+    """
+
+    def __init__(self, name: str, target: str, extensions: Iterable[str] | None = None) -> None:
+        """
+        Args:
+            name (str): The name of the researcher, used in reports.
+            target (str): The researcher class or factory as ``"module:attribute"``.
+            extensions (Iterable[str] | None, optional): The lowercase extensions the researcher accepts, including
+                the dot. Defaults to None, which defers to the implementation.
+        """
+        self.name = name
+        self.target = target
+        self.extensions = frozenset(extensions) if extensions is not None else None
+        self._researcher: Researcher | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether the implementation has been imported.
+        """
+        return self._researcher is not None
+
+    def load(self) -> Researcher:
+        """
+        Imports and instantiates the implementation, once.
+
+        Returns:
+            Researcher: The implementation.
+        """
+        if self._researcher is None:
+            with self._lock:
+                if self._researcher is None:
+                    module_name, _, attribute = self.target.partition(":")
+                    factory = getattr(importlib.import_module(module_name), attribute)
+                    self._researcher = factory()
+        return self._researcher  # type: ignore
+
+    def accepts(self, file: Path) -> bool:
+        if self.extensions is not None:
+            return file.suffix.lower() in self.extensions
+        return self.load().accepts(file)
+
+    def get_info(self, file: Path) -> dict[str, InfoValue]:
+        return self.load().get_info(file)
+
+    @property
+    def thread_safe(self) -> bool:
+        """
+        Whether the implementation may research files concurrently, see ``is_thread_safe``. Imports it.
+        """
+        return is_thread_safe(self.load())
+
+    def __repr__(self) -> str:
+        return f"LazyResearcher({self.name!r}, {self.target!r})"
+
+
+class ResearcherRegistry:
+    """
+    The researchers known to sniffler, by name, in registration order.
+
+    Researchers are registered either as a class (instantiated as is) or as an ``"module:attribute"`` target
+    (instantiated as a LazyResearcher). Third-party packages can add researchers through the ``sniffler.researchers``
+    entry point group, e.g. in their ``pyproject.toml``::
+
+        [project.entry-points."sniffler.researchers"]
+        FontResearcher = "sniffler_fonts:FontResearcher"
+
+    Entry point researchers are imported on their first ``accepts`` call, so plugins should import heavy libraries
+    inside ``get_info`` to keep startup fast.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, Callable[[], Researcher]] = {}
+        self._entry_points_loaded = False
+
+    def register(
+        self,
+        name: str,
+        target: str | Callable[[], Researcher],
+        extensions: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Registers a researcher, replacing any researcher of the same name.
+
+        Args:
+            name (str): The name of the researcher.
+            target (str | Callable[[], Researcher]): A researcher class or factory, or a ``"module:attribute"``
+                target to import lazily.
+            extensions (Iterable[str] | None, optional): The extensions a lazy researcher accepts, see
+                LazyResearcher. Defaults to None.
+        """
+        if isinstance(target, str):
+            extensions = frozenset(extensions) if extensions is not None else None
+            self._entries[name] = partial(LazyResearcher, name, target, extensions)
+        else:
+            self._entries[name] = target
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> list[str]:
+        """
+        Registers the researchers advertised by installed packages, once. Built-in researchers are not replaced.
+
+        Args:
+            group (str, optional): The entry point group. Defaults to "sniffler.researchers".
+
+        Returns:
+            list[str]: The names of the newly registered researchers.
+        """
+        if self._entry_points_loaded:
+            return []
+        self._entry_points_loaded = True
+
+        from importlib.metadata import entry_points
+
+        names = []
+        for entry_point in entry_points(group=group):
+            if entry_point.name not in self._entries:
+                self.register(entry_point.name, entry_point.value)
+                names.append(entry_point.name)
+        return names
+
+    def names(self) -> list[str]:
+        """
+        Returns the names of the registered researchers.
+        """
+        return list(self._entries)
+
+    def create(self, name: str) -> Researcher:
+        """
+        Creates a new instance of a researcher.
+
+        Args:
+            name (str): The name of the researcher.
+
+        Raises:
+            KeyError: If no researcher of that name is registered.
+        """
+        return self._entries[name]()
+
+    def factories(self) -> list[Callable[[], Researcher]]:
+        """
+        Returns a factory for each registered researcher, e.g. to create fresh instances for every scan.
+        """
+        return [partial(self.create, name) for name in self._entries]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+
+registry = ResearcherRegistry()
+registry.register("BasicResearcher", BasicResearcher)
+registry.register("ImageResearcher", "sniffler.researchers.image:ImageResearcher", IMAGE_EXTENSIONS)
+registry.register("AudioResearcher", "sniffler.researchers.audio:AudioResearcher", AUDIO_EXTENSIONS)
+registry.register("PdfResearcher", "sniffler.researchers.pdf:PdfResearcher", PDF_EXTENSIONS)
+registry.register(
+    "ModernOfficeResearcher", "sniffler.researchers.office:ModernOfficeResearcher", MODERN_OFFICE_EXTENSIONS
+)
+registry.register(
+    "LegacyOfficeResearcher", "sniffler.researchers.office:LegacyOfficeResearcher", LEGACY_OFFICE_EXTENSIONS
+)
+
+
+def default_researchers(plugins: bool = True) -> list[Researcher]:
+    """
+    Creates one instance of every registered researcher.
+
+    Args:
+        plugins (bool, optional): If True, researchers from the ``sniffler.researchers`` entry point group are
+            included. Defaults to True.
+
+    Returns:
+        list[Researcher]: The researchers, the built-in ones first.
+    """
+    if plugins:
+        registry.load_entry_points()
+    return [factory() for factory in registry.factories()]
+
+
+def is_thread_safe(researcher: object) -> bool:
+    """
+    Returns whether a researcher may research several files concurrently. Researchers built on libraries that are
+    not thread-safe set a ``thread_safe = False`` class attribute, and always run on a single worker.
+    """
+    return getattr(researcher, "thread_safe", True)
+
+
+def researcher_name(researcher: object) -> str:
+    """
+    Returns the name of a researcher for reports, the class name unless it is a LazyResearcher.
+    """
+    if isinstance(researcher, LazyResearcher):
+        return researcher.name
+    return type(researcher).__name__
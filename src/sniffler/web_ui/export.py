@@ -0,0 +1,82 @@
+import zlib
+from collections.abc import Generator, Iterable
+from typing import Any
+
+from sniffler.core.csv_writer import iter_csv
+from sniffler.core.ndjson_writer import serialize_row
+
+from .utils import iter_scan_rows
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+CHUNK_SIZE = 1 << 16
+
+
+def scan_fieldnames(result: str | list[dict[str, Any]]) -> list[str]:
+    """
+    Returns the columns of a stored scan in order of first appearance, like the ``keys`` of a Collection.
+
+    Args:
+        result (str | list[dict[str, Any]]): The ``result`` of a ScanResult.
+    """
+    fieldnames: dict[str, None] = {}
+    for row in iter_scan_rows(result):
+        fieldnames.update(dict.fromkeys(row))
+    return list(fieldnames)
+
+
+def export_lines(result: str | list[dict[str, Any]], fmt: str, delimiter: str = ",") -> Iterable[str]:
+    """
+    Renders a stored scan line by line, decoding one row at a time.
+
+    CSV needs its header upfront, so the result is decoded twice: once for the columns, once for the rows.
+
+    Args:
+        result (str | list[dict[str, Any]]): The ``result`` of a ScanResult.
+        fmt (str): One of ``EXPORT_FORMATS``.
+        delimiter (str, optional): The CSV delimiter. Defaults to ",".
+
+    Returns:
+        Iterable[str]: The output lines.
+    """
+    if fmt == "csv":
+        return iter_csv(scan_fieldnames(result), iter_scan_rows(result), delimiter)
+    return (serialize_row(row) for row in iter_scan_rows(result))
+
+
+def iter_chunks(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Generator[bytes, Any, None]:
+    """
+    Joins lines into UTF-8 chunks of about ``chunk_size`` bytes, so a response is not sent in tiny writes.
+    """
+    chunk: list[str] = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(chunk).encode("utf-8")
+            chunk.clear()
+            size = 0
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Generator[bytes, Any, None]:
+    """
+    Compresses a stream of chunks into a gzip stream incrementally.
+
+    Args:
+        chunks (Iterable[bytes]): The uncompressed chunks.
+        level (int, optional): The compression level. Defaults to 6.
+
+    Yields:
+        Generator[bytes, Any, None]: The compressed chunks, a gzip member with header and trailer.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: 2**15 window with a gzip header
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
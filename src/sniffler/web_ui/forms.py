@@ -1,5 +1,37 @@
 from django import forms
 
+from sniffler.core.enrichment import ENRICH_ORDERS
+
+from .models import ScanResult
+
+ENRICH_ORDER_LABELS = {
+    "smallest": "Smallest files first",
+    "largest": "Largest files first",
+    "newest": "Newest files first",
+}
+
+
+class SearchForm(forms.Form):
+    q = forms.CharField(label="Search", max_length=255, required=False)
+    scans = forms.ModelMultipleChoiceField(
+        label="Scans",
+        queryset=ScanResult.objects.order_by("-created_at"),
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+        help_text="Searches all scans if none is selected.",
+    )
+
 
 class ScanForm(forms.Form):
     path = forms.CharField(label="Path", max_length=255)
+    two_phase = forms.BooleanField(
+        label="Show basic results first, research documents, images and audio in the background",
+        required=False,
+        initial=True,
+    )
+    enrich_order = forms.ChoiceField(
+        label="Background research order",
+        choices=[(order, ENRICH_ORDER_LABELS.get(order, "Scan order")) for order in ENRICH_ORDERS],
+        initial="smallest",
+        required=False,
+    )
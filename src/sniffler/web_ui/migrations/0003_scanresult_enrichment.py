@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("web_ui", "0002_alter_scanresult_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scanresult",
+            name="enriched",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="scanresult",
+            name="to_enrich",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
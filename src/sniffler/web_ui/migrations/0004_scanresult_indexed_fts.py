@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+FTS_TABLE = "web_ui_scanfile_fts"
+
+
+def create_fts_table(apps, schema_editor):
+    # the full-text index needs SQLite compiled with FTS5, other databases search the stored results instead
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not cursor.fetchone()[0]:
+            return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "name, path, metadata, scan, scan_id UNINDEXED, extension UNINDEXED, size UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("web_ui", "0003_scanresult_enrichment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scanresult",
+            name="indexed",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
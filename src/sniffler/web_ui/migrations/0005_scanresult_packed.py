@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("web_ui", "0004_scanresult_indexed_fts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scanresult",
+            name="packed",
+            field=models.BinaryField(null=True),
+        ),
+    ]
@@ -6,6 +6,18 @@ class ScanResult(models.Model):
     path = models.CharField(max_length=255)
     result = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # progress of the background enrichment of a two-phase scan
+    enriched = models.PositiveIntegerField(default=0)
+    to_enrich = models.PositiveIntegerField(default=0)
+    # whether the rows are in the full-text search index, see search.py
+    indexed = models.BooleanField(default=False)
+    # the rows in the packed columnar format, so views can decode only the columns they need, see
+    # core/serialization.py. Scans stored before it was added only have the JSON result
+    packed = models.BinaryField(null=True, editable=False)
 
     def __str__(self):
         return self.path
+
+    @property
+    def enriching(self) -> bool:
+        return self.enriched < self.to_enrich
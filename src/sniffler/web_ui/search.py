@@ -0,0 +1,261 @@
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from django.db import connection, transaction
+from django.utils.html import escape
+from django.utils.safestring import SafeString
+
+from .models import ScanResult
+from .utils import iter_scan_rows
+
+FTS_TABLE = "web_ui_scanfile_fts"
+# bm25 weights of the name, path, metadata and scan columns, a match in the name ranks highest
+RANK_WEIGHTS = (10.0, 4.0, 1.0, 0.0)
+# fields that are not text metadata, the path and name have their own columns
+NON_TEXT_FIELDS = frozenset({"path", "name", "extension", "size", "modified", "created"})
+INSERT_BATCH_SIZE = 1000
+# the length of the metadata shown with hits found without the full-text index
+LIKE_SNIPPET_LENGTH = 120
+_INSERT_SQL = (
+    f"INSERT INTO {FTS_TABLE} (name, path, metadata, scan, scan_id, extension, size) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+)
+# the scan of a row is also indexed as a token, filtering on it through MATCH avoids reading every hit's row
+_DELETE_SQL = f"DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)"
+
+# control characters mark the highlighted terms in snippets, they are turned into <mark> after escaping
+_HIGHLIGHT_START, _HIGHLIGHT_END = "\x02", "\x03"
+
+# whether the SQLite library of a database connection was compiled with FTS5, by connection alias
+_fts5_support: dict[str, bool] = {}
+
+
+def fts_available() -> bool:
+    """
+    Whether the database supports the full-text index, which needs SQLite compiled with FTS5. Without it, searches
+    fall back to ``LikeSearchResults``. The SQLite library is probed once per database.
+    """
+    if connection.vendor != "sqlite":
+        return False
+    if connection.alias not in _fts5_support:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            _fts5_support[connection.alias] = bool(cursor.fetchone()[0])
+    return _fts5_support[connection.alias]
+
+
+def _scan_token(scan_id: int | str) -> str:
+    return f"scan{int(scan_id)}"
+
+
+def _scan_filter(scan_ids: Iterable[int | str]) -> str:
+    return "scan : (" + " OR ".join(f'"{_scan_token(scan_id)}"' for scan_id in scan_ids) + ")"
+
+
+def _index_entry(scan_id: int, row: Mapping[str, Any]) -> tuple[str, str, str, str, int, str, Any]:
+    metadata = " ".join(value for key, value in row.items() if key not in NON_TEXT_FIELDS and isinstance(value, str))
+    return (
+        str(row.get("name") or ""),
+        str(row.get("path") or ""),
+        metadata,
+        _scan_token(scan_id),
+        scan_id,
+        str(row.get("extension") or ""),
+        row.get("size"),
+    )
+
+
+def index_scan(scan_id: int, rows: Iterable[Mapping[str, Any]] | None = None) -> int:
+    """
+    Replaces the full-text index entries of a scan.
+
+    Args:
+        scan_id (int): The id of the ScanResult.
+        rows (Iterable[Mapping[str, Any]] | None, optional): The rows of the scan. Defaults to None, which streams
+            them from the stored result.
+
+    Returns:
+        int: The number of indexed rows.
+    """
+    if rows is None:
+        rows = iter_scan_rows(ScanResult.objects.values_list("result", flat=True).get(id=scan_id))
+    count = 0
+    # atomic() is also a decorator, without Django's type stubs pyright cannot tell which overload applies
+    with transaction.atomic(), connection.cursor() as cursor:  # type: ignore
+        cursor.execute(_DELETE_SQL, [_scan_filter([scan_id])])
+        batch = []
+        for row in rows:
+            batch.append(_index_entry(scan_id, row))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                cursor.executemany(_INSERT_SQL, batch)
+                count += len(batch)
+                batch.clear()
+        if batch:
+            cursor.executemany(_INSERT_SQL, batch)
+            count += len(batch)
+        ScanResult.objects.filter(id=scan_id).update(indexed=True)
+    return count
+
+
+def unindex_scan(scan_id: int | str) -> None:
+    """
+    Removes the full-text index entries of a scan.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_DELETE_SQL, [_scan_filter([scan_id])])
+
+
+def fts_query(text: str) -> str:
+    """
+    Turns user input into an FTS5 query: every word must match, as a prefix, in the name, path or metadata.
+
+    Args:
+        text (str): The user input.
+
+    Returns:
+        str: The FTS5 query, empty if the input has no words.
+
+    Examples:
+        >>> fts_query('report 2024 "draft"')
+        '{name path metadata} : ("report"* "2024"* "draft"*)'
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return ""
+    return "{name path metadata} : (" + " ".join(f'"{word}"*' for word in words) + ")"
+
+
+def highlight(text: str) -> SafeString:
+    """
+    Escapes a snippet and marks its matched terms with ``<mark>``.
+    """
+    return SafeString(escape(text).replace(_HIGHLIGHT_START, "<mark>").replace(_HIGHLIGHT_END, "</mark>"))
+
+
+class ScanSearchResults:
+    """
+    The hits of a full-text search, ranked by relevance and fetched lazily a page at a time.
+
+    Supports ``count()`` and slicing, so it can be passed to Django's Paginator.
+    """
+
+    def __init__(self, query: str, scan_ids: Iterable[int] | None = None) -> None:
+        """
+        Args:
+            query (str): The user input, see ``fts_query``.
+            scan_ids (Iterable[int] | None, optional): The scans to search. Defaults to None, all scans.
+        """
+        self.match = fts_query(query)
+        self.scan_ids = list(scan_ids) if scan_ids is not None else None
+        self._count: int | None = None
+
+    def _where(self) -> tuple[str, list[Any]]:
+        match = self.match
+        if self.scan_ids is not None:
+            match = f"{match} AND {_scan_filter(self.scan_ids)}"
+        return f"{FTS_TABLE} MATCH %s", [match]
+
+    def count(self) -> int:
+        if not self.match or self.scan_ids == []:
+            return 0
+        if self._count is not None:
+            return self._count
+        where, params = self._where()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {FTS_TABLE} WHERE {where}", params)
+            self._count = count = int(cursor.fetchone()[0])
+        return count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, key: slice) -> list[dict[str, Any]]:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("ScanSearchResults only supports slicing.")
+        if not self.match or self.scan_ids == []:
+            return []
+        offset = key.start or 0
+        limit = -1 if key.stop is None else max(0, key.stop - offset)
+        where, params = self._where()
+        weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+        sql = (
+            f"SELECT scan_id, path, extension, size, "
+            f"highlight({FTS_TABLE}, 0, %s, %s), snippet({FTS_TABLE}, 2, %s, %s, '…', 12) "
+            f"FROM {FTS_TABLE} WHERE {where} ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s OFFSET %s"
+        )
+        markers = [_HIGHLIGHT_START, _HIGHLIGHT_END]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*markers, *markers, *params, limit, offset])
+            return [
+                {
+                    "scan_id": scan_id,
+                    "path": path,
+                    "extension": extension,
+                    "size": size,
+                    "name": highlight(name),
+                    "snippet": highlight(snippet),
+                }
+                for scan_id, path, extension, size, name, snippet in cursor.fetchall()
+            ]
+
+
+class LikeSearchResults:
+    """
+    The hits of a search without the full-text index, for databases without FTS5.
+
+    The stored results of the scans are narrowed down with ``LIKE``, then their rows are matched in Python: every word
+    must occur in the name, path or text metadata. Hits are in scan and walk order, without ranking or highlighting.
+    Supports ``count()`` and slicing like ``ScanSearchResults``.
+    """
+
+    def __init__(self, query: str, scan_ids: Iterable[int] | None = None) -> None:
+        """
+        Args:
+            query (str): The user input, split into words like in ``fts_query``.
+            scan_ids (Iterable[int] | None, optional): The scans to search. Defaults to None, all scans.
+        """
+        self.words = re.findall(r"\w+", query.lower())
+        self.scan_ids = list(scan_ids) if scan_ids is not None else None
+        self._hits: list[dict[str, Any]] | None = None
+
+    def _find(self) -> list[dict[str, Any]]:
+        if self._hits is not None:
+            return self._hits
+        hits: list[dict[str, Any]] = []
+        if self.words and self.scan_ids != []:
+            scans = ScanResult.objects.all()
+            if self.scan_ids is not None:
+                scans = scans.filter(id__in=self.scan_ids)
+            # the results are JSON with non-ASCII characters escaped, only ASCII words can be looked up in them
+            for word in self.words:
+                if word.isascii():
+                    scans = scans.filter(result__icontains=word)
+            for scan_id, result in scans.order_by("id").values_list("id", "result"):
+                for row in iter_scan_rows(result):
+                    name, path, metadata, _, _, extension, size = _index_entry(scan_id, row)
+                    text = f"{name} {path} {metadata}".lower()
+                    if all(word in text for word in self.words):
+                        hits.append(
+                            {
+                                "scan_id": scan_id,
+                                "path": path,
+                                "extension": extension,
+                                "size": size,
+                                "name": name,
+                                "snippet": metadata[:LIKE_SNIPPET_LENGTH],
+                            }
+                        )
+        self._hits = hits
+        return hits
+
+    def count(self) -> int:
+        return len(self._find())
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, key: slice) -> list[dict[str, Any]]:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("LikeSearchResults only supports slicing.")
+        return self._find()[key]
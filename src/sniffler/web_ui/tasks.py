@@ -1,27 +1,32 @@
+import json
+import threading
+import time
 from functools import partial
 
+from django.db import connection
 from tqdm import tqdm
 
-from sniffler.core.collector import Collector
-from sniffler.researchers import (
-    AudioResearcher,
-    BasicResearcher,
-    ImageResearcher,
-    LegacyOfficeResearcher,
-    ModernOfficeResearcher,
-    PdfResearcher,
-)
-
-
-def run_scan(path):
-    researchers = [
-        BasicResearcher(),
-        ImageResearcher(),
-        AudioResearcher(),
-        PdfResearcher(),
-        ModernOfficeResearcher(),
-        LegacyOfficeResearcher(),
-    ]
+from sniffler.core.collector import Collection, Collector
+from sniffler.core.enrichment import Enricher, split_researchers
+from sniffler.core.serialization import pack_collection
+from sniffler.researchers import Researcher, default_researchers
+
+from .models import ScanResult
+from .search import fts_available, index_scan
+from .utils import CollectionJSONEncoder
+
+# intermediate saves of an enriched scan take at most about 1 / SAVE_COST_FACTOR of the time
+SAVE_COST_FACTOR = 10
+
+
+def all_researchers() -> list[Researcher]:
+    return default_researchers()
+
+
+def run_scan(path, basic_only=False):
+    researchers = all_researchers()
+    if basic_only:
+        researchers, _ = split_researchers(researchers)
     collector = Collector(
         path,
         researchers,
@@ -29,3 +34,66 @@ def run_scan(path):
     )
     collector.collect(show_progress=False)
     return collector.collection
+
+
+def prepare_enrichment(path, collection: Collection, order: str = "smallest") -> Enricher:
+    """
+    Queues the expensive researchers over the result of a basic-only ``run_scan``.
+    """
+    collector = Collector(path, [])
+    collector.collection = collection
+    _, expensive = split_researchers(all_researchers())
+    return Enricher(collector, expensive, order=order)
+
+
+def enrich_scan(scan_id: int, enricher: Enricher, save_interval: float = 2.0) -> None:
+    """
+    Enriches a stored scan, saving the result every ``save_interval`` seconds so views show the progress.
+    Stops if the scan is removed in the meantime.
+
+    The interval grows with the time a save takes, so a large scan is not busy re-encoding its rows. The packed rows
+    are only written once enrichment is done, until then views read the JSON result.
+    """
+
+    def save(final: bool) -> bool:
+        collection = enricher.collector.collection
+        result = json.dumps(collection, cls=CollectionJSONEncoder)
+        packed = pack_collection(collection) if final else None
+        return ScanResult.objects.filter(id=scan_id).update(result=result, packed=packed, enriched=enricher.done) > 0
+
+    interval = save_interval
+    last_save = time.monotonic()
+    for _ in enricher.enrich():
+        if time.monotonic() - last_save >= interval:
+            started = time.monotonic()
+            if not save(final=False):
+                return
+            last_save = time.monotonic()
+            interval = max(save_interval, SAVE_COST_FACTOR * (last_save - started))
+    if save(final=True) and fts_available():
+        index_scan(scan_id, enricher.collector.collection)
+
+
+def start_enrichment(scan: ScanResult, collection: Collection, order: str = "smallest") -> threading.Thread | None:
+    """
+    Starts enriching a stored scan in a background thread.
+
+    Returns:
+        threading.Thread | None: The thread, or None if there is nothing to enrich.
+    """
+    enricher = prepare_enrichment(scan.path, collection, order)
+    if not enricher.total:
+        return None
+    scan_id: int = scan.pk
+    ScanResult.objects.filter(id=scan_id).update(to_enrich=enricher.total)
+    scan.refresh_from_db(fields=["to_enrich"])
+
+    def task():
+        try:
+            enrich_scan(scan_id, enricher)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=task, name=f"sniffler-enrich-{scan_id}", daemon=True)
+    thread.start()
+    return thread
@@ -1,11 +1,22 @@
+import gzip
 import json
+import tempfile
+import time
+from pathlib import Path
 from unittest.mock import patch
 
 from django.contrib.messages import get_messages
 from django.test import Client, TestCase
 from django.urls import reverse
+from PIL import Image
+
+from sniffler.core.diff import DiffSummary, diff_scans
+from sniffler.core.serialization import pack_collection
 
 from .models import ScanResult
+from .search import LikeSearchResults, ScanSearchResults, fts_available, fts_query, index_scan
+from .tasks import enrich_scan, prepare_enrichment, run_scan
+from .utils import CollectionJSONEncoder, iter_json_array, load_scan_columns, load_scan_rows
 
 
 class HomePageViewTests(TestCase):
@@ -42,6 +53,17 @@ class ScanViewTests(TestCase):
         self.assertRedirects(response, reverse("scan"))
         self.assertTrue(ScanResult.objects.filter(path="/valid/path").exists())
 
+    @patch("sniffler.web_ui.views.start_enrichment")
+    @patch("sniffler.web_ui.views.run_scan")
+    def test_scan_form_two_phase(self, mock_run_scan, mock_start_enrichment):
+        mock_run_scan.return_value = [{"size": "1234", "name": "file1.pdf", "path": "/files/file1.pdf"}]
+        data = {"path": "/valid/path", "two_phase": "on", "enrich_order": "largest"}
+        response = self.client.post(reverse("scan"), data)
+        self.assertRedirects(response, reverse("scan"))
+        mock_run_scan.assert_called_once_with("/valid/path", basic_only=True)
+        scan = ScanResult.objects.get(path="/valid/path")
+        mock_start_enrichment.assert_called_once_with(scan, mock_run_scan.return_value, "largest")
+
     def test_scan_form_invalid_path(self):
         data = {"path": "/invalid/path"}
         response = self.client.post(reverse("scan"), data)
@@ -117,6 +139,70 @@ class StatsViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "No active scan. Please run a new scan, or select one from Scans.")
 
+    def test_stats_view_reads_packed_columns(self):
+        rows = [
+            {"path": Path("photo.png"), "extension": ".png", "size": 2048, "width": 40, "height": 30, "model": "X"},
+            {"path": Path("notes.txt"), "extension": ".txt", "size": 1024},
+        ]
+        # the JSON result is never decoded when the scan is packed
+        scan = ScanResult.objects.create(path="/packed", result="invalid_json", packed=pack_collection(rows))
+        self.assertEqual(
+            load_scan_columns(scan.id, ["path", "width"]), [{"path": "photo.png", "width": 40}, {"path": "notes.txt"}]
+        )
+        session = self.client.session
+        session["active_scan_id"] = scan.id
+        session.save()
+        response = self.client.get(reverse("stats"))
+        self.assertNotIn("error", response.context)
+        self.assertEqual(response.context["total_size"], "3.0 KB")
+        self.assertEqual(response.context["count_by_extension"], [(".png", 1), (".txt", 1)])
+        self.assertEqual(response.context["top_largest_images"][0]["width"], 40)
+
+    def test_stats_view_directory_rollup(self):
+        rows = [
+            {"path": "docs/a/report.pdf", "extension": ".pdf", "size": 300, "page_count": 12},
+            {"path": "docs/b/notes.txt", "extension": ".txt", "size": 100},
+            {"path": "music/song.mp3", "extension": ".mp3", "size": 500, "duration": 7200.0},
+            {"path": "readme.txt", "extension": ".txt", "size": 50},
+        ]
+        scan = ScanResult.objects.create(path="/rollup", result=json.dumps(rows))
+        session = self.client.session
+        session["active_scan_id"] = scan.id
+        session.save()
+
+        response = self.client.get(reverse("stats"))
+        self.assertEqual(response.context["directory"]["files"], 4)
+        self.assertEqual([row["path"] for row in response.context["subdirectories"]], ["music", "docs"])
+        self.assertEqual(response.context["subdirectories"][0]["hours"], 2.0)
+        self.assertEqual(response.context["heaviest_directories"][2]["path"], "docs/a")
+
+        response = self.client.get(reverse("stats"), {"dir": "docs"})
+        self.assertEqual(response.context["directory"]["size"], 400)
+        self.assertEqual(response.context["directory"]["pages"], 12)
+        self.assertEqual(response.context["breadcrumbs"], [("docs", "docs")])
+        self.assertEqual([row["path"] for row in response.context["subdirectories"]], ["docs/a", "docs/b"])
+        self.assertContains(response, "?dir=docs/a")
+
+    def test_stats_view_distributions(self):
+        now = int(time.time())
+        rows = [
+            {"path": "new.txt", "size": 500, "modified": now},
+            {"path": "old.pdf", "size": 2048, "modified": now - 3 * 365 * 86400, "page_count": 10},
+            {"path": "unknown.bin"},
+        ]
+        scan = ScanResult.objects.create(path="/distributions", result=json.dumps(rows))
+        session = self.client.session
+        session["active_scan_id"] = scan.id
+        session.save()
+        response = self.client.get(reverse("stats"))
+        self.assertEqual(list(response.context["size_percentiles"]), ["p50", "p90", "p99"])
+        self.assertEqual(response.context["page_percentiles"], {"p50": 10, "p90": 10, "p99": 10})
+        (_, sizes), (_, ages) = response.context["histograms"]
+        self.assertEqual([bucket["files"] for bucket in sizes[:2]], [1, 1])
+        self.assertEqual(sizes[1]["size"], 2048)
+        self.assertEqual([bucket["files"] for bucket in ages], [1, 0, 0, 0, 1, 0])
+        self.assertContains(response, "1 year – 5 years")
+
     def test_stats_view_invalid_scan_data(self):
         scan = ScanResult.objects.create(path="/invalid/data/path", result="invalid_json")
         session = self.client.session
@@ -143,3 +229,200 @@ class StatsViewTemplateTests(TestCase):
     def test_stats_view_template_used(self):
         response = self.client.get(reverse("stats"))
         self.assertTemplateUsed(response, "web_ui/stats.html")
+
+
+class ScanDiffTests(TestCase):
+    fixtures = ["scan_results.json"]
+
+    def test_diff_stored_scans(self):
+        new_scan = ScanResult.objects.create(
+            path="/existing/path1",
+            result=json.dumps(
+                [
+                    {"size": "4096", "path": "/files/existing1.txt"},
+                    {"size": "512", "path": "/files/existing4.txt"},
+                ]
+            ),
+        )
+        summary = DiffSummary()
+        entries = list(summary.track(diff_scans(load_scan_rows(1), load_scan_rows(new_scan.id))))
+        self.assertEqual(
+            [(entry.change, entry.path) for entry in entries],
+            [("grown", "/files/existing1.txt"), ("removed", "/files/existing2.log"), ("added", "/files/existing4.txt")],
+        )
+        self.assertEqual(summary.changes, {"grown": 1, "removed": 1, "added": 1})
+
+    def test_load_missing_scan(self):
+        with self.assertRaises(ScanResult.DoesNotExist):
+            load_scan_rows(9999)
+
+
+class TwoPhaseScanTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name)
+        Image.new("RGB", (4, 3)).save(self.path / "small.png")
+        Image.new("RGB", (40, 30)).save(self.path / "large.png")
+        (self.path / "notes.txt").write_text("notes")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_enrich_stored_scan(self):
+        collection = run_scan(self.path, basic_only=True)
+        self.assertTrue(all("width" not in row for row in collection))
+        scan = ScanResult.objects.create(path=str(self.path), result=json.dumps(collection, cls=CollectionJSONEncoder))
+
+        enricher = prepare_enrichment(scan.path, collection, order="largest")
+        self.assertEqual(enricher.total, 2)
+        self.assertEqual(str(collection[enricher.queue[0]]["path"]), "large.png")
+        enrich_scan(scan.id, enricher)
+
+        scan.refresh_from_db()
+        self.assertFalse(scan.enriching)
+        rows = {row["path"]: row for row in json.loads(scan.result)}
+        self.assertEqual((rows["large.png"]["width"], rows["large.png"]["height"]), (40, 30))
+        self.assertNotIn("width", rows["notes.txt"])
+        widths = {row["path"]: row.get("width") for row in load_scan_columns(scan.id, ["path", "width"])}
+        self.assertEqual(widths["large.png"], 40)
+
+    def test_stats_view_shows_enrichment_progress(self):
+        scan = ScanResult.objects.create(
+            path=str(self.path),
+            result=json.dumps([{"size": "1234", "path": "small.png"}]),
+            enriched=1,
+            to_enrich=2,
+        )
+        session = self.client.session
+        session["active_scan_id"] = scan.id
+        session.save()
+        response = self.client.get(reverse("stats"))
+        self.assertContains(response, "1 of 2 files researched")
+
+
+class ScanExportTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        rows = [
+            {"path": "a.txt", "size": 10, "modified": 0},
+            {"path": "b.jpg", "size": 20, "modified": 0, "width": 640, "xres": 72.5},
+        ]
+        self.scan = ScanResult.objects.create(path="/files", result=json.dumps(rows))
+
+    def export(self, **params):
+        return self.client.get(reverse("export", args=[self.scan.id]), params)
+
+    def test_iter_json_array(self):
+        self.assertEqual(list(iter_json_array(' [ {"a": 1} ,{"b": [2, 3]}\n] ')), [{"a": 1}, {"b": [2, 3]}])
+        self.assertEqual(list(iter_json_array("[]")), [])
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array('{"a": 1}'))
+
+    def test_export_csv(self):
+        response = self.export(format="csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('filename="scan-', response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "path,size,modified,width,xres")
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith("b.jpg,20,"))
+        self.assertTrue(lines[2].endswith(",640,72.5"))
+
+    def test_export_ndjson_gzip(self):
+        response = self.export(format="ndjson", gzip="1")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row["path"] for row in rows], ["a.txt", "b.jpg"])
+        self.assertEqual(rows[1]["width"], 640)
+
+    def test_export_errors(self):
+        self.assertEqual(self.export(format="xml").status_code, 400)
+        response = self.client.get(reverse("export", args=[self.scan.id + 1]))
+        self.assertEqual(response.status_code, 404)
+
+
+class SearchViewTests(TestCase):
+    fixtures = ["scan_results.json"]
+
+    def setUp(self):
+        self.client = Client()
+
+    def create_scan(self, path, rows):
+        scan = ScanResult.objects.create(path=path, result=json.dumps(rows))
+        index_scan(scan.id)
+        return scan
+
+    def test_fts_query(self):
+        self.assertEqual(fts_query('Report 2024 "draft"'), '{name path metadata} : ("report"* "2024"* "draft"*)')
+        self.assertEqual(fts_query("  -- "), "")
+
+    def test_fts_available(self):
+        # the test database is SQLite, with FTS5 compiled into Python's SQLite library
+        self.assertTrue(fts_available())
+
+    def test_ranking_and_highlighting(self):
+        scan = self.create_scan(
+            "/photos",
+            [
+                {"path": "misc/notes.txt", "name": "notes.txt", "title": "Holiday <b>plans</b>"},
+                {"path": "2024/holiday.jpg", "name": "holiday.jpg", "size": 2048, "exif:Model": "Canon"},
+            ],
+        )
+        hits = ScanSearchResults("holi", [scan.id])
+        self.assertEqual(hits.count(), 2)
+        first, second = hits[0:2]
+        self.assertEqual(first["path"], "2024/holiday.jpg")
+        self.assertEqual(str(first["name"]), "<mark>holiday</mark>.jpg")
+        self.assertIn("<mark>Holiday</mark> &lt;b&gt;plans&lt;/b&gt;", str(second["snippet"]))
+
+    def test_search_view_across_scans(self):
+        first = self.create_scan("/a", [{"path": "report.pdf", "name": "report.pdf"}])
+        self.create_scan("/b", [{"path": "report.docx", "name": "report.docx"}])
+
+        response = self.client.get(reverse("search"), {"q": "report"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["page_obj"].paginator.count, 2)
+
+        response = self.client.get(reverse("search"), {"q": "report", "scans": [first.id]})
+        hits = list(response.context["page_obj"])
+        self.assertEqual([hit["scan_path"] for hit in hits], ["/a"])
+
+    def test_search_view_indexes_stored_scans_and_paginates(self):
+        rows = [{"path": f"photo{i}.jpg", "name": f"photo{i}.jpg"} for i in range(30)]
+        ScanResult.objects.create(path="/many", result=json.dumps(rows))
+
+        response = self.client.get(reverse("search"), {"q": "existing"})
+        self.assertEqual(response.context["page_obj"].paginator.count, 3)
+        self.assertTrue(all(ScanResult.objects.values_list("indexed", flat=True)))
+
+        response = self.client.get(reverse("search"), {"q": "photo", "page": 2})
+        page = response.context["page_obj"]
+        self.assertEqual((page.paginator.count, len(page.object_list)), (30, 5))
+        self.assertContains(response, "Page 2 of 2")
+
+    def test_removed_scan_is_unindexed(self):
+        scan = self.create_scan("/gone", [{"path": "unique.txt", "name": "unique.txt"}])
+        self.client.post(reverse("scan"), {"remove_scan_id": scan.id})
+        self.assertEqual(ScanSearchResults("unique").count(), 0)
+
+    @patch("sniffler.web_ui.views.fts_available", return_value=False)
+    def test_search_view_without_fts(self, mock_fts_available):
+        first = ScanResult.objects.create(
+            path="/a",
+            result=json.dumps([{"path": "docs/report.pdf", "name": "report.pdf", "title": "Quarterly Report"}]),
+        )
+        ScanResult.objects.create(path="/b", result=json.dumps([{"path": "Über/report.docx", "name": "report.docx"}]))
+
+        response = self.client.get(reverse("search"), {"q": "quarterly report"})
+        self.assertEqual(response.status_code, 200)
+        hits = list(response.context["page_obj"])
+        self.assertEqual([(hit["scan_path"], hit["path"]) for hit in hits], [("/a", "docs/report.pdf")])
+        self.assertEqual(hits[0]["snippet"], "Quarterly Report")
+        self.assertFalse(ScanResult.objects.get(id=first.id).indexed)
+
+        # non-ASCII words are matched in the rows only
+        hits = LikeSearchResults("über report")
+        self.assertEqual([hit["path"] for hit in hits[0:10]], ["Über/report.docx"])
+        self.assertEqual(LikeSearchResults("report", []).count(), 0)
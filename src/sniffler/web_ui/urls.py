@@ -1,9 +1,11 @@
 from django.urls import path
 
-from .views import HomePageView, ScanView, StatsView
+from .views import HomePageView, ScanExportView, ScanView, SearchView, StatsView
 
 urlpatterns = [
     path("", HomePageView.as_view(), name="home"),
     path("scan/", ScanView.as_view(), name="scan"),
     path("stats/", StatsView.as_view(), name="stats"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("scan/<int:scan_id>/export/", ScanExportView.as_view(), name="export"),
 ]
@@ -1,5 +1,12 @@
 import json
+import re
+from collections.abc import Generator, Sequence
 from pathlib import Path
+from typing import Any
+
+from sniffler.core.serialization import PackedCollection
+
+from .models import ScanResult
 
 
 class CollectionJSONEncoder(json.JSONEncoder):
@@ -8,3 +15,95 @@ class CollectionJSONEncoder(json.JSONEncoder):
             return str(o)
 
         return super().default(o)
+
+
+def load_scan_rows(scan_id: int) -> list[dict[str, Any]]:
+    """
+    Loads the rows of a stored scan.
+
+    Args:
+        scan_id (int): The id of the ScanResult.
+
+    Returns:
+        list[dict[str, Any]]: The collected rows.
+
+    Raises:
+        ScanResult.DoesNotExist: If there is no scan with this id.
+    """
+    return json.loads(ScanResult.objects.get(id=scan_id).result)
+
+
+def load_scan_columns(scan_id: int, columns: Sequence[str]) -> list[dict[str, Any]]:
+    """
+    Loads only some columns of a stored scan.
+
+    Only the requested columns of the packed rows are decompressed and decoded, scans stored without packed rows
+    fall back to decoding the whole JSON result. Paths are returned as strings.
+
+    Args:
+        scan_id (int): The id of the ScanResult.
+        columns (Sequence[str]): The columns to load.
+
+    Returns:
+        list[dict[str, Any]]: The rows, with only the requested columns if the scan is packed.
+
+    Raises:
+        ScanResult.DoesNotExist: If there is no scan with this id.
+        json.JSONDecodeError: If the scan is not packed and its result is invalid.
+    """
+    packed = ScanResult.objects.values_list("packed", flat=True).get(id=scan_id)
+    if packed is None:
+        return load_scan_rows(scan_id)
+    return PackedCollection(packed, str).rows(columns)
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_json_array(text: str) -> Generator[Any, Any, None]:
+    """
+    Decodes the items of a JSON array one at a time, without building the list of all items.
+
+    Args:
+        text (str): A JSON array.
+
+    Yields:
+        Generator[Any, Any, None]: The decoded items.
+
+    Raises:
+        json.JSONDecodeError: If the text is not a JSON array.
+    """
+    raw_decode = json.JSONDecoder().raw_decode
+    skip = _WHITESPACE.match
+    idx = skip(text, 0).end()  # type: ignore
+    if text[idx : idx + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", text, idx)
+    idx = skip(text, idx + 1).end()  # type: ignore
+    if text[idx : idx + 1] == "]":
+        return
+    while True:
+        item, idx = raw_decode(text, idx)
+        yield item
+        idx = skip(text, idx).end()  # type: ignore
+        delimiter = text[idx : idx + 1]
+        if delimiter == "]":
+            return
+        if delimiter != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx = skip(text, idx + 1).end()  # type: ignore
+
+
+def iter_scan_rows(result: str | list[dict[str, Any]]) -> Generator[dict[str, Any], Any, None]:
+    """
+    Streams the rows of a stored scan result, see ``iter_json_array``.
+
+    Args:
+        result (str | list[dict[str, Any]]): The ``result`` of a ScanResult, the JSON-encoded rows.
+
+    Yields:
+        Generator[dict[str, Any], Any, None]: The collected rows.
+    """
+    if isinstance(result, str):
+        yield from iter_json_array(result)
+    else:
+        yield from result
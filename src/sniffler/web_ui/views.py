@@ -1,20 +1,28 @@
 import json
+import time
 
 from django.contrib import messages
-from django.http import HttpResponseRedirect
+from django.core.exceptions import BadRequest
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
-from django.views.generic.base import TemplateView
+from django.views.generic.base import TemplateView, View
 from django.views.generic.edit import FormMixin
 from django.views.generic.list import ListView
 
-from sniffler.core.stats import StatCalculator
+from sniffler.core.collector import Collection
+from sniffler.core.rollup import DirectoryNode, DirectoryRollup
+from sniffler.core.serialization import pack_collection
+from sniffler.core.stats import STAT_COLUMNS, StatCalculator
 from sniffler.core.utils import convert_size
 
-from .forms import ScanForm
+from .export import EXPORT_FORMATS, export_lines, gzip_chunks, iter_chunks
+from .forms import ScanForm, SearchForm
 from .models import ScanResult
-from .tasks import run_scan
-from .utils import CollectionJSONEncoder
+from .search import LikeSearchResults, ScanSearchResults, fts_available, index_scan, unindex_scan
+from .tasks import run_scan, start_enrichment
+from .utils import CollectionJSONEncoder, load_scan_columns
 
 
 class HomePageView(TemplateView):
@@ -51,6 +59,8 @@ class ScanView(FormMixin, ListView):  # Change inheritance to FormMixin and List
             remove_scan_id = request.POST.get("remove_scan_id")
             if remove_scan_id:
                 ScanResult.objects.filter(id=remove_scan_id).delete()
+                if fts_available():
+                    unindex_scan(remove_scan_id)
                 messages.success(request, "Scan removed successfully.")
             return redirect("scan")
         else:
@@ -63,8 +73,9 @@ class ScanView(FormMixin, ListView):  # Change inheritance to FormMixin and List
 
     def form_valid(self, form):
         path = form.cleaned_data["path"]
+        two_phase = form.cleaned_data.get("two_phase", False)
         try:
-            scan_result = run_scan(path)
+            scan_result = run_scan(path, basic_only=two_phase)
         except FileNotFoundError:
             messages.error(self.request, "Path not found.")
             return self.form_invalid(form)
@@ -72,22 +83,49 @@ class ScanView(FormMixin, ListView):  # Change inheritance to FormMixin and List
             messages.error(self.request, "An error occurred during scanning.")
             return self.form_invalid(form)
 
-        scan_instance = ScanResult.objects.create(path=path, result=json.dumps(scan_result, cls=CollectionJSONEncoder))
+        scan_instance = ScanResult.objects.create(
+            path=path,
+            result=json.dumps(scan_result, cls=CollectionJSONEncoder),
+            packed=pack_collection(scan_result),
+        )
         self.request.session["active_scan_id"] = scan_instance.id
-        messages.success(self.request, "Scan completed successfully and set as active.")
+        if fts_available():
+            index_scan(scan_instance.id, scan_result)
+        order = form.cleaned_data.get("enrich_order") or "smallest"
+        if two_phase and start_enrichment(scan_instance, scan_result, order):
+            messages.success(
+                self.request,
+                "Basic scan completed and set as active, file details are being added in the background.",
+            )
+        else:
+            messages.success(self.request, "Scan completed successfully and set as active.")
         return HttpResponseRedirect(self.get_success_url())
 
 
+def _directory_row(node: DirectoryNode) -> dict:
+    row = node.summary()
+    row["path"] = node.path
+    row["hours"] = row["duration"] / 3600
+    return row
+
+
 class StatsView(TemplateView):
+    """
+    Statistics of the active scan, with a drill-down into its directories through the ``dir`` query parameter.
+    """
+
     template_name = "web_ui/stats.html"
+    top_directories = 10
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         active_scan_id = self.request.session.get("active_scan_id")
         if active_scan_id:
             try:
-                scan = ScanResult.objects.get(id=active_scan_id)
-                collection = json.loads(scan.result)
+                scan = ScanResult.objects.defer("result", "packed").get(id=active_scan_id)
+                collection = Collection(load_scan_columns(scan.id, STAT_COLUMNS))
+                if scan.enriching:
+                    context["enrichment"] = {"done": scan.enriched, "total": scan.to_enrich}
                 stats_calculator = StatCalculator(collection)
 
                 context["total_size"] = convert_size(stats_calculator.total_size())
@@ -95,6 +133,29 @@ class StatsView(TemplateView):
                 context["top_largest_files"] = stats_calculator.top_n_largest_files(10)
                 context["top_largest_images"] = stats_calculator.top_n_largest_images(10)
                 context["top_documents_by_pages"] = stats_calculator.top_n_documents_by_pages(10)
+
+                analytics = stats_calculator.analytics()
+                context["size_percentiles"] = {
+                    f"p{p}": convert_size(value) for p, value in analytics.percentiles("size").items()
+                }
+                context["page_percentiles"] = {
+                    f"p{p}": round(value) for p, value in analytics.percentiles("page_count").items()
+                }
+                context["histograms"] = [
+                    ("Size", analytics.size_histogram().rows()),
+                    ("Age by Modification Time", analytics.age_histogram().rows()),
+                ]
+
+                rollup = DirectoryRollup(collection)
+                directory = rollup.node(self.request.GET.get("dir", "")) or rollup.root
+                names = directory.path.split("/") if directory.path else []
+                context["directory"] = _directory_row(directory)
+                context["breadcrumbs"] = [("/".join(names[: depth + 1]), name) for depth, name in enumerate(names)]
+                subdirectories = rollup.top(len(directory.children), under=directory.path, max_depth=1)
+                context["subdirectories"] = [_directory_row(node) for node in subdirectories]
+                context["heaviest_directories"] = [
+                    _directory_row(node) for node in rollup.top(self.top_directories, under=directory.path)
+                ]
             except ScanResult.DoesNotExist:
                 context["error"] = "Active scan not found. Please run a new scan, or select one from Scans."
             except json.JSONDecodeError:  # Catch JSON decoding errors
@@ -102,3 +163,70 @@ class StatsView(TemplateView):
         else:
             context["error"] = "No active scan. Please run a new scan, or select one from Scans."
         return context
+
+
+class SearchView(TemplateView):
+    """
+    Full-text search over the names, paths and text metadata of stored scans, ranked by relevance.
+    """
+
+    template_name = "web_ui/search.html"
+    paginate_by = 25
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = SearchForm(self.request.GET or None)
+        context["form"] = form
+        if not form.is_valid() or not form.cleaned_data["q"]:
+            return context
+
+        scans = form.cleaned_data["scans"] or ScanResult.objects.all()
+        scan_paths = dict(scans.values_list("id", "path"))
+        if fts_available():
+            # scans stored before the index existed are indexed on their first search
+            for scan_id in scans.filter(indexed=False).values_list("id", flat=True):
+                index_scan(scan_id)
+            results = ScanSearchResults(form.cleaned_data["q"], scan_paths)
+        else:
+            results = LikeSearchResults(form.cleaned_data["q"], scan_paths)
+
+        start = time.perf_counter()
+        page = Paginator(results, self.paginate_by).get_page(self.request.GET.get("page"))
+        context["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        for hit in page.object_list:
+            hit["scan_path"] = scan_paths.get(hit["scan_id"])
+        context["page_obj"] = page
+        return context
+
+
+class ScanExportView(View):
+    """
+    Downloads a stored scan as CSV or NDJSON, e.g. ``?format=ndjson&gzip=1``.
+
+    The response is streamed: rows are decoded from the stored result and rendered one at a time, so memory use does
+    not grow with the number of rows beyond the stored result itself.
+    """
+
+    def get(self, request, scan_id):
+        fmt = request.GET.get("format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            raise BadRequest(f"Unknown format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}.")
+        delimiter = request.GET.get("delimiter", ",")
+        if delimiter not in (",", ";", "tab"):
+            raise BadRequest(f"Unsupported delimiter '{delimiter}'.")
+        try:
+            result = ScanResult.objects.values_list("result", flat=True).get(id=scan_id)
+        except ScanResult.DoesNotExist:
+            raise Http404("Scan not found.") from None
+
+        filename = f"scan-{scan_id}.{fmt}"
+        content_type = EXPORT_FORMATS[fmt]
+        chunks = iter_chunks(export_lines(result, fmt, delimiter))
+        if request.GET.get("gzip"):
+            chunks = gzip_chunks(chunks)
+            filename += ".gz"
+            content_type = "application/gzip"
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response